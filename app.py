@@ -1,10 +1,37 @@
-from flask import Flask, render_template, request, send_file
+from flask import Flask, Response, jsonify, redirect, render_template, request, send_file, stream_with_context, url_for
 import csv
+import io
+import json
 import os # Needed for checking if file exists for download
+from job_queue import DONE, FAILED, JobQueue
+from job_store import get_job_store
+from metrics import METRICS
+from seek_parser import JOB_COLUMNS
 from scraper import scrape_seek
 
 app = Flask(__name__)
 
+
+def run_search(job, job_title):
+    """Queue worker: scrapes one search, publishing each result page to the job as it arrives."""
+    print(f"Starting scrape for: {job_title}") # Add print statement for debugging
+    results = scrape_seek(job_title, on_page=job.add_results)
+    if results:
+        store = get_job_store()
+        if store is not None:
+            # Card summaries only fill gaps; full details scraped elsewhere are kept
+            stored = store.upsert_jobs(results, search_term=job_title, overwrite=False)
+            print(f"Stored {stored} jobs in {store.path}")
+        else:
+            save_to_csv(results, 'seek_jobs.csv')
+    else:
+        print("No results found or error during scraping.")
+    return results
+
+
+# Scrapes run in the background so a slow Seek response never ties up a request thread
+search_queue = JobQueue(run_search, workers=int(os.environ.get('SCRAPE_WORKERS', 2)))
+
 @app.route('/', methods=['GET'])
 def index():
     """Renders the main page."""
@@ -12,32 +39,113 @@ def index():
 
 @app.route('/search', methods=['POST'])
 def search():
-    """Handles the job search form submission."""
-    job_title = request.form.get('job_title')
-    results = []
+    """Handles the job search form submission: queues the scrape and shows its progress page."""
+    job_title = (request.form.get('job_title') or '').strip()
+    if not job_title:
+        return render_template('index.html', results=None, error="Please enter a job title.")
+    job = search_queue.submit(job_title=job_title)
+    return redirect(url_for('search_status', job_id=job.id))
+
+@app.route('/search/<job_id>', methods=['GET'])
+def search_status(job_id):
+    """Shows the results of a queued search so far; the page polls until the scrape finishes."""
+    job = search_queue.get(job_id)
+    if job is None:
+        return render_template('index.html', results=None, error="Search not found or expired. Please search again."), 404
     error_message = None
+    if job.status == FAILED:
+        error_message = f"An error occurred: {job.error}"
+    elif job.status == DONE and not job.results:
+        # Check scraper.py logs for specific reason (e.g., CAPTCHA)
+        error_message = "No jobs found or an error occurred during scraping. Check console logs."
+    return render_template('index.html', results=job.results_since(0), error=error_message,
+                           search_term=job.params['job_title'], job=job.to_dict())
 
+# --- JSON API for the job queue ---
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """Queues a search. Body (JSON or form): job_title. Returns 202 with the job ID."""
+    payload = request.get_json(silent=True) or request.form
+    job_title = (payload.get('job_title') or '').strip()
     if not job_title:
-        error_message = "Please enter a job title."
-    else:
-        try:
-            print(f"Starting scrape for: {job_title}") # Add print statement for debugging
-            results = scrape_seek(job_title)
-            if results:
-                 save_to_csv(results, 'seek_jobs.csv')
-            else:
-                 print("No results found or error during scraping.")
-                 # Optionally set an error message if scrape_seek returns empty due to error/block
-                 if not error_message: # Avoid overwriting existing errors
-                     # Check scraper.py logs for specific reason (e.g., CAPTCHA)
-                     # For now, a generic message if results are empty
-                     error_message = "No jobs found or an error occurred during scraping. Check console logs."
-
-        except Exception as e:
-            error_message = f"An error occurred: {e}"
-            print(f"Error during search: {e}") # Add print statement for debugging
-
-    return render_template('index.html', results=results, error=error_message, search_term=job_title)
+        return jsonify({'error': 'job_title is required'}), 400
+    job = search_queue.submit(job_title=job_title)
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """Status and progress of a queued search."""
+    job = search_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def api_job_results(job_id):
+    """Results gathered so far; ?offset=N returns only rows after the first N."""
+    job = search_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    offset = request.args.get('offset', 0, type=int)
+    rows = job.results_since(max(0, offset))
+    return jsonify({'status': job.status, 'offset': offset, 'next_offset': offset + len(rows), 'results': rows})
+
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """Full-text search over every stored job (title, company, description), best match first.
+
+    ?q= supports "exact phrases", prefix* terms and OR / NOT; ?search= limits
+    results to one search term's jobs; ?limit= (max 100) and ?offset= page through them.
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    store = get_job_store()
+    if store is None:
+        return jsonify({'error': 'Job store unavailable'}), 503
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    try:
+        total, results = store.search(query, limit=limit, offset=offset, search_term=request.args.get('search') or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'query': query, 'total': total, 'offset': offset, 'limit': limit, 'results': results})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage timings and counters of the scrapes run by this process (Prometheus text, or ?format=json)."""
+    if request.args.get('format') == 'json':
+        return jsonify(METRICS.summary())
+    return Response(METRICS.prometheus_text(), mimetype='text/plain; version=0.0.4')
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def api_job_events(job_id):
+    """Server-Sent Events: one 'job' event per result as soon as it is scraped, then 'done'.
+
+    ?offset=N (or the Last-Event-ID header on reconnect) skips rows already received.
+    """
+    job = search_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    offset = request.headers.get('Last-Event-ID', type=int) or request.args.get('offset', 0, type=int)
+
+    def events(offset):
+        while True:
+            rows = job.wait_for_results(offset, timeout=15)
+            for row in rows:
+                offset += 1
+                yield f"id: {offset}\n" + _sse('job', row)
+            if job.finished and len(job.results_since(offset)) == 0:
+                yield _sse('done', job.to_dict())
+                return
+            if not rows:
+                yield ": keep-alive\n\n" # Stops proxies from closing an idle stream
+
+    return Response(stream_with_context(events(offset)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 def save_to_csv(data, filename):
     """Saves the scraped data to a CSV file."""
@@ -61,17 +169,38 @@ def save_to_csv(data, filename):
 # Route to download the CSV file
 @app.route('/download_csv')
 def download_csv():
-    """Provides the generated CSV file for download."""
-    csv_path = "seek_jobs.csv"
-    if os.path.exists(csv_path):
-        try:
-            return send_file(csv_path, as_attachment=True)
-        except Exception as e:
-            print(f"Error sending file: {e}")
-            return "Error downloading file.", 500
-    else:
+    """Provides the stored jobs as CSV, generated from the job store (?search=<term> limits it to one search)."""
+    store = get_job_store()
+    if store is None:
+        # No store: fall back to the file written by the last search
+        csv_path = "seek_jobs.csv"
+        if os.path.exists(csv_path):
+            try:
+                return send_file(csv_path, as_attachment=True)
+            except Exception as e:
+                print(f"Error sending file: {e}")
+                return "Error downloading file.", 500
         return "CSV file not found. Please perform a search first.", 404
 
+    search_term = request.args.get('search') or None
+    if store.count(search_term=search_term) == 0:
+        return "No stored jobs found. Please perform a search first.", 404
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=JOB_COLUMNS)
+        writer.writeheader()
+        for job in store.iter_jobs(search_term=search_term):
+            writer.writerow(job)
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = f"seek_{(search_term or 'all').strip().lower().replace(' ', '-')}_jobs.csv"
+    return Response(generate(), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
 
 if __name__ == '__main__':
-    app.run(debug=True) # Enable debug mode for development
\ No newline at end of file
+    app.run(debug=True, threaded=True) # Enable debug mode for development
\ No newline at end of file
@@ -0,0 +1,247 @@
+# batch_crawl.py
+"""Batch crawl: many title x location searches in one process.
+
+All queries share one pool of warm browsers, one page cache, one rate
+limiter and one job store. Job URLs are de-duplicated across the whole
+batch before detail pages are fetched: a job found by several searches is
+scraped once and linked to every search that found it.
+
+    python batch_crawl.py queries.csv --concurrency 3 [--incremental] [--output jobs.ndjson] [--csv]
+
+The manifest is a CSV with jobTitle,location[,numJobs] columns, or a JSON
+list of {"jobTitle": ..., "location": ..., "numJobs": ...} objects. A JSON
+summary of the run is printed to stdout (to stderr with --output -, so
+stdout stays valid NDJSON).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from browser_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB, DriverPool
+from job_store import get_job_store
+from metrics import METRICS
+from rate_limit import HostRateLimiter
+from resource_filter import ResourceBlocker
+from scrape_omayzi import CsvStreamWriter, get_driver, iter_seek_jobs
+from seek_parser import job_id_from_url
+from seen_jobs import DEFAULT_MAX_AGE
+
+DEFAULT_CONCURRENCY = 2  # Queries (and browsers) in flight at once
+DEFAULT_NUM_JOBS = 25
+
+# Accepted manifest column names -> query field
+FIELD_ALIASES = {
+    'jobtitle': 'jobTitle', 'job_title': 'jobTitle', 'title': 'jobTitle', 'keyword': 'jobTitle',
+    'location': 'location', 'where': 'location',
+    'numjobs': 'numJobs', 'num_jobs': 'numJobs', 'max_jobs': 'numJobs', 'limit': 'numJobs',
+}
+
+
+def load_manifest(path, default_num_jobs=DEFAULT_NUM_JOBS):
+    """Reads a CSV or JSON manifest into a list of {'jobTitle', 'location', 'numJobs'} dicts.
+
+    Blank rows are skipped and duplicate searches (same title and location,
+    ignoring case) are dropped. Raises ValueError for rows without a title or location.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get('queries', [])
+        else:
+            rows = list(csv.DictReader(f))
+
+    queries = []
+    seen = set()
+    for line, row in enumerate(rows, start=1):
+        query = {}
+        for name, value in row.items():
+            field = FIELD_ALIASES.get(str(name).strip().lower())
+            if field and value not in (None, ''):
+                query[field] = str(value).strip()
+        if not query:
+            continue
+        if not query.get('jobTitle') or not query.get('location'):
+            raise ValueError(f"{path}: query {line} needs a job title and a location: {row}")
+        query['numJobs'] = int(query.get('numJobs', default_num_jobs))
+        key = (query['jobTitle'].lower(), query['location'].lower())
+        if key not in seen:
+            seen.add(key)
+            queries.append(query)
+    return queries
+
+
+class JobClaims:
+    """Batch-wide job ID registry: each job is fetched by the first query that finds it."""
+
+    def __init__(self):
+        self._owners = {}  # job ID -> index of the query fetching it
+        self._shared = {}  # query index -> job IDs found by that query but fetched by another
+        self._lock = threading.Lock()
+
+    def claimer(self, query_index):
+        """Returns a claim_links() callback for iter_seek_jobs()."""
+        def claim_links(links):
+            claimed = []
+            with self._lock:
+                for link in links:
+                    job_id = job_id_from_url(link)
+                    owner = self._owners.setdefault(job_id, query_index) if job_id is not None else query_index
+                    if owner == query_index:
+                        claimed.append(link)
+                    else:
+                        self._shared.setdefault(query_index, []).append(job_id)
+            return claimed
+        return claim_links
+
+    def shared(self, query_index):
+        with self._lock:
+            return list(self._shared.get(query_index, ()))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._owners)
+
+
+class BatchCrawl:
+    """Runs a list of queries with at most `concurrency` in flight, sharing browsers and job claims."""
+
+    def __init__(self, queries, concurrency=DEFAULT_CONCURRENCY, incremental=False, max_age=DEFAULT_MAX_AGE,
+                 block_resources=True, recycle_after=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB,
+                 output=None, write_csv=False):
+        self.queries = queries
+        self.concurrency = max(1, concurrency)
+        self.incremental = incremental
+        self.max_age = max_age
+        self.output = output
+        self.write_csv = write_csv
+        self.claims = JobClaims()
+        self.rate_limiter = HostRateLimiter.from_env()  # One politeness budget for the whole batch
+        blocker_factory = ResourceBlocker if block_resources else None
+        self.pool = DriverPool(get_driver, self.concurrency, recycle_after, max_rss_mb, blocker_factory)
+        self._output_lock = threading.Lock()
+
+    def _emit(self, index, details):
+        if self.output is None:
+            return
+        query = self.queries[index]
+        line = json.dumps({'query': {'jobTitle': query['jobTitle'], 'location': query['location']}, 'job': details})
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run_query(self, index):
+        """Scrapes one query; returns its summary dict. Errors are recorded, not raised."""
+        query = self.queries[index]
+        label = f"[{index + 1}/{len(self.queries)}] '{query['jobTitle']}' in '{query['location']}'"
+        print(f"Python: Batch query {label} starting...", file=sys.stderr)
+        stats = {}
+        summary = {'jobTitle': query['jobTitle'], 'location': query['location'], 'jobs': 0, 'error': None}
+        started = time.monotonic()
+        csv_writer = CsvStreamWriter(query['jobTitle'], query['location']) if self.write_csv else None
+        try:
+            for details in iter_seek_jobs(query['jobTitle'], query['location'], query['numJobs'],
+                                          incremental=self.incremental, max_age=self.max_age,
+                                          driver_pool=self.pool, stats=stats, rate_limiter=self.rate_limiter,
+                                          claim_links=self.claims.claimer(index)):
+                summary['jobs'] += 1
+                self._emit(index, details)
+                if csv_writer:
+                    csv_writer.write(details)
+        except Exception as e:
+            print(f"Python: Batch query {label} failed: {e}", file=sys.stderr)
+            summary['error'] = str(e)
+        finally:
+            if csv_writer:
+                summary['csv_file'] = csv_writer.close()
+        summary.update(examined=stats.get('examined', 0), skipped=stats.get('skipped', 0),
+                       shared=stats.get('shared', 0), seconds=round(time.monotonic() - started, 1))
+        print(f"Python: Batch query {label} done: {summary['jobs']} jobs, {summary['shared']} fetched by "
+              f"other queries, {summary['seconds']} s.", file=sys.stderr)
+        return summary
+
+    def link_shared_jobs(self, summaries):
+        """Records jobs fetched by one query as results of every other query that found them."""
+        store = get_job_store()
+        if store is None:
+            return
+        for index, summary in enumerate(summaries):
+            job_ids = self.claims.shared(index)
+            if job_ids:
+                summary['linked'] = store.link_search_term(job_ids, self.queries[index]['jobTitle'])
+
+    def run(self):
+        """Runs every query and returns the batch summary dict."""
+        started = time.monotonic()
+        print(f"Python: Batch of {len(self.queries)} queries, {self.concurrency} at a time.", file=sys.stderr)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='batch-query') as executor:
+                summaries = list(executor.map(self.run_query, range(len(self.queries))))
+        finally:
+            pool_stats = self.pool.stats()
+            self.pool.close()
+        self.link_shared_jobs(summaries)
+        return {
+            'queries': summaries,
+            'total_jobs': sum(summary['jobs'] for summary in summaries),
+            'unique_job_ids': len(self.claims),
+            'shared': sum(summary['shared'] for summary in summaries),
+            'failed_queries': sum(1 for summary in summaries if summary['error']),
+            'seconds': round(time.monotonic() - started, 1),
+            'pool': pool_stats,
+            'metrics': METRICS.summary(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape many Seek searches with shared browsers and de-duplicated jobs.")
+    parser.add_argument('manifest', help="CSV (jobTitle,location[,numJobs]) or JSON list of queries")
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('BATCH_CONCURRENCY', DEFAULT_CONCURRENCY)),
+                        help="queries (and browsers) running at once (default: %(default)s)")
+    parser.add_argument('--num-jobs', type=int, default=DEFAULT_NUM_JOBS,
+                        help="jobs per query when the manifest has no numJobs column (default: %(default)s)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="skip jobs scraped recently and output only new or changed postings")
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE / 3600,
+                        help="hours after which a seen job is scraped again in incremental mode (default: %(default)s)")
+    parser.add_argument('--recycle-after', type=int, default=DEFAULT_MAX_PAGES, metavar='PAGES',
+                        help="recycle a browser after this many page loads (default: %(default)s)")
+    parser.add_argument('--max-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB,
+                        help="recycle a browser above this much memory; needs psutil (default: %(default)s)")
+    parser.add_argument('--no-block-resources', action='store_true', help="let browsers load images, fonts and trackers")
+    parser.add_argument('--output', help="also write every job as an NDJSON line to this file "
+                                         "('-' for stdout; the summary then goes to stderr)")
+    parser.add_argument('--csv', action='store_true', help="also write one CSV file per query")
+    args = parser.parse_args()
+
+    try:
+        queries = load_manifest(args.manifest, args.num_jobs)
+    except (OSError, ValueError) as e:
+        print(json.dumps({'error': f"Could not read manifest: {e}"}))
+        sys.exit(1)
+    if not queries:
+        print(json.dumps({'error': "Manifest has no queries"}))
+        sys.exit(1)
+
+    output = None
+    if args.output == '-':
+        output = sys.stdout
+    elif args.output:
+        output = open(args.output, 'w', encoding='utf-8')
+    try:
+        batch = BatchCrawl(queries, args.concurrency, args.incremental, args.max_age * 3600,
+                           not args.no_block_resources, args.recycle_after, args.max_rss_mb, output, args.csv)
+        summary = batch.run()
+    finally:
+        if output not in (None, sys.stdout):
+            output.close()
+    # Job lines own stdout when they are streamed there; keep the summary apart from them
+    print(json.dumps(summary, indent=2), file=sys.stderr if output is sys.stdout else sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
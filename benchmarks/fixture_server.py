@@ -0,0 +1,100 @@
+# benchmarks/fixture_server.py
+"""Local stand-in for www.seek.com.au that replays a saved page corpus.
+
+    python benchmarks/fixture_server.py [--dir benchmarks/fixtures] [--port 8765] [--latency-ms 40]
+    SEEK_BASE_URL=http://127.0.0.1:8765 python scrape_omayzi.py "data scientist" "Sydney NSW" 20
+
+Any search URL (/<keyword>-jobs/in-<location>[?page=N]) gets result page N
+of the corpus; /job/<id> gets that job's page; everything else is a 404.
+`--latency-ms` delays each answer to stand in for network round trips.
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from make_fixtures import DEFAULT_FIXTURES_DIR
+
+SEARCH_PATH_RE = re.compile(r'^/[^/]+-jobs(?:/in-[^/]+)?/?$')
+JOB_PATH_RE = re.compile(r'^/job/(\d+)/?$')
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real site
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes; don't let them wait on ACKs
+    fixtures_dir = DEFAULT_FIXTURES_DIR
+    latency = 0.0
+    requests_served = 0
+    _count_lock = threading.Lock()
+
+    def _fixture_path(self, url):
+        if SEARCH_PATH_RE.match(url.path):
+            try:
+                page_number = int(parse_qs(url.query).get('page', ['1'])[0])
+            except ValueError:
+                page_number = 1
+            return os.path.join(self.fixtures_dir, 'search', f'page-{max(1, page_number)}.html')
+        match = JOB_PATH_RE.match(url.path)
+        if match:
+            return os.path.join(self.fixtures_dir, 'jobs', f'{match.group(1)}.html')
+        return None
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        path = self._fixture_path(urlsplit(self.path))
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+            status = 200
+        except (TypeError, OSError):
+            body, status = b'<html><body>Not found</body></html>', 404
+        with self._count_lock:
+            FixtureRequestHandler.requests_served += 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per page would drown the benchmark output
+
+
+def start_server(fixtures_dir=DEFAULT_FIXTURES_DIR, host='127.0.0.1', port=0, latency_ms=0):
+    """Serves the corpus on a background thread; returns (server, base URL). Port 0 picks a free port."""
+    handler = type('BoundFixtureRequestHandler', (FixtureRequestHandler,),
+                   {'fixtures_dir': fixtures_dir, 'latency': latency_ms / 1000})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fixture-server', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the benchmark page corpus as a stand-in for Seek.")
+    parser.add_argument('--dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help="delay added to every response")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(args.dir, 'search')):
+        sys.exit(f"No corpus in {args.dir}; run: python benchmarks/make_fixtures.py generate")
+    server, base_url = start_server(args.dir, args.host, args.port, args.latency_ms)
+    print(f"Serving {args.dir} at {base_url} (set SEEK_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+# benchmarks/make_fixtures.py
+"""Builds the page corpus the benchmark server replays.
+
+Layout (shared by generated and recorded corpora):
+
+    <dir>/search/page-<N>.html   result page N of every search
+    <dir>/jobs/<job id>.html     job detail pages
+
+    python benchmarks/make_fixtures.py generate [--dir benchmarks/fixtures] [--pages 5] [--per-page 20]
+    python benchmarks/make_fixtures.py record "data scientist" "Sydney NSW" [--pages 2]
+
+`generate` writes a deterministic synthetic corpus in Seek's markup: the
+same seed always gives byte-identical pages, so reports stay comparable
+between commits. Half of the job pages carry JSON-LD (structured
+extractor), the other half only the DOM elements (selector fallback).
+`record` saves live Seek pages into the same layout instead.
+"""
+import argparse
+import html
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+DEFAULT_SEED = 20240601
+FIRST_JOB_ID = 70000000
+REPEATED_PER_PAGE = 2  # Premium listings Seek shows again on every result page
+
+TITLES = ['Data Scientist', 'Senior Data Engineer', 'Machine Learning Engineer', 'Analytics Manager',
+          'Python Developer', 'BI Analyst', 'Research Scientist', 'Data Platform Lead']
+COMPANIES = ['Acme Analytics', 'Blue Gum Health', 'Southern Cross Bank', 'Harbour Logistics',
+             'Koala Cloud', 'Outback Energy', 'Tasman Retail Group', 'Wattle Insurance']
+LOCATIONS = [('Sydney', 'NSW'), ('Melbourne', 'VIC'), ('Brisbane', 'QLD'), ('Perth', 'WA'), ('Adelaide', 'SA')]
+WORK_TYPES = ['Full time', 'Contract/Temp', 'Part time']
+WORDS = ('data pipeline model stakeholder python sql cloud platform analysis reporting experiment '
+         'customer insight team delivery quality governance dashboard forecasting production').split()
+
+PAGE_SHELL = '''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/app.css"><script src="/static/app.js" defer></script>
+{head}</head>
+<body><header><nav>{nav}</nav></header>
+<main>{main}</main>
+<footer>{footer}</footer></body></html>
+'''
+
+
+def _filler(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _chrome(rng):
+    """Navigation and footer markup, so pages have a realistic amount of non-job HTML to skip."""
+    nav = ''.join(f'<a class="nav-link" href="/{word}">{word.title()}</a>' for word in rng.sample(WORDS, 10))
+    footer = ''.join(f'<p class="footer-note">{_filler(rng, 30)}</p>' for _ in range(6))
+    return nav, footer
+
+
+def _job(rng, job_id):
+    city, state = rng.choice(LOCATIONS)
+    low = rng.randrange(80, 160) * 1000
+    paragraphs = [f'<p>{_filler(rng, rng.randrange(40, 90))}.</p>' for _ in range(rng.randrange(4, 9))]
+    bullets = ''.join(f'<li>{_filler(rng, 8)}</li>' for _ in range(rng.randrange(4, 10)))
+    contact = rng.choice([
+        f'<p>Questions? Call Jane on (0{rng.randrange(2, 9)}) {rng.randrange(9000, 9999)} {rng.randrange(1000, 9999)} '
+        f'or email careers@{job_id}.example.com.au.</p>',
+        f'<p>Apply by 15/07/2024. Salary ${low:,} + super. Phone 04{rng.randrange(10, 99)} {rng.randrange(100, 999)} '
+        f'{rng.randrange(100, 999)}.</p>',
+        '<p>Apply now via the button below.</p>',
+    ])
+    return {
+        'id': job_id, 'title': rng.choice(TITLES), 'company': rng.choice(COMPANIES),
+        'city': city, 'state': state, 'low': low, 'high': low + rng.randrange(10, 40) * 1000,
+        'work_type': rng.choice(WORK_TYPES), 'date': f'2024-06-{rng.randrange(1, 29):02d}',
+        'content': ''.join(paragraphs) + f'<ul>{bullets}</ul>' + contact,
+    }
+
+
+def render_job_page(rng, job, structured):
+    json_ld = ''
+    if structured:
+        json_ld = '<script type="application/ld+json">' + json.dumps({
+            '@context': 'https://schema.org', '@type': 'JobPosting', 'title': job['title'],
+            'hiringOrganization': {'@type': 'Organization', 'name': job['company']},
+            'jobLocation': {'@type': 'Place', 'address': {'addressLocality': job['city'], 'addressRegion': job['state']}},
+            'baseSalary': {'@type': 'MonetaryAmount', 'currency': 'AUD',
+                           'value': {'minValue': job['low'], 'maxValue': job['high'], 'unitText': 'YEAR'}},
+            'datePosted': job['date'], 'employmentType': job['work_type'].upper().replace(' ', '_'),
+            'description': job['content'],
+        }) + '</script>'
+    nav, footer = _chrome(rng)
+    main = (
+        f'<div class="job-header"><h1 data-automation="job-detail-title">{html.escape(job["title"])}</h1>'
+        f'<span data-automation="advertiser-name">{html.escape(job["company"])}</span>'
+        f'<span data-automation="job-detail-location">{job["city"]} {job["state"]}</span>'
+        f'<span data-automation="job-detail-salary">${job["low"]:,} - ${job["high"]:,} per year</span>'
+        f'<span data-automation="job-detail-work-type">{job["work_type"]}</span>'
+        f'<span data-automation="job-detail-date">Posted {job["date"]}</span></div>'
+        f'<div data-automation="jobAdDetails">{job["content"]}</div>'
+        f'<aside class="similar-jobs">{"".join(f"<p>{_filler(rng, 12)}</p>" for _ in range(8))}</aside>'
+    )
+    return PAGE_SHELL.format(title=html.escape(job['title']), head=json_ld, nav=nav, main=main, footer=footer)
+
+
+def render_search_page(rng, jobs, page_number, has_next):
+    cards = []
+    for job in jobs:
+        cards.append(
+            f'<article data-card-type="JobCard" data-automation="normalJob" data-job-id="{job["id"]}">'
+            f'<h3 data-automation="job-title"><a data-automation="jobTitle" href="/job/{job["id"]}?type=standard&ref=search">'
+            f'{html.escape(job["title"])}</a></h3>'
+            f'<a data-automation="jobCompany" href="/companies/{job["id"]}">{html.escape(job["company"])}</a>'
+            f'<span data-automation="jobSalary">${job["low"]:,} - ${job["high"]:,}</span>'
+            f'<span data-automation="jobShortDescription">{_filler(rng, 25)}</span></article>'
+        )
+    pager = f'<a data-automation="page-next" href="?page={page_number + 1}">Next</a>' if has_next else ''
+    nav, footer = _chrome(rng)
+    main = f'<section class="results">{"".join(cards)}</section><nav class="pager">{pager}</nav>'
+    return PAGE_SHELL.format(title=f'Jobs - page {page_number}', head='', nav=nav, main=main, footer=footer)
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def generate(fixtures_dir=DEFAULT_FIXTURES_DIR, pages=5, per_page=20, seed=DEFAULT_SEED):
+    """Writes a synthetic corpus of `pages` result pages; returns the number of distinct jobs."""
+    rng = random.Random(seed)
+    jobs = [_job(rng, FIRST_JOB_ID + i) for i in range(pages * (per_page - REPEATED_PER_PAGE) + REPEATED_PER_PAGE)]
+    premium, regular = jobs[:REPEATED_PER_PAGE], jobs[REPEATED_PER_PAGE:]
+    step = per_page - REPEATED_PER_PAGE
+    for page_number in range(1, pages + 1):
+        page_jobs = premium + regular[(page_number - 1) * step:page_number * step]
+        _write(os.path.join(fixtures_dir, 'search', f'page-{page_number}.html'),
+               render_search_page(rng, page_jobs, page_number, page_number < pages))
+    for i, job in enumerate(jobs):
+        _write(os.path.join(fixtures_dir, 'jobs', f'{job["id"]}.html'), render_job_page(rng, job, i % 2 == 0))
+    return len(jobs)
+
+
+def record(keyword, location, fixtures_dir=DEFAULT_FIXTURES_DIR, pages=2, delay=1.5):
+    """Saves live Seek search and job pages into the corpus layout; returns the number of job pages saved."""
+    sys.path.insert(0, ROOT)
+    from http_fetch import get_session
+    from seek_parser import job_id_from_url, parse_search_results, search_page_url, search_url_for
+
+    session = get_session()
+    search_url = search_url_for(keyword, location)
+    saved = 0
+    for page_number in range(1, pages + 1):
+        response = session.get(search_page_url(search_url, page_number), timeout=30)
+        response.raise_for_status()
+        _write(os.path.join(fixtures_dir, 'search', f'page-{page_number}.html'), response.text)
+        links, has_next = parse_search_results(response.text)
+        print(f"Recorded search page {page_number}: {len(links)} jobs.", file=sys.stderr)
+        for link in links:
+            path = os.path.join(fixtures_dir, 'jobs', f'{job_id_from_url(link)}.html')
+            if os.path.exists(path):
+                continue
+            time.sleep(delay)  # Same politeness as a real crawl
+            job_response = session.get(link, timeout=30)
+            if job_response.status_code == 200:
+                _write(path, job_response.text)
+                saved += 1
+        if not has_next:
+            break
+        time.sleep(delay)
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the benchmark page corpus.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    gen = commands.add_parser('generate', help="write a deterministic synthetic corpus")
+    gen.add_argument('--dir', default=DEFAULT_FIXTURES_DIR)
+    gen.add_argument('--pages', type=int, default=5)
+    gen.add_argument('--per-page', type=int, default=20)
+    gen.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    rec = commands.add_parser('record', help="save live Seek pages for a search")
+    rec.add_argument('keyword')
+    rec.add_argument('location')
+    rec.add_argument('--dir', default=DEFAULT_FIXTURES_DIR)
+    rec.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        count = generate(args.dir, args.pages, args.per_page, args.seed)
+        print(f"Wrote {args.pages} search pages and {count} job pages to {args.dir}")
+    else:
+        count = record(args.keyword, args.location, args.dir, args.pages)
+        print(f"Recorded {count} job pages to {args.dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+# benchmarks/run.py
+"""Offline benchmark of the three scraping entry points against the fixture server.
+
+    python benchmarks/run.py [--targets scraper scrape_seek scrape_omayzi] [--jobs 60] [--repeat 3]
+                             [--latency-ms 20] [--output report.json] [--compare baseline.json]
+
+Each run happens in a fresh Python process pointed at the fixture server
+(SEEK_BASE_URL), with the page cache disabled, no rate limit and a
+throw-away job store, so runs are independent of each other and of any
+local state. Per target the report has jobs/s, p50/p95 page latency (time
+from requesting a page to having its HTML, per page kind), parse CPU
+seconds, total CPU seconds and peak RSS (of the Python process and of its
+largest child, i.e. the browser). With --repeat, the summary is the median
+of the runs. --compare prints the change against an earlier report.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+from make_fixtures import DEFAULT_FIXTURES_DIR, generate  # noqa: E402
+from fixture_server import FixtureRequestHandler, start_server  # noqa: E402
+
+KEYWORD = 'data scientist'
+LOCATION = 'Sydney NSW'
+DEFAULT_JOBS = 60
+RUN_TIMEOUT = 30 * 60  # Seconds before a stuck run is killed
+TARGETS = ('scraper', 'scrape_seek', 'scrape_omayzi')
+
+# Summary metrics compared between reports, and whether higher is better
+COMPARED_METRICS = {
+    'jobs_per_s': True, 'p50_ms': False, 'p95_ms': False,
+    'parse_cpu_s': False, 'cpu_s': False, 'peak_rss_mb': False, 'children_peak_rss_mb': False,
+}
+
+
+# --- Worker side: runs one target in this process and writes its measurements ---
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class Probe:
+    """Wraps scraper functions to record page latencies and parse CPU time."""
+
+    def __init__(self):
+        self.latencies = {}  # page kind -> seconds per page
+        self.parse_cpu = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, kind, seconds):
+        with self._lock:
+            self.latencies.setdefault(kind, []).append(seconds)
+
+    def timed(self, kind, fn):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(kind, time.perf_counter() - started)
+        return wrapper
+
+    def timed_async(self, kind, fn):
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self._record(kind, time.perf_counter() - started)
+        return wrapper
+
+    def parsing(self, fn):
+        def wrapper(*args, **kwargs):
+            started = time.thread_time()  # CPU of this thread only: other threads keep fetching meanwhile
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.thread_time() - started
+                with self._lock:
+                    self.parse_cpu += elapsed
+        return wrapper
+
+    def latency_report(self):
+        def summary(values):
+            return {'pages': len(values), 'p50_ms': _ms(percentile(values, 50)), 'p95_ms': _ms(percentile(values, 95))}
+        with self._lock:
+            report = {kind: summary(values) for kind, values in self.latencies.items()}
+            report['all'] = summary([value for values in self.latencies.values() for value in values])
+        return report
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def run_scraper(probe, jobs):
+    import scraper
+    scraper.fetch_with_cache = probe.timed('search', scraper.fetch_with_cache)
+    scraper.parse_job_cards = probe.parsing(scraper.parse_job_cards)
+    return len(scraper.scrape_seek(KEYWORD, max_jobs=jobs))
+
+
+def run_scrape_seek(probe, jobs):
+    import scrape_seek
+    scrape_seek.async_collect_job_links = probe.timed_async('search', scrape_seek.async_collect_job_links)
+    scrape_seek.fetch_job_html = probe.timed('job', scrape_seek.fetch_job_html)
+    scrape_seek._async_render_job_html = probe.timed_async('job_render', scrape_seek._async_render_job_html)
+    scrape_seek.parse_search_results = probe.parsing(scrape_seek.parse_search_results)
+    scrape_seek.parse_job_details = probe.parsing(scrape_seek.parse_job_details)
+    rows = scrape_seek.scrape_seek(KEYWORD, LOCATION, max_jobs=jobs)
+    if rows is None:
+        raise RuntimeError("Browser could not be launched")
+    return len(rows) - 1
+
+
+def run_scrape_omayzi(probe, jobs):
+    import scrape_omayzi
+    load_search_page = scrape_omayzi._load_search_page
+    render_search_page = probe.timed('search_render', load_search_page)
+
+    def timed_load_search_page(driver, page_url, prefetched_html=None, rate_limiter=None):
+        if prefetched_html is not None:  # Already timed as a 'search' fetch
+            return load_search_page(driver, page_url, prefetched_html, rate_limiter)
+        return render_search_page(driver, page_url, prefetched_html, rate_limiter)
+
+    scrape_omayzi._load_search_page = timed_load_search_page
+    scrape_omayzi.fetch_search_html = probe.timed('search', scrape_omayzi.fetch_search_html)
+    scrape_omayzi.fetch_job_html = probe.timed('job', scrape_omayzi.fetch_job_html)
+    scrape_omayzi.parse_search_results = probe.parsing(scrape_omayzi.parse_search_results)
+    scrape_omayzi.parse_job_details = probe.parsing(scrape_omayzi.parse_job_details)
+    result = json.loads(scrape_omayzi.scrape_seek_jobs(KEYWORD, LOCATION, str(jobs)))
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return len(result['jobs'])
+
+
+RUNNERS = {'scraper': run_scraper, 'scrape_seek': run_scrape_seek, 'scrape_omayzi': run_scrape_omayzi}
+
+
+def _peak_rss_mb():
+    """(this process, largest waited-for child) peak RSS in MB; None where the platform cannot tell."""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(own / scale, 1), (round(children / scale, 1) if children else None)
+
+
+def run_worker(target, jobs, result_path):
+    sys.path.insert(0, ROOT)
+    probe = Probe()
+    result = {'target': target, 'jobs': 0, 'error': None}
+    started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        result['jobs'] = RUNNERS[target](probe, jobs)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - started
+    peak_rss, children_peak_rss = _peak_rss_mb()
+    result.update(
+        seconds=round(seconds, 3), jobs_per_s=round(result['jobs'] / seconds, 2) if seconds else None,
+        latency=probe.latency_report(), parse_cpu_s=round(probe.parse_cpu, 3),
+        cpu_s=round(time.process_time() - cpu_started, 3),
+        peak_rss_mb=peak_rss, children_peak_rss_mb=children_peak_rss,
+    )
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+# --- Parent side: serves the corpus, runs every target in a subprocess, writes the report ---
+
+def run_target(target, jobs, base_url, verbose=False):
+    """Runs one target in a fresh process; returns its measurements."""
+    with tempfile.TemporaryDirectory(prefix=f'bench-{target}-') as workdir:
+        result_path = os.path.join(workdir, 'result.json')
+        env = dict(os.environ, SEEK_BASE_URL=base_url, SEEK_CACHE_DISABLED='1',
+                   SEEK_RATE_LIMIT='1000000', SEEK_RATE_BURST='1000000',
+                   JOB_STORE_PATH=os.path.join(workdir, 'jobs.sqlite3'),
+                   PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+        output = None if verbose else subprocess.DEVNULL
+        requests_before = FixtureRequestHandler.requests_served
+        try:
+            # The scrapers write CSV files to the working directory, so each run gets its own
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', target, '--jobs', str(jobs),
+                            '--result', result_path], cwd=workdir, env=env, stdout=output, stderr=output,
+                           timeout=RUN_TIMEOUT, check=False)
+            with open(result_path, encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            result = {'target': target, 'jobs': 0, 'error': f"Run did not complete: {e}"}
+        result['requests'] = FixtureRequestHandler.requests_served - requests_before
+        return result
+
+
+def summarize(runs):
+    """Median of each metric over the successful runs."""
+    ok = [run for run in runs if not run.get('error')]
+    if not ok:
+        return {'error': runs[-1].get('error') if runs else 'no runs'}
+
+    def median(values):
+        values = [value for value in values if value is not None]
+        return round(statistics.median(values), 3) if values else None
+
+    return {
+        'runs': len(ok), 'jobs': median([run['jobs'] for run in ok]),
+        'jobs_per_s': median([run['jobs_per_s'] for run in ok]),
+        'p50_ms': median([run['latency']['all']['p50_ms'] for run in ok]),
+        'p95_ms': median([run['latency']['all']['p95_ms'] for run in ok]),
+        'parse_cpu_s': median([run['parse_cpu_s'] for run in ok]),
+        'cpu_s': median([run['cpu_s'] for run in ok]),
+        'peak_rss_mb': median([run['peak_rss_mb'] for run in ok]),
+        'children_peak_rss_mb': median([run['children_peak_rss_mb'] for run in ok]),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Lines describing how each summary metric moved against `baseline`."""
+    lines = [f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('created_at')}):"]
+    for target, current in report['results'].items():
+        before = baseline.get('results', {}).get(target, {}).get('summary')
+        after = current['summary']
+        if not before or 'error' in before or 'error' in after:
+            lines.append(f"  {target}: not comparable")
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old * 100
+            better = delta > 0 if higher_is_better else delta < 0
+            mark = '' if abs(delta) < 5 else (' better' if better else ' WORSE')
+            changes.append(f"{metric} {old} -> {new} ({delta:+.1f}%{mark})")
+        lines.append(f"  {target}: " + '; '.join(changes))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraping benchmarks against recorded Seek pages.")
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help="jobs each target scrapes (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per target; the summary is their median")
+    parser.add_argument('--latency-ms', type=float, default=20, help="simulated network latency per page (default: %(default)s)")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help="page corpus (generated if missing)")
+    parser.add_argument('--output', default='benchmark_report.json')
+    parser.add_argument('--compare', help="earlier report to compare the summaries with")
+    parser.add_argument('--verbose', action='store_true', help="show the scrapers' own output")
+    parser.add_argument('--worker', choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.jobs, args.result)
+        return
+
+    if not os.path.isdir(os.path.join(args.fixtures, 'search')):
+        print(f"Generating the fixture corpus in {args.fixtures}...", file=sys.stderr)
+        generate(args.fixtures)
+    server, base_url = start_server(args.fixtures, latency_ms=args.latency_ms)
+    print(f"Fixture server at {base_url} ({args.latency_ms} ms latency).", file=sys.stderr)
+
+    results = {}
+    try:
+        for target in args.targets:
+            runs = []
+            for i in range(max(1, args.repeat)):
+                print(f"Running {target} ({i + 1}/{args.repeat})...", file=sys.stderr)
+                run = run_target(target, args.jobs, base_url, args.verbose)
+                if run.get('error'):
+                    print(f"  {target} failed: {run['error']}", file=sys.stderr)
+                else:
+                    print(f"  {run['jobs']} jobs in {run['seconds']} s ({run['jobs_per_s']} jobs/s), "
+                          f"p95 {run['latency']['all']['p95_ms']} ms, parse CPU {run['parse_cpu_s']} s", file=sys.stderr)
+                runs.append(run)
+            results[target] = {'summary': summarize(runs), 'runs': runs}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+        'settings': {'jobs': args.jobs, 'repeat': args.repeat, 'latency_ms': args.latency_ms,
+                     'fixtures': os.path.relpath(args.fixtures, ROOT)},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({target: result['summary'] for target, result in results.items()}, indent=2))
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print('\n'.join(compare(report, json.load(f))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+# browser_pool.py
+import asyncio
+import queue
+import sys
+import threading
+import time
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES = 200    # Restart a browser after this many page loads...
+DEFAULT_MAX_RSS_MB = 1024  # ...or once it (chromedriver + Chrome processes) uses this much memory
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of a process and all its children in MB, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass  # Renderer exited while we were counting
+    return total / (1024 * 1024)
+
+
+class DriverLease:
+    """A checked-out browser: the WebDriver, its ResourceBlocker and usage counters."""
+
+    def __init__(self, driver, blocker):
+        self.driver = driver
+        self.blocker = blocker
+        self.pages = 0
+        self.created_at = time.time()
+
+    def rss_mb(self):
+        try:
+            pid = self.driver.service.process.pid
+        except AttributeError:
+            return None
+        return process_tree_rss_mb(pid)
+
+
+class DriverPool:
+    """Thread-safe pool of warm Selenium drivers with checkout/return semantics.
+
+    `factory(blocker)` creates a driver (scrape_omayzi.get_driver). Idle
+    drivers are health-checked on checkout and replaced if they died; on
+    return they are recycled after `max_pages` page loads or when their
+    process tree exceeds `max_rss_mb` (needs psutil). `checkout_timeout`
+    bounds how long checkout() waits for a free browser (None waits forever).
+    """
+
+    def __init__(self, factory, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, blocker_factory=None, checkout_timeout=None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.blocker_factory = blocker_factory
+        self.checkout_timeout = checkout_timeout
+        self.created = 0
+        self.recycled = 0
+        self.checkouts = 0
+        self._idle = queue.LifoQueue()  # Most recently used first keeps the others' pages cold
+        self._live = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _new_lease(self):
+        blocker = self.blocker_factory() if self.blocker_factory else None
+        driver = self.factory(blocker)
+        with self._lock:
+            self.created += 1
+        return DriverLease(driver, blocker)
+
+    def _discard(self, lease, reason):
+        print(f"Python: Recycling browser ({reason}, {lease.pages} pages).", file=sys.stderr)
+        try:
+            lease.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._live -= 1
+            self.recycled += 1
+
+    @staticmethod
+    def is_healthy(lease):
+        try:
+            return lease.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def warm(self):
+        """Starts browsers until the pool is full, so the first requests skip the cold start."""
+        while True:
+            with self._lock:
+                if self._live >= self.size:
+                    return
+                self._live += 1
+            try:
+                self._idle.put(self._new_lease())
+            except Exception:
+                with self._lock:
+                    self._live -= 1
+                raise
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def checkout(self, timeout=None):
+        """Returns a healthy DriverLease, starting a browser if the pool is not full yet.
+
+        Blocks up to `timeout` seconds (default: `checkout_timeout`) when every
+        browser is in use; raises TimeoutError if none became free in time.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            try:
+                lease = self._idle.get_nowait()
+            except queue.Empty:
+                lease = None
+                with self._lock:
+                    can_start = self._live < self.size
+                    if can_start:
+                        self._live += 1
+                if can_start:
+                    try:
+                        lease = self._new_lease()
+                    except Exception:
+                        with self._lock:
+                            self._live -= 1
+                        raise
+                else:
+                    remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                    try:
+                        lease = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        raise TimeoutError(f"No browser became free within {timeout} seconds") from None
+            if self.is_healthy(lease):
+                with self._lock:
+                    self.checkouts += 1
+                return lease
+            self._discard(lease, "failed health check")
+
+    def release(self, lease, pages=0):
+        """Returns a lease after use, recycling its browser if it is worn out or broken."""
+        lease.pages += pages
+        if self._closed:
+            self._discard(lease, "pool closed")
+        elif self.max_pages and lease.pages >= self.max_pages:
+            self._discard(lease, "page limit reached")
+        elif self.max_rss_mb and (lease.rss_mb() or 0) > self.max_rss_mb:
+            self._discard(lease, f"over {self.max_rss_mb} MB RSS")
+        elif not self.is_healthy(lease):
+            self._discard(lease, "failed health check")
+        else:
+            try:
+                lease.driver.get('about:blank')  # Drop the last page's DOM and timers while idle
+            except Exception:
+                pass
+            self._idle.put(lease)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size, 'live': self._live, 'idle': self._idle.qsize(),
+                'created': self.created, 'recycled': self.recycled, 'checkouts': self.checkouts,
+            }
+
+    def close(self):
+        """Quits every idle browser; leases still checked out are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                lease = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(lease, "pool closed")
+
+
+class BrowserLease:
+    """A checked-out Playwright browser and its usage counters."""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class PlaywrightPool:
+    """Pool of warm Playwright browsers for the asyncio scraper, with checkout/return semantics.
+
+    Playwright objects belong to the event loop that created them, so the
+    pool runs its own loop on a background thread and run(fn) awaits
+    fn(lease) there, from any thread. `launch(playwright)` starts a browser
+    (scrape_seek._launch_browser; None means the launch failed). Browsers
+    are health-checked on checkout and recycled after `max_pages` page
+    loads; Playwright does not expose the browser process, so unlike
+    DriverPool there is no memory cap.
+    """
+
+    def __init__(self, launch, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES, checkout_timeout=None):
+        self.launch = launch
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.created = 0
+        self.recycled = 0
+        self.checkouts = 0
+        self._idle = []  # Most recently used last; popped first
+        self._live = 0
+        self._closed = False
+        self._playwright = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='playwright-pool', daemon=True)
+        self._thread.start()
+        self._slots = self._call(self._make_slots())
+
+    async def _make_slots(self):
+        return asyncio.Semaphore(self.size)  # Created on the pool's loop
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _new_lease(self):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        browser = await self.launch(self._playwright)
+        if browser is None:
+            raise RuntimeError("Could not launch a browser")
+        self._live += 1
+        self.created += 1
+        return BrowserLease(browser)
+
+    async def _discard(self, lease, reason):
+        print(f"Python: Recycling browser ({reason}, {lease.pages} pages).", file=sys.stderr)
+        try:
+            await lease.browser.close()
+        except Exception:
+            pass
+        self._live -= 1
+        self.recycled += 1
+
+    @staticmethod
+    def is_healthy(lease):
+        try:
+            return lease.browser.is_connected()
+        except Exception:
+            return False
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def warm(self):
+        """Launches browsers until the pool is full, so the first runs skip the cold start."""
+        async def fill():
+            while self._live < self.size:
+                self._idle.append(await self._new_lease())
+        self._call(fill())
+
+    async def checkout(self, timeout=None):
+        """Returns a healthy BrowserLease (on the pool's loop), launching a browser if none is idle.
+
+        Waits up to `timeout` seconds (default: `checkout_timeout`) when every
+        browser is in use; raises TimeoutError if none became free in time.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        timeout = self.checkout_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No browser became free within {timeout} seconds") from None
+        try:
+            while self._idle:
+                lease = self._idle.pop()
+                if self.is_healthy(lease):
+                    break
+                await self._discard(lease, "failed health check")
+            else:
+                lease = await self._new_lease()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.checkouts += 1
+        return lease
+
+    async def release(self, lease, pages=0):
+        """Returns a lease after use, recycling its browser if it is worn out or disconnected."""
+        lease.pages += pages
+        try:
+            if self._closed:
+                await self._discard(lease, "pool closed")
+            elif self.max_pages and lease.pages >= self.max_pages:
+                await self._discard(lease, "page limit reached")
+            elif not self.is_healthy(lease):
+                await self._discard(lease, "failed health check")
+            else:
+                self._idle.append(lease)
+        finally:
+            self._slots.release()
+
+    def run(self, fn):
+        """Awaits fn(lease) on a pooled browser and returns its result. Blocks the calling thread.
+
+        `fn` may add the page loads it made to lease.pages.
+        """
+        async def leased():
+            lease = await self.checkout()
+            try:
+                return await fn(lease)
+            finally:
+                await self.release(lease)
+        return self._call(leased())
+
+    def stats(self):
+        return {
+            'size': self.size, 'live': self._live, 'idle': len(self._idle),
+            'created': self.created, 'recycled': self.recycled, 'checkouts': self.checkouts,
+        }
+
+    def close(self):
+        """Closes every browser and Playwright, then stops the pool's loop. Call it once no run is in flight."""
+        if self._closed:
+            return
+        self._closed = True
+
+        async def shut_down():
+            while self._idle:
+                await self._discard(self._idle.pop(), "pool closed")
+            if self._playwright is not None:
+                await self._playwright.stop()
+        try:
+            self._call(shut_down())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
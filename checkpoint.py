@@ -0,0 +1,144 @@
+# checkpoint.py
+"""Checkpoints that let a long scraping run resume after a crash or kill.
+
+Each run writes to <SEEK_CHECKPOINT_DIR, default ./checkpoints>/<run id>/:
+
+    run.json        the run's parameters (search, job limit, options)
+    journal.ndjson  one line per finished job, appended and fsynced before the job is output
+    frontier.json   job URLs found but not finished yet, and the next search page to load
+
+RunCheckpoint.resume(run_id) reads them back. The resumed run replays
+finished jobs from the journal without fetching them again. It fetches
+the pending URLs first, then continues the search at the saved page. The
+directory is removed once a run completes.
+"""
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from seek_parser import job_id_from_url
+
+DEFAULT_CHECKPOINT_DIR = os.environ.get('SEEK_CHECKPOINT_DIR', 'checkpoints')
+
+
+def _job_key(url):
+    """De-duplication key of a job URL: its integer job ID, or the URL itself."""
+    job_id = job_id_from_url(url)
+    return job_id if job_id is not None else url
+
+
+def _write_json_atomic(path, data):
+    """Replaces `path` with `data` so a crash leaves either the old or the new file, never half of one."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class RunCheckpoint:
+    """Journal and frontier of one run. Use create() for a new run and resume() for an interrupted one."""
+
+    def __init__(self, run_id, path, params, jobs=(), done=(), pending=(), next_page=1):
+        self.run_id = run_id
+        self.path = path
+        self.params = params
+        self.jobs = list(jobs)          # Output of the jobs finished before a resume, in order
+        self.next_page = next_page      # Next search page to load; None once the search is exhausted
+        self._done = set(done)          # Keys of finished jobs (output or not)
+        self._pending = {_job_key(url): url for url in pending}  # Found, not finished; in discovery order
+        self._journal = None
+        self.finished = False
+
+    @classmethod
+    def create(cls, params, base_dir=None):
+        """Starts the checkpoint of a new run; `params` is anything JSON-serialisable needed to restart it."""
+        run_id = time.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:6]
+        path = os.path.join(base_dir or DEFAULT_CHECKPOINT_DIR, run_id)
+        os.makedirs(path)
+        _write_json_atomic(os.path.join(path, 'run.json'), {'run_id': run_id, 'created_at': time.time(), 'params': params})
+        print(f"Python: Checkpointing run {run_id} to {path}.", file=sys.stderr)
+        return cls(run_id, path, params)
+
+    @classmethod
+    def resume(cls, run_id, base_dir=None):
+        """Loads an interrupted run. Raises FileNotFoundError if there is no checkpoint for `run_id`."""
+        path = os.path.join(base_dir or DEFAULT_CHECKPOINT_DIR, run_id)
+        with open(os.path.join(path, 'run.json'), encoding='utf-8') as f:
+            params = json.load(f)['params']
+
+        jobs, done = [], set()
+        journal_path = os.path.join(path, 'journal.ndjson')
+        if os.path.exists(journal_path):
+            with open(journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break # Torn last line from the crash; that job is fetched again
+                    done.add(_job_key(entry['url']))
+                    if entry.get('job') is not None:
+                        jobs.append(entry['job'])
+
+        pending, next_page = [], 1
+        frontier_path = os.path.join(path, 'frontier.json')
+        if os.path.exists(frontier_path):
+            with open(frontier_path, encoding='utf-8') as f:
+                frontier = json.load(f)
+            pending = [url for url in frontier['pending'] if _job_key(url) not in done]
+            next_page = frontier['next_page']
+        print(f"Python: Resuming run {run_id}: {len(done)} jobs finished, {len(pending)} pending, "
+              f"search {'finished' if next_page is None else f'continues at page {next_page}'}.", file=sys.stderr)
+        return cls(run_id, path, params, jobs, done, pending, next_page)
+
+    def known_ids(self):
+        """Keys of every job finished or pending, to skip when they show up on search pages again."""
+        return self._done | set(self._pending)
+
+    def pending_urls(self):
+        return list(self._pending.values())
+
+    @property
+    def search_done(self):
+        """True once the search is exhausted and every job found has finished."""
+        return self.next_page is None and not self._pending
+
+    def add_pending(self, urls, next_page):
+        """Records one search page's job URLs (to fetch) and the search page to load after it."""
+        for url in urls:
+            key = _job_key(url)
+            if key not in self._done:
+                self._pending.setdefault(key, url)
+        self.next_page = next_page
+        _write_json_atomic(os.path.join(self.path, 'frontier.json'),
+                           {'pending': self.pending_urls(), 'next_page': next_page})
+
+    def record_job(self, url, job=None):
+        """Journals a finished job before it is output. `job` is None for a job finished without output."""
+        if self._journal is None:
+            self._journal = open(os.path.join(self.path, 'journal.ndjson'), 'a', encoding='utf-8')
+        self._journal.write(json.dumps({'url': url, 'job': job}) + '\n')
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        key = _job_key(url)
+        self._done.add(key)
+        self._pending.pop(key, None)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def finish(self):
+        """Removes the checkpoint of a completed run."""
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.finished = True
+        print(f"Python: Run {self.run_id} complete; checkpoint removed.", file=sys.stderr)
+
+    def report(self):
+        """One line about an unfinished run."""
+        return f"Run {self.run_id} did not finish ({len(self._pending)} jobs pending); checkpoint kept in {self.path}."
@@ -0,0 +1,136 @@
+# contact_extract.py
+"""Phone number and email extraction for job descriptions.
+
+Patterns are compiled once and anchored with look-behinds so a match can
+only start at the beginning of a digit / address run; scanning is linear
+even on descriptions full of numbers. Australian numbers are normalised
+to E.164 (+61...) and duplicates are dropped.
+
+    python contact_extract.py backfill [--db jobs.sqlite3] [--workers 8]
+"""
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# A phone candidate: optional '+' or '(', then 8-15 digits, each step one digit preceded
+# by at most a short separator ('.' only directly between digits, so '000. 1300' splits).
+# Not preceded by a word character, '+', '(' or '@' so it never starts mid-run or in an email domain.
+PHONE_RE = re.compile(r'(?<![\w+(@])[+(]?\d(?:[ ()-]{1,2}\d|\.\d|\d){7,14}(?!\w|\.\d)')
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{2}[./-]\d{2}[./-]\d{4}')  # 2024-01-15, 15/01/2024: not phones
+# Local part starts only at the beginning of a run of address characters.
+EMAIL_RE = re.compile(r'(?<![\w.%+-])[\w.%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){0,8}\.[A-Za-z]{2,24}\b', re.ASCII)
+NON_DIGIT_RE = re.compile(r'\D')
+
+MIN_PHONE_DIGITS = 8   # Shorter digit runs are usually IDs, years or salaries
+MAX_PHONE_DIGITS = 15  # E.164 maximum
+BATCH_CHUNK_SIZE = 256  # Descriptions sent to a worker process at a time
+
+
+def normalize_au_phone(candidate):
+    """E.164 form of an Australian number ('(03) 9123 4567' -> '+61391234567').
+
+    1300/1800 numbers are kept in national form (they cannot be dialled
+    from abroad), other international numbers keep their '+' prefix, and
+    anything without enough digits returns None. That includes six-digit
+    13 xx xx numbers, which look too much like salaries and IDs.
+    """
+    digits = NON_DIGIT_RE.sub('', candidate)
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return None
+    if digits.startswith('61') and len(digits) == 11:
+        return '+' + digits
+    if digits.startswith('0') and len(digits) == 10:
+        return '+61' + digits[1:]
+    if digits.startswith(('1300', '1800')) and len(digits) == 10:
+        return digits
+    if candidate.lstrip().startswith('+'):
+        return '+' + digits
+    return digits
+
+
+def extract_contacts(text):
+    """Returns (phones, emails): E.164-normalised phones and lower-cased emails, de-duplicated in order."""
+    if not text:
+        return [], []
+    phones = []
+    for match in PHONE_RE.finditer(text):
+        if DATE_RE.fullmatch(match.group()):
+            continue
+        phone = normalize_au_phone(match.group())
+        if phone and phone not in phones:
+            phones.append(phone)
+    emails = []
+    for match in EMAIL_RE.finditer(text):
+        email = match.group().strip('.').lower()
+        if email not in emails:
+            emails.append(email)
+    return phones, emails
+
+
+def extract_contact_info(text):
+    """Extracts phone numbers and email addresses from text as ('a, b' or '-', 'c' or '-')."""
+    phones, emails = extract_contacts(text)
+    phone_str = ', '.join(phones) if phones else '-'
+    email_str = ', '.join(emails) if emails else '-'
+    return phone_str, email_str
+
+
+def extract_contact_info_batch(texts, workers=None, chunksize=BATCH_CHUNK_SIZE, executor=None):
+    """extract_contact_info() over many texts, in order.
+
+    With `workers` > 1 (or an existing `executor`) the texts are spread over
+    a process pool in chunks of `chunksize`; otherwise they are processed
+    in this process.
+    """
+    texts = list(texts)
+    if len(texts) <= chunksize or (executor is None and (not workers or workers <= 1)):
+        return [extract_contact_info(text) for text in texts]
+    if executor is not None:
+        return list(executor.map(extract_contact_info, texts, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_contact_info, texts, chunksize=chunksize))
+
+
+def backfill(store, workers=None, batch_size=5000):
+    """Re-extracts phone and email for every stored job with a description; returns the number updated."""
+    updated = 0
+    last_id = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None # One pool for all batches
+    try:
+        while True:
+            batch = store.descriptions(after_job_id=last_id, limit=batch_size)
+            if not batch:
+                return updated
+            contacts = extract_contact_info_batch([description for _, description in batch], executor=pool)
+            store.update_contacts([(job_id, phone, email) for (job_id, _), (phone, email) in zip(batch, contacts)])
+            updated += len(batch)
+            last_id = batch[-1][0]
+            print(f"Backfilled contacts for {updated} jobs...", file=sys.stderr)
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+def main():
+    from job_store import DEFAULT_STORE_PATH, JobStore
+
+    parser = argparse.ArgumentParser(description="Contact extraction tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    backfill_parser = commands.add_parser('backfill', help="re-extract phones and emails for every stored job")
+    backfill_parser.add_argument('--db', default=os.environ.get('JOB_STORE_PATH', DEFAULT_STORE_PATH))
+    backfill_parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                                 help="parser processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    store = JobStore(args.db)
+    try:
+        updated = backfill(store, args.workers)
+        print(f"Updated contacts for {updated} jobs.")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
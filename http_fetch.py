@@ -0,0 +1,114 @@
+# http_fetch.py
+import sys
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from scraper import HEADERS
+from metrics import METRICS
+from page_cache import fetch_with_cache, get_cache
+from resilience import CHALLENGE, RETRYABLE, ScrapeError, check_response, default_policy, is_challenge_page
+
+# Attributes the job detail extractor relies on; without them the browser has to render the page
+REQUIRED_DETAIL_MARKERS = (
+    'data-automation="job-detail-title"',
+    'data-automation="jobAdDetails"',
+)
+
+# Embedded JSON the structured extractor can use even when the DOM is client-rendered
+EMBEDDED_JSON_MARKERS = ('window.SEEK_REDUX_DATA', '"JobPosting"')
+
+SEARCH_CARD_MARKER = 'data-card-type="JobCard"'
+
+POOL_SIZE = 16  # Keep-alive connections kept per host
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _accept_encoding():
+    """Only advertise brotli when urllib3 can actually decode it."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return 'gzip, deflate'
+    return 'gzip, deflate, br'
+
+
+def get_session():
+    """Returns the process-wide pooled requests.Session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(HEADERS)
+            session.headers['Accept-Encoding'] = _accept_encoding()
+            _session = session
+    return _session
+
+
+def has_required_selectors(html):
+    """True if the HTML carries what seek_parser needs: embedded job JSON or the detail elements."""
+    if any(marker in html for marker in EMBEDDED_JSON_MARKERS):
+        return True
+    return all(marker in html for marker in REQUIRED_DETAIL_MARKERS)
+
+
+def _fetch_parseable_html(url, is_parseable, what, timeout, rate_limiter=None, revalidate=False):
+    """GETs `url` (through the page cache) and returns its HTML, or None if the browser is needed.
+
+    Timeouts, network errors, 429s and 5xx answers are retried with backoff
+    first; a challenge page goes straight to the browser (retrying the same
+    plain GET would only be challenged again) but still counts as a block.
+    """
+    def cacheable(html):
+        return not is_challenge_page(url, html) and is_parseable(html)
+
+    def fetch():
+        with METRICS.span('http_get', kind=kind):
+            response = fetch_with_cache(get_session(), url, get_cache(), timeout, should_store=cacheable,
+                                        before_request=rate_limiter.wait if rate_limiter else None,
+                                        revalidate=revalidate)
+        if not response.from_cache:
+            check_response(url, response.status_code, response.text, response.url, response.retry_after)
+        return response
+
+    kind = 'job' if '/job/' in url else 'search'
+    try:
+        response = default_policy(retry_on=RETRYABLE - {CHALLENGE}, unreported={CHALLENGE}).call(url, fetch)
+    except ScrapeError as e:
+        print(f"HTTP fetch failed for {url}: {e}; falling back to browser.", file=sys.stderr)
+        if e.kind == CHALLENGE:
+            METRICS.count('challenge_pages', kind=kind)
+        METRICS.count('retries', kind=kind, via='browser', reason=e.kind)
+        return None
+
+    html = response.text
+    if not response.from_cache and not is_parseable(html):
+        print(f"{what} missing from HTTP response for {url}; falling back to browser.", file=sys.stderr)
+        METRICS.count('retries', kind=kind, via='browser', reason='missing_elements')
+        return None
+    return html
+
+
+def fetch_job_html(job_url, timeout=15, rate_limiter=None, revalidate=False):
+    """Fetches a job detail page with a plain GET (served from the page cache when fresh).
+
+    Returns the HTML when it can be parsed without a browser, or None when
+    the caller should fall back to rendering the page (failure after retries,
+    error status, challenge page, or the required elements are missing).
+    `rate_limiter` is only waited on when a request is actually sent.
+    With `revalidate` a cached copy is only used after a 304 from the server.
+    """
+    return _fetch_parseable_html(job_url, has_required_selectors, "Job detail elements", timeout, rate_limiter,
+                                 revalidate)
+
+
+def fetch_search_html(search_url, timeout=15, rate_limiter=None):
+    """Fetches a search results page with a plain GET; None unless it contains job cards."""
+    return _fetch_parseable_html(search_url, lambda html: SEARCH_CARD_MARKER in html, "Job cards", timeout, rate_limiter)
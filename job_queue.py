@@ -0,0 +1,139 @@
+# job_queue.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+FINISHED_JOB_TTL = 60 * 60  # Finished jobs stay queryable for an hour
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class ScrapeJob:
+    """One queued scrape: status, progress counters and the results gathered so far."""
+
+    def __init__(self, key, params):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.params = params
+        self.status = QUEUED
+        self.error = None
+        self.pages_done = 0
+        self.results = []
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # Wakes streaming readers on new rows or completion
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def add_results(self, rows):
+        """Called by the scraper after each result page; rows become visible to pollers immediately."""
+        with self._lock:
+            self.pages_done += 1
+            self.results.extend(rows)
+            self._changed.notify_all()
+
+    def results_since(self, offset=0):
+        with self._lock:
+            return self.results[offset:]
+
+    def wait_for_results(self, offset=0, timeout=None):
+        """Blocks until there are rows after `offset` or the job finished (or `timeout` passed); returns those rows."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.results) > offset or self.finished, timeout)
+            return self.results[offset:]
+
+    def _set_status(self, status):
+        with self._changed:
+            self.status = status
+            if self.finished:
+                self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'job_id': self.id, 'status': self.status, 'error': self.error, 'params': self.params,
+                'progress': {'pages': self.pages_done, 'results': len(self.results)},
+                'submitted_at': self.submitted_at, 'started_at': self.started_at, 'finished_at': self.finished_at,
+            }
+
+
+class JobQueue:
+    """Runs scrapes on a bounded worker pool so web requests return immediately.
+
+    `runner(job, **params)` does the work and returns the final result list;
+    it can publish partial results with job.add_results(). Submitting the
+    same parameters while an identical scrape is queued or running returns
+    that job instead of starting another one.
+    """
+
+    def __init__(self, runner, workers=DEFAULT_WORKERS, finished_ttl=FINISHED_JOB_TTL):
+        self.runner = runner
+        self.finished_ttl = finished_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape-worker')
+        self._jobs = {}       # job ID -> ScrapeJob
+        self._in_flight = {}  # de-duplication key -> ScrapeJob
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(params):
+        """Normalised parameters: "Data Scientist " and "data scientist" are the same search."""
+        return tuple(sorted((name, str(value).strip().lower()) for name, value in params.items() if value is not None))
+
+    def submit(self, **params):
+        """Queues a scrape and returns its ScrapeJob (an existing one for an identical in-flight search)."""
+        key = self.make_key(params)
+        with self._lock:
+            self._prune()
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+            job = ScrapeJob(key, params)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job.started_at = time.time()
+        job._set_status(RUNNING)
+        try:
+            results = self.runner(job, **job.params)
+            with job._lock:
+                if results is not None and len(results) >= len(job.results):
+                    job.results = list(results)
+            job._set_status(DONE)
+        except Exception as e:
+            print(f"Scrape job {job.id} failed: {e}")
+            job.error = str(e)
+            job._set_status(FAILED)
+        finally:
+            with self._lock:
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+
+    def _prune(self):
+        """Forgets finished jobs older than `finished_ttl`. Caller holds the lock."""
+        cutoff = time.time() - self.finished_ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,380 @@
+# job_store.py
+"""One SQLite store for every scraped job, keyed on the Seek job ID.
+
+    python job_store.py export jobs.csv [--search "data scientist"] [--company ...] [--location ...]
+    python job_store.py search 'python "machine learning" data*'
+    python job_store.py stats
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from seek_parser import JOB_COLUMNS, job_id_from_url
+
+DEFAULT_STORE_PATH = 'jobs.sqlite3'
+
+# Job dict key (seek_parser.JOB_COLUMNS) -> SQL column
+COLUMN_MAP = {
+    "Job Title": 'title',
+    "Company Name": 'company',
+    "Location": 'location',
+    "Salary/Pay Range": 'salary',
+    "Job Type": 'job_type',
+    "Date Posted": 'date_posted',
+    "Key Responsibilities": 'responsibilities',
+    "Required Skills/Qualifications": 'qualifications',
+    "Phone Number": 'phone',
+    "Email": 'email',
+    "Full Job Description": 'description',
+    "Job URL": 'url',
+}
+SQL_COLUMNS = [COLUMN_MAP[column] for column in JOB_COLUMNS]
+
+# Search-card dicts from scraper.parse_job_cards use short keys
+CARD_KEYS = {'title': "Job Title", 'company': "Company Name", 'salary': "Salary/Pay Range",
+             'description': "Full Job Description", 'url': "Job URL"}
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    {', '.join(f'{column} TEXT' for column in SQL_COLUMNS)},
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_searches (
+    search_term TEXT NOT NULL,
+    job_id INTEGER NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (search_term, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location);
+CREATE INDEX IF NOT EXISTS idx_jobs_date_posted ON jobs(date_posted);
+CREATE INDEX IF NOT EXISTS idx_job_searches_job ON job_searches(job_id);
+'''
+
+# Full-text index over title, company and description. External content: the text
+# lives only in `jobs`; triggers keep the index in step with every insert, update and delete.
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description,
+    content='jobs', content_rowid='job_id',
+    tokenize='porter unicode61', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, description) VALUES (new.job_id, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description) VALUES ('delete', old.job_id, old.title, old.company, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, description ON jobs
+WHEN old.title IS NOT new.title OR old.company IS NOT new.company OR old.description IS NOT new.description BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description) VALUES ('delete', old.job_id, old.title, old.company, old.description);
+    INSERT INTO jobs_fts (rowid, title, company, description) VALUES (new.job_id, new.title, new.company, new.description);
+END;
+'''
+FTS_WEIGHTS = (10.0, 5.0, 1.0)  # BM25 column weights: a title match outranks a description match
+
+QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def normalize_search_term(term):
+    return ' '.join(term.lower().split()) if term else None
+
+
+def fts_query(text):
+    """Turns a user query into an FTS5 MATCH expression.
+
+    "quoted phrases" match exactly, word* is a prefix search, OR / NOT / AND
+    are operators, and every other word must appear. Terms are quoted so
+    punctuation in user input (c++, .net, AT&T) never becomes FTS5 syntax.
+    """
+    parts = []
+    for phrase, word in QUERY_TOKEN_RE.findall(text or ''):
+        if phrase:
+            if phrase.strip():
+                parts.append('"' + phrase.replace('"', '""') + '"')
+        elif word in ('OR', 'NOT', 'AND'):
+            if parts and parts[-1] not in ('OR', 'NOT', 'AND'):
+                parts.append(word)
+        else:
+            prefix = word.endswith('*')
+            term = word.rstrip('*').replace('"', '""')
+            if term:
+                parts.append(f'"{term}"' + ('*' if prefix else ''))
+    while parts and parts[-1] in ('OR', 'NOT', 'AND'):
+        parts.pop()
+    return ' '.join(parts)
+
+
+def job_record(job):
+    """Maps a job dict (detail columns or search-card keys) to SQL column values; '-' becomes NULL."""
+    if "Job URL" not in job and 'url' in job:
+        job = {CARD_KEYS[key]: value for key, value in job.items() if key in CARD_KEYS}
+    record = {}
+    for column, sql_column in COLUMN_MAP.items():
+        value = job.get(column)
+        record[sql_column] = None if value in (None, '', '-') else value
+    return record
+
+
+def is_error_record(record):
+    """True for the placeholder of a job that failed to scrape (scrape_omayzi or scrape_seek format)."""
+    return record['title'] == "Error scraping details" or (record['description'] or '').startswith('Error scraping: ')
+
+
+class JobStore:
+    """SQLite (WAL) job store: upserts keyed on the Seek job ID, one transaction per batch."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(SCHEMA)
+        self.fts_enabled = self._create_fts()
+        self._conn.commit()
+
+    def _create_fts(self):
+        """Creates the FTS5 index (filling it from existing rows once); False if SQLite lacks FTS5."""
+        has_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'").fetchone()
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable ({e}); falling back to substring search.", file=sys.stderr)
+            return False
+        if not has_index:
+            self._conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        return True
+
+    def upsert_jobs(self, jobs, search_term=None, overwrite=True):
+        """Inserts or updates a batch of jobs in one transaction; returns how many were stored.
+
+        Jobs whose URL carries no Seek job ID and rows that failed to scrape
+        are skipped. With `overwrite=False` (e.g. search-card summaries),
+        values already stored for a job are kept and only gaps are filled.
+        """
+        now = time.time()
+        records = []
+        for job in jobs:
+            record = job_record(job)
+            job_id = job_id_from_url(record['url'] or '')
+            if job_id is None or is_error_record(record):
+                continue
+            records.append((job_id, record))
+        if not records:
+            return 0
+
+        if overwrite:
+            updates = ', '.join(f'{c} = COALESCE(excluded.{c}, jobs.{c})' for c in SQL_COLUMNS)
+        else:
+            updates = ', '.join(f'{c} = COALESCE(jobs.{c}, excluded.{c})' for c in SQL_COLUMNS)
+        upsert = (f'INSERT INTO jobs (job_id, {", ".join(SQL_COLUMNS)}, first_seen, last_seen) '
+                  f'VALUES ({", ".join("?" * (len(SQL_COLUMNS) + 3))}) '
+                  f'ON CONFLICT(job_id) DO UPDATE SET {updates}, last_seen = excluded.last_seen')
+        term = normalize_search_term(search_term)
+        with self._lock, self._conn:
+            self._conn.executemany(upsert, [
+                (job_id, *(record[c] for c in SQL_COLUMNS), now, now) for job_id, record in records])
+            if term:
+                self._conn.executemany(
+                    'INSERT INTO job_searches (search_term, job_id, last_seen) VALUES (?, ?, ?) '
+                    'ON CONFLICT(search_term, job_id) DO UPDATE SET last_seen = excluded.last_seen',
+                    [(term, job_id, now) for job_id, _ in records])
+        return len(records)
+
+    def link_search_term(self, job_ids, search_term):
+        """Records stored jobs as results of `search_term` without touching their details; returns how many."""
+        term = normalize_search_term(search_term)
+        if not term:
+            return 0
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                'INSERT INTO job_searches (search_term, job_id, last_seen) SELECT ?, job_id, ? FROM jobs WHERE job_id = ? '
+                'ON CONFLICT(search_term, job_id) DO UPDATE SET last_seen = excluded.last_seen',
+                [(term, now, job_id) for job_id in job_ids])
+        return cursor.rowcount
+
+    def _where(self, search_term=None, company=None, location=None, job_ids=None):
+        clauses, params = [], []
+        if search_term:
+            clauses.append('job_id IN (SELECT job_id FROM job_searches WHERE search_term = ?)')
+            params.append(normalize_search_term(search_term))
+        if company:
+            clauses.append('company = ?')
+            params.append(company)
+        if location:
+            clauses.append('location = ?')
+            params.append(location)
+        if job_ids is not None:
+            clauses.append(f'job_id IN ({",".join("?" * len(job_ids))})')
+            params.extend(job_ids)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def iter_jobs(self, search_term=None, company=None, location=None, job_ids=None, limit=None, offset=0):
+        """Yields matching jobs as dicts keyed by JOB_COLUMNS, most recently seen first."""
+        where, params = self._where(search_term, company, location, job_ids)
+        sql = f'SELECT {", ".join(SQL_COLUMNS)} FROM jobs{where} ORDER BY last_seen DESC, job_id'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for row in rows:
+            yield {column: row[COLUMN_MAP[column]] or '-' for column in JOB_COLUMNS}
+
+    def query(self, **filters):
+        return list(self.iter_jobs(**filters))
+
+    def count(self, search_term=None, company=None, location=None):
+        where, params = self._where(search_term, company, location)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM jobs{where}', params).fetchone()[0]
+
+    def search(self, query, limit=20, offset=0, search_term=None):
+        """Full-text search over title, company and description, best BM25 match first.
+
+        Returns (total matches, list of job dicts); each dict also has
+        'score' (lower is better) and 'snippet' (description excerpt with
+        matches in [brackets]).
+        """
+        match = fts_query(query)
+        if not match:
+            return 0, []
+        scope, scope_params = '', []
+        if search_term:
+            scope = ' AND jobs.job_id IN (SELECT job_id FROM job_searches WHERE search_term = ?)'
+            scope_params = [normalize_search_term(search_term)]
+        columns = ', '.join(f'jobs.{c}' for c in SQL_COLUMNS)
+
+        if self.fts_enabled:
+            base = f'FROM jobs_fts JOIN jobs ON jobs.job_id = jobs_fts.rowid WHERE jobs_fts MATCH ?{scope}'
+            sql = (f'SELECT {columns}, bm25(jobs_fts, {", ".join(map(str, FTS_WEIGHTS))}) AS score, '
+                   f"snippet(jobs_fts, 2, '[', ']', '...', 24) AS snippet {base} ORDER BY score LIMIT ? OFFSET ?")
+            params = [match, *scope_params]
+        else:
+            # Substring fallback: every term must appear somewhere; no ranking
+            terms = [t.strip('"*') for t in re.findall(r'"(?:[^"]|"")*"\*?', match)]
+            clauses = ' AND '.join("(COALESCE(title, '') || ' ' || COALESCE(company, '') || ' ' || "
+                                   "COALESCE(description, '')) LIKE ?" for _ in terms) or '1'
+            base = f'FROM jobs WHERE {clauses}{scope}'
+            sql = f"SELECT {columns}, 0 AS score, '' AS snippet {base} ORDER BY last_seen DESC LIMIT ? OFFSET ?"
+            params = [f'%{t}%' for t in terms] + scope_params
+        with self._lock:
+            try:
+                total = self._conn.execute(f'SELECT COUNT(*) {base}', params).fetchone()[0]
+                rows = self._conn.execute(sql, params + [limit, offset]).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query: {query!r} ({e})") from None
+        results = []
+        for row in rows:
+            job = {column: row[COLUMN_MAP[column]] or '-' for column in JOB_COLUMNS}
+            job['score'] = row['score']
+            job['snippet'] = row['snippet'] or ''
+            results.append(job)
+        return total, results
+
+    def descriptions(self, after_job_id=0, limit=5000):
+        """(job_id, description) pairs in job ID order, for batch re-processing."""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                'SELECT job_id, description FROM jobs WHERE job_id > ? AND description IS NOT NULL '
+                'ORDER BY job_id LIMIT ?', (after_job_id, limit))]
+
+    def update_contacts(self, contacts):
+        """Sets phone and email for (job_id, phone, email) tuples in one transaction ('-' clears them)."""
+        with self._lock, self._conn:
+            self._conn.executemany('UPDATE jobs SET phone = ?, email = ? WHERE job_id = ?', [
+                (None if phone == '-' else phone, None if email == '-' else email, job_id)
+                for job_id, phone, email in contacts])
+
+    def search_terms(self):
+        """Search terms seen so far with their job counts, most recent first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT search_term, COUNT(*), MAX(last_seen) FROM job_searches '
+                'GROUP BY search_term ORDER BY MAX(last_seen) DESC').fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def export_csv(self, out, **filters):
+        """Writes matching jobs as CSV (JOB_COLUMNS header) to a path or text file object; returns the row count."""
+        if isinstance(out, (str, os.PathLike)):
+            with open(out, 'w', newline='', encoding='utf-8') as csvfile:
+                return self.export_csv(csvfile, **filters)
+        writer = csv.DictWriter(out, fieldnames=JOB_COLUMNS)
+        writer.writeheader()
+        rows = 0
+        for job in self.iter_jobs(**filters):
+            writer.writerow(job)
+            rows += 1
+        return rows
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """Process-wide store at JOB_STORE_PATH (default jobs.sqlite3); None if it cannot be opened."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            try:
+                _default_store = JobStore(os.environ.get('JOB_STORE_PATH', DEFAULT_STORE_PATH))
+            except sqlite3.Error as e:
+                print(f"Job store unavailable ({e}); results will not be persisted.", file=sys.stderr)
+                return None
+    return _default_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the scraped job store.")
+    parser.add_argument('--db', default=os.environ.get('JOB_STORE_PATH', DEFAULT_STORE_PATH))
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="write matching jobs to a CSV file ('-' for stdout)")
+    export.add_argument('output')
+    export.add_argument('--search', help="only jobs found by this search term")
+    export.add_argument('--company')
+    export.add_argument('--location')
+    search = commands.add_parser('search', help="full-text search over title, company and description")
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+    commands.add_parser('stats', help="job counts per search term")
+    args = parser.parse_args()
+
+    store = JobStore(args.db)
+    try:
+        if args.command == 'export':
+            out = sys.stdout if args.output == '-' else args.output
+            rows = store.export_csv(out, search_term=args.search, company=args.company, location=args.location)
+            print(f"Exported {rows} jobs.", file=sys.stderr)
+        elif args.command == 'search':
+            total, results = store.search(args.query, limit=args.limit)
+            print(f"{total} matching jobs.")
+            for job in results:
+                print(f"{job['score']:8.2f}  {job['Job Title']} | {job['Company Name']} | {job['Job URL']}")
+                if job['snippet']:
+                    print(f"          {job['snippet']}")
+        else:
+            print(f"{store.count()} jobs stored.")
+            for term, count in store.search_terms():
+                print(f"  {count:6d}  {term}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# metrics.py
+"""Process-wide timings and counters for scraper runs.
+
+    from metrics import METRICS
+
+    with METRICS.span('navigate', page='job'):
+        driver.get(url)
+    METRICS.count('cache_lookups', result='hit')
+
+Spans feed a histogram per stage (launch, navigate, wait, page_source,
+parse, contacts, csv_write, ...); spans can nest (parse includes
+contacts). Counters track retries, blocks, cache hits and selector
+fallbacks. The registry is exported as Prometheus text (scrape_service.py
+and app.py serve it at /metrics) or as a JSON run summary
+(scrape_omayzi.py --metrics-file, batch_crawl.py).
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+METRIC_PREFIX = 'seek_scraper'
+# Histogram bucket upper bounds in seconds: from sub-millisecond parses to minute-long page loads
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+
+def _series_name(name, label_key):
+    if not label_key:
+        return name
+    return name + '{' + ','.join(f'{label}={value}' for label, value in label_key) + '}'
+
+
+def _prometheus_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + '}'
+
+
+class StageTimer:
+    """Duration histogram of one stage (and label set)."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds, failed=False):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.errors += failed
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class Metrics:
+    """Thread-safe registry of stage timers and counters."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._timers = {}    # (stage, label key) -> StageTimer
+        self._counters = {}  # (name, label key) -> value
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, failed=False, **labels):
+        key = (stage, _label_key(labels))
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = StageTimer(self.buckets)
+            timer.observe(seconds, failed)
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Times the enclosed block as one `stage` observation; exceptions are counted and re-raised."""
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, failed, **labels)
+
+    def count(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def summary(self):
+        """JSON-ready run summary: stages sorted by total time, then counters."""
+        with self._lock:
+            timers = sorted(self._timers.items(), key=lambda item: item[1].total, reverse=True)
+            stages = {
+                _series_name(stage, label_key): {
+                    'count': timer.count, 'total_s': round(timer.total, 3),
+                    'mean_ms': round(timer.total / timer.count * 1000, 2) if timer.count else 0,
+                    'max_ms': round(timer.max * 1000, 2), 'errors': timer.errors,
+                }
+                for (stage, label_key), timer in timers
+            }
+            counters = {_series_name(name, label_key): value
+                        for (name, label_key), value in sorted(self._counters.items())}
+            started_at = self.started_at
+        return {'started_at': started_at, 'elapsed_s': round(time.time() - started_at, 3),
+                'stages': stages, 'counters': counters}
+
+    def report(self, top=6):
+        """One line naming the stages that took the most time."""
+        stages = list(self.summary()['stages'].items())[:top]
+        if not stages:
+            return "Metrics: no stages recorded."
+        return "Metrics: " + ', '.join(f"{name} {stage['total_s']} s ({stage['count']}x)" for name, stage in stages) + "."
+
+    def write_summary(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def prometheus_text(self):
+        """Prometheus text exposition (version 0.0.4) of every timer and counter."""
+        lines = []
+        with self._lock:
+            timers = sorted(self._timers.items())
+            counters = sorted(self._counters.items())
+        if timers:
+            name = f'{METRIC_PREFIX}_stage_seconds'
+            lines += [f'# HELP {name} Time spent per scraping stage.', f'# TYPE {name} histogram']
+            errors = f'{METRIC_PREFIX}_stage_errors_total'
+            error_lines = [f'# HELP {errors} Stage executions that raised.', f'# TYPE {errors} counter']
+            for (stage, label_key), timer in timers:
+                label_key = (('stage', stage),) + label_key
+                cumulative = 0
+                for bound, bucket_count in zip(timer.buckets, timer.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_prometheus_labels(label_key, [("le", repr(float(bound)))])} {cumulative}')
+                lines.append(f'{name}_bucket{_prometheus_labels(label_key, [("le", "+Inf")])} {timer.count}')
+                lines.append(f'{name}_sum{_prometheus_labels(label_key)} {timer.total:.6f}')
+                lines.append(f'{name}_count{_prometheus_labels(label_key)} {timer.count}')
+                error_lines.append(f'{errors}{_prometheus_labels(label_key)} {timer.errors}')
+            lines += error_lines
+        seen = set()
+        for (counter, label_key), value in counters:
+            name = f'{METRIC_PREFIX}_{counter}_total'
+            if name not in seen:
+                seen.add(name)
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{_prometheus_labels(label_key)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()  # Shared by every module of the process
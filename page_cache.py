@@ -0,0 +1,247 @@
+# page_cache.py
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from metrics import METRICS
+from seek_parser import JOB_ID_RE
+
+DEFAULT_CACHE_PATH = 'seek_cache.sqlite3'
+SEARCH_PAGE_TTL = 15 * 60            # Search results change often
+JOB_PAGE_TTL = 7 * 24 * 60 * 60      # /job/<id> pages rarely change once posted
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # Compressed bodies kept before LRU eviction kicks in
+
+# Query parameters that only track where a click came from; they never change the page
+TRACKING_PARAMS = {'type', 'ref', 'origin', 'searchrequesttoken', 'tracking', 'utm_source', 'utm_medium', 'utm_campaign'}
+
+CacheEntry = namedtuple('CacheEntry', 'url body etag last_modified fetched_at ttl')
+
+
+def normalize_url(url):
+    """Cache key for a URL: lower-case host, no fragment, no tracking params, sorted query."""
+    parts = urlsplit(url)
+    if JOB_ID_RE.search(parts.path):
+        query = ''  # Job pages are identified by their path alone
+    else:
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in TRACKING_PARAMS]
+        query = urlencode(sorted(params))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def ttl_for(url):
+    """Time-to-live for a URL: long for job detail pages, short for everything else."""
+    return JOB_PAGE_TTL if JOB_ID_RE.search(urlsplit(url).path) else SEARCH_PAGE_TTL
+
+
+def is_fresh(entry, now=None):
+    return (now or time.time()) - entry.fetched_at < entry.ttl
+
+
+class PageCache:
+    """SQLite-backed page cache with per-URL TTLs, HTTP validators and LRU size eviction.
+
+    One instance can be shared between threads. Bodies are stored zlib
+    compressed; `max_bytes` bounds the total compressed size.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                ttl REAL NOT NULL,
+                last_access REAL NOT NULL
+            )''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def get(self, url):
+        """Returns the CacheEntry for `url` (fresh or stale), or None. Does not touch the counters."""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, body, etag, last_modified, fetched_at, ttl FROM pages WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE pages SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return CacheEntry(row[0], zlib.decompress(row[1]).decode('utf-8'), row[2], row[3], row[4], row[5])
+
+    def get_fresh(self, url):
+        """Returns the cached body if it is still within its TTL, counting a hit or a miss."""
+        entry = self.get(url)
+        if entry is not None and is_fresh(entry):
+            self.record_hit()
+            return entry.body
+        self.record_miss()
+        return None
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+        METRICS.count('cache_lookups', result='hit')
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+        METRICS.count('cache_lookups', result='miss')
+
+    def put(self, url, body, etag=None, last_modified=None, ttl=None):
+        """Stores (or replaces) the page for `url` and evicts least recently used pages if over budget."""
+        key = normalize_url(url)
+        blob = zlib.compress(body.encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM pages WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (key, url, body, size, etag, last_modified, fetched_at, ttl, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, blob, len(blob), etag, last_modified, now, ttl or ttl_for(url), now))
+            self._total_bytes += len(blob) - (old[0] if old else 0)
+            self.stores += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def mark_revalidated(self, url):
+        """Restarts the TTL of a page the server confirmed unchanged (HTTP 304)."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute('UPDATE pages SET fetched_at = ?, last_access = ? WHERE key = ?',
+                               (now, now, normalize_url(url)))
+            self._conn.commit()
+            self.revalidated += 1
+        METRICS.count('cache_lookups', result='revalidated')
+
+    def _evict(self):
+        """Drops least recently used pages until the cache is 10% under budget. Caller holds the lock."""
+        target = self.max_bytes * 0.9
+        while self._total_bytes > target:
+            victims = self._conn.execute(
+                'SELECT key, size FROM pages ORDER BY last_access LIMIT 64').fetchall()
+            if not victims:
+                break
+            evicted = []
+            for key, size in victims:  # Stop at the target rather than dropping the whole batch
+                if self._total_bytes <= target:
+                    break
+                evicted.append((key,))
+                self._total_bytes -= size
+            self._conn.executemany('DELETE FROM pages WHERE key = ?', evicted)
+            self.evictions += len(evicted)
+
+    def stats(self):
+        return {
+            'hits': self.hits, 'misses': self.misses, 'revalidated': self.revalidated,
+            'stores': self.stores, 'evictions': self.evictions, 'bytes': self._total_bytes,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Page cache: {s['hits']} hits, {s['misses']} misses, {s['revalidated']} revalidated, "
+                f"{s['stores']} stored, {s['evictions']} evicted, {s['bytes'] / 1_000_000:.1f} MB on disk.")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# retry_after: the Retry-After header of a network answer (for 429 / 503 backoff)
+CachedResponse = namedtuple('CachedResponse', 'url status_code text from_cache retry_after', defaults=(None,))
+
+
+def fetch_with_cache(session, url, cache, timeout=15, should_store=None, before_request=None, revalidate=False):
+    """GETs `url` through `cache`: fresh hits skip the network, stale entries are revalidated.
+
+    Stale entries (and, with `revalidate`, fresh ones too) are sent with
+    If-None-Match / If-Modified-Since and a 304 answer serves the cached body. 200 responses are stored when
+    `should_store(text)` allows it. With `cache=None` this is a plain GET.
+    `before_request(url)` (e.g. a rate limiter) runs only when the network
+    is actually used. Network errors propagate as requests exceptions.
+    """
+    if cache is None:
+        if before_request:
+            before_request(url)
+        response = session.get(url, timeout=timeout)
+        return CachedResponse(response.url, response.status_code, response.text, False, response.headers.get('Retry-After'))
+
+    entry = cache.get(url)
+    if entry is not None and is_fresh(entry) and not revalidate:
+        cache.record_hit()
+        return CachedResponse(url, 200, entry.body, True)
+    cache.record_miss()
+
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+    if before_request:
+        before_request(url)
+    response = session.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        cache.mark_revalidated(url)
+        return CachedResponse(url, 200, entry.body, True)
+    if response.status_code == 200 and (should_store is None or should_store(response.text)):
+        cache.put(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return CachedResponse(response.url, response.status_code, response.text, False, response.headers.get('Retry-After'))
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache at SEEK_CACHE_PATH (default seek_cache.sqlite3); None if SEEK_CACHE_DISABLED is set."""
+    global _default_cache
+    if os.environ.get('SEEK_CACHE_DISABLED'):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = PageCache(os.environ.get('SEEK_CACHE_PATH', DEFAULT_CACHE_PATH))
+            except sqlite3.Error as e:
+                print(f"Page cache unavailable ({e}); continuing without it.", file=sys.stderr)
+                return None
+    return _default_cache
+
+
+def cached_page(url):
+    """Fresh body for `url` from the default cache, or None (counts a hit or a miss)."""
+    cache = get_cache()
+    return cache.get_fresh(url) if cache is not None else None
+
+
+def store_page(url, html):
+    """Stores a browser-rendered page in the default cache."""
+    cache = get_cache()
+    if cache is not None:
+        cache.put(url, html)
+
+
+def cache_report():
+    cache = get_cache()
+    return cache.report() if cache is not None else "Page cache: disabled."
@@ -0,0 +1,143 @@
+# pipeline.py
+"""Fetch/parse pipeline: job pages are parsed in worker processes while fetching continues.
+
+Fetchers hand raw HTML bytes to ParsePipeline.submit(); a ProcessPoolExecutor
+turns them into job dicts with seek_parser.parse_job_details. At most
+`max_pending` pages wait to be parsed: submit() blocks (and parse_async()
+waits) beyond that, so fetchers slow down instead of piling HTML up in memory.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from metrics import METRICS
+from seek_parser import parse_job_details
+
+DEFAULT_PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Leave a core for the fetch side
+
+
+def _parse_in_worker(job_url, html_bytes):
+    """Runs in a worker process: decodes and parses one page, returning (details, CPU seconds)."""
+    started = time.process_time()
+    details = parse_job_details(html_bytes.decode('utf-8', errors='replace'), job_url)
+    return details, time.process_time() - started
+
+
+class StageMetrics:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0  # Summed over workers, so it can exceed wall time
+        self.wait_seconds = 0.0  # Time producers spent blocked on backpressure
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, nbytes=0, busy=0.0, wait=0.0):
+        with self._lock:
+            self.items += 1
+            self.bytes += nbytes
+            self.busy_seconds += busy
+            self.wait_seconds += wait
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                'stage': self.name, 'items': self.items, 'mb': round(self.bytes / 1_000_000, 2),
+                'items_per_s': round(self.items / elapsed, 2), 'busy_s': round(self.busy_seconds, 2),
+                'blocked_s': round(self.wait_seconds, 2),
+            }
+
+
+class ParsePipeline:
+    """Bounded hand-off from fetchers to a process pool of parsers."""
+
+    def __init__(self, workers=DEFAULT_PARSE_WORKERS, max_pending=None):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 4
+        self.fetch_metrics = StageMetrics('fetch')
+        self.parse_metrics = StageMetrics('parse')
+        self.max_depth = 0
+        self._pending = 0
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def record_fetch(self, html, seconds):
+        """Lets the fetch side report each page it fetched, for the throughput report."""
+        self.fetch_metrics.record(len(html), seconds)
+
+    def submit(self, job_url, html):
+        """Queues a page for parsing and returns a Future of its job dict. Blocks while the queue is full."""
+        waited = 0.0
+        if not self._slots.acquire(blocking=False):
+            started = time.monotonic()
+            self._slots.acquire()  # Backpressure: wait for a parser to free a slot
+            waited = time.monotonic() - started
+        return self._submit_with_slot(job_url, html, waited)
+
+    def _submit_with_slot(self, job_url, html, waited):
+        """Hands a page to the pool once the caller holds a queue slot; the slot is freed when parsing ends."""
+        data = html.encode('utf-8') if isinstance(html, str) else html
+        with self._lock:
+            self._pending += 1
+            self.max_depth = max(self.max_depth, self._pending)
+        try:
+            future = self._executor.submit(_parse_in_worker, job_url, data)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda f: self._finished(f, len(data), waited))
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _finished(self, future, nbytes, waited):
+        self._release()
+        if not future.cancelled() and future.exception() is None:
+            self.parse_metrics.record(nbytes, future.result()[1], waited)
+            METRICS.observe('parse', future.result()[1], page='job', process='worker') # Worker CPU seconds
+
+    def parse(self, job_url, html):
+        """Parses one page in a worker process and waits for the job dict."""
+        return self.submit(job_url, html).result()[0]
+
+    async def parse_async(self, job_url, html):
+        """asyncio version of parse(): waits for a free slot without blocking the event loop."""
+        waited = 0.0
+        if not self._slots.acquire(blocking=False):
+            started = time.monotonic()
+            await asyncio.to_thread(self._slots.acquire)
+            waited = time.monotonic() - started
+        details, _ = await asyncio.wrap_future(self._submit_with_slot(job_url, html, waited))
+        return details
+
+    @property
+    def depth(self):
+        with self._lock:
+            return self._pending
+
+    def report(self):
+        fetch, parse = self.fetch_metrics.snapshot(), self.parse_metrics.snapshot()
+        return (f"Pipeline: fetched {fetch['items']} pages ({fetch['mb']} MB, {fetch['items_per_s']}/s); "
+                f"parsed {parse['items']} on {self.workers} processes ({parse['items_per_s']}/s, "
+                f"{parse['busy_s']} CPU s); parse queue peaked at {self.max_depth}/{self.max_pending}, "
+                f"fetchers blocked {parse['blocked_s']} s.")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        print(self.report(), file=sys.stderr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
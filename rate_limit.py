@@ -0,0 +1,80 @@
+# rate_limit.py
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Politeness defaults, overridable with SEEK_RATE_LIMIT / SEEK_RATE_BURST
+DEFAULT_RATE = 0.67  # requests per second per host (~one every 1.5s)
+DEFAULT_BURST = 2    # requests allowed back-to-back before throttling kicks in
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`.
+
+    acquire() reserves a token immediately and returns how long the caller
+    has to wait before using it, so concurrent callers are handed out
+    consecutive slots instead of racing for the same one.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token and returns the delay (seconds) until it becomes valid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a debt paid back at `rate` tokens per second
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class HostRateLimiter:
+    """Per-host politeness throttle backed by one TokenBucket per host.
+
+    Safe to share between worker threads and asyncio tasks. This only spaces
+    out requests; waiting for a page to be ready is handled by readiness.py.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}  # host -> TokenBucket
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Builds a limiter from SEEK_RATE_LIMIT (req/s per host) and SEEK_RATE_BURST."""
+        rate = float(os.environ.get('SEEK_RATE_LIMIT', DEFAULT_RATE))
+        burst = int(os.environ.get('SEEK_RATE_BURST', DEFAULT_BURST))
+        return cls(rate, burst)
+
+    def _reserve(self, url):
+        """Reserves the next slot for the host of `url` and returns how long to wait for it."""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
+
+    def wait(self, url):
+        """Blocks until a request to the host of `url` is allowed."""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """Asyncio version of wait(): suspends the task instead of blocking the loop."""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
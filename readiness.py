@@ -0,0 +1,58 @@
+# readiness.py
+import time
+
+# Elements the job detail extractor needs before page content is worth reading
+JOB_DETAIL_READY_SELECTORS = (
+    'h1[data-automation="job-detail-title"]',
+    'div[data-automation="jobAdDetails"]',
+)
+SEARCH_READY_SELECTOR = 'article[data-card-type="JobCard"]'
+
+SELECTOR_TIMEOUT_MS = 15000  # Give up waiting for the selectors after this long
+NETWORK_IDLE_CAP_MS = 1500   # Extra time allowed for late XHRs once the selectors are there
+
+
+async def wait_for_job_detail_async(page, timeout_ms=SELECTOR_TIMEOUT_MS, idle_cap_ms=NETWORK_IDLE_CAP_MS):
+    """Waits until a Playwright page has the job detail elements. Returns False on timeout.
+
+    A timeout is not an error: the caller still parses the page and the
+    extractor's fallback selectors get their chance.
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    for selector in JOB_DETAIL_READY_SELECTORS:
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            return False  # Playwright reads timeout=0 as "wait forever"
+        try:
+            await page.wait_for_selector(selector, state='attached', timeout=remaining_ms)
+        except Exception:
+            return False
+    if idle_cap_ms:
+        try:
+            await page.wait_for_load_state('networkidle', timeout=idle_cap_ms)
+        except Exception:
+            pass  # Still busy (analytics, polling); the content we need is already there
+    return True
+
+
+def wait_for_job_detail(driver, timeout=SELECTOR_TIMEOUT_MS / 1000, idle_cap=NETWORK_IDLE_CAP_MS / 1000):
+    """Selenium version of wait_for_job_detail_async(). Returns False on timeout."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def all_present(d):
+        return all(d.find_elements(By.CSS_SELECTOR, selector) for selector in JOB_DETAIL_READY_SELECTORS)
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(all_present)
+    except Exception:
+        return False
+    if idle_cap:
+        # WebDriver has no network-idle signal; document.readyState is the closest cheap proxy
+        try:
+            WebDriverWait(driver, idle_cap, poll_frequency=0.1).until(
+                lambda d: d.execute_script('return document.readyState') == 'complete'
+            )
+        except Exception:
+            pass
+    return True
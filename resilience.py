@@ -0,0 +1,392 @@
+# resilience.py
+"""Failure handling shared by every scraper.
+
+- Errors are classified (timeout, rate_limited, server_error, challenge,
+  network, client_error) and raised as ScrapeError.
+- RetryPolicy retries the retryable kinds with jittered exponential
+  backoff, honouring Retry-After.
+- CircuitBreaker tracks each host: repeated failures open its circuit
+  for a cooldown, and blocks (429s and challenge pages) also halve the
+  number of requests allowed in flight to it. The limit grows back by
+  one for every `limit` successes in a row.
+- RetryQueue collects job URLs that still failed, so a run can try them
+  once more at the end instead of being rerun in full.
+
+SEEK_MAX_RETRIES, SEEK_RETRY_BASE_DELAY, SEEK_HOST_CONCURRENCY and
+SEEK_RETRY_PASS_DELAY tune the defaults.
+"""
+import asyncio
+import email.utils
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+from metrics import METRICS
+
+TIMEOUT, RATE_LIMITED, SERVER_ERROR, CHALLENGE, NETWORK, CLIENT_ERROR = (
+    'timeout', 'rate_limited', 'server_error', 'challenge', 'network', 'client_error')
+RETRYABLE = frozenset({TIMEOUT, RATE_LIMITED, SERVER_ERROR, CHALLENGE, NETWORK})
+BLOCK_KINDS = frozenset({RATE_LIMITED, CHALLENGE})  # The site is pushing back: slow down, don't just retry
+
+# Markers of bot-protection / challenge pages served instead of the real content.
+# Only vendor-specific strings: generic text ("Access Denied") can appear in a job ad.
+CHALLENGE_MARKERS = (
+    'captcha-delivery', 'px-captcha', 'cf-chl-', 'challenge-platform', 'Request unsuccessful. Incapsula',
+)
+# Where bot protection redirects to: challenge hosts, and challenge paths on the site itself
+CHALLENGE_HOSTS = ('captcha-delivery.com', 'hcaptcha.com', 'recaptcha.net')
+CHALLENGE_PATHS = ('/cdn-cgi/challenge-platform/', '/_Incapsula_Resource', '/px/captcha', '/distil_r_captcha')
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0    # Seconds; attempt n waits up to base * 2**n
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_HOST_CONCURRENCY = 8
+FAILURE_THRESHOLD = 5       # Consecutive failures that open a host's circuit
+FAILURE_COOLDOWN = 30.0     # Seconds a circuit stays open after repeated failures
+BLOCK_COOLDOWN = 60.0       # ... and after a block
+RETRY_PASS_DELAY = 10.0     # Pause before the end-of-run retry pass
+POLL_INTERVAL = 0.1         # Seconds between checks while waiting for a free slot
+
+
+class ScrapeError(Exception):
+    """A classified fetch failure. `kind` is one of the constants above."""
+
+    def __init__(self, kind, url, message=None, status=None, retry_after=None):
+        super().__init__(message or f"{kind} for {url}")
+        self.kind = kind
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.kind in RETRYABLE
+
+
+def is_challenge_page(response_url, html):
+    """True if the response looks like a CAPTCHA / bot challenge rather than a real page.
+
+    The URL only counts when its host or path is a known challenge endpoint,
+    so a search such as /challenge-coach-jobs is not mistaken for one.
+    """
+    parts = urlparse(response_url)
+    host = (parts.hostname or '').lower()
+    if any(host == challenge_host or host.endswith('.' + challenge_host) for challenge_host in CHALLENGE_HOSTS):
+        return True
+    if parts.path.startswith(CHALLENGE_PATHS):
+        return True
+    return any(marker in html for marker in CHALLENGE_MARKERS)
+
+
+def classify_status(status):
+    """Error kind for an HTTP status, or None for success."""
+    if status == 429:
+        return RATE_LIMITED
+    if status == 403:
+        return CHALLENGE  # What the bot protection answers with
+    if status >= 500:
+        return SERVER_ERROR
+    if status >= 400:
+        return CLIENT_ERROR
+    return None
+
+
+def classify_exception(exc):
+    """Error kind for an exception raised while fetching or rendering, or None if it is not a fetch failure."""
+    if isinstance(exc, ScrapeError):
+        return exc.kind
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)) or 'Timeout' in type(exc).__name__:
+        return TIMEOUT  # Also requests, Selenium and Playwright timeouts
+    try:
+        import requests
+        if isinstance(exc, requests.exceptions.RequestException):
+            return NETWORK
+    except ImportError:
+        pass
+    if isinstance(exc, ConnectionError) or type(exc).__name__ == 'WebDriverException':
+        return NETWORK  # Socket errors and Selenium navigation errors
+    if type(exc).__module__.startswith('playwright') and type(exc).__name__ == 'Error':
+        return NETWORK  # Playwright navigation errors (net::ERR_...)
+    return None
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_response(url, status, html, response_url=None, retry_after=None):
+    """Raises ScrapeError if a response is an error status or a challenge page.
+
+    `retry_after` is the response's Retry-After header value, if any.
+    """
+    kind = classify_status(status)
+    if kind is None and is_challenge_page(response_url or url, html or ''):
+        kind = CHALLENGE
+    if kind is not None:
+        raise ScrapeError(kind, url, f"{kind} (HTTP {status}) for {url}", status, parse_retry_after(retry_after))
+
+
+def backoff_delay(attempt, base=DEFAULT_BASE_DELAY, cap=DEFAULT_MAX_DELAY, retry_after=None):
+    """Full-jitter exponential backoff for retry number `attempt` (0-based), at least `retry_after`."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, min(retry_after, cap)) if retry_after else delay
+
+
+class HostCircuit:
+    """Breaker state of one host."""
+
+    def __init__(self, limit):
+        self.state = 'closed'
+        self.failures = 0
+        self.open_until = 0.0
+        self.limit = limit
+        self.in_flight = 0
+        self.successes = 0
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker with an adaptive in-flight limit.
+
+    acquire(url) waits while the host's circuit is open or its limit is
+    reached; release(url, failure_kind) reports the outcome. After the
+    cooldown one probe request is let through (half-open); its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_HOST_CONCURRENCY, min_concurrency=1,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=FAILURE_COOLDOWN, block_cooldown=BLOCK_COOLDOWN):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.block_cooldown = block_cooldown
+        self._hosts = {}  # host -> HostCircuit
+        self._lock = threading.Lock()
+
+    def _circuit(self, url):
+        host = urlparse(url).netloc
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = self._hosts[host] = HostCircuit(self.max_concurrency)
+        return host, circuit
+
+    def try_acquire(self, url):
+        """Takes a slot for `url`'s host and returns 0, or returns how long to wait before asking again."""
+        with self._lock:
+            host, circuit = self._circuit(url)
+            if circuit.state == 'open':
+                remaining = circuit.open_until - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                circuit.state = 'half_open'
+                print(f"Circuit for {host} half-open: sending a probe request.", file=sys.stderr)
+            limit = 1 if circuit.state == 'half_open' else circuit.limit
+            if circuit.in_flight >= limit:
+                return POLL_INTERVAL
+            circuit.in_flight += 1
+            return 0.0
+
+    def acquire(self, url):
+        while True:
+            delay = self.try_acquire(url)
+            if not delay:
+                return
+            time.sleep(min(delay, 5.0))
+
+    async def acquire_async(self, url):
+        while True:
+            delay = self.try_acquire(url)
+            if not delay:
+                return
+            await asyncio.sleep(min(delay, 5.0))
+
+    def release(self, url, failure=None, retry_after=None, reported=True):
+        """Returns the slot taken by acquire(); `failure` is the error kind, None on success.
+
+        A block opens the circuit for `retry_after` seconds when the site said how long to wait.
+        An unreported failure only frees the slot: it neither counts as a
+        failure nor as a success (a half-open circuit stays half-open).
+        """
+        with self._lock:
+            host, circuit = self._circuit(url)
+            circuit.in_flight = max(0, circuit.in_flight - 1)
+            if failure is not None and not reported:
+                return
+            if failure is None or failure not in RETRYABLE:  # A 404 says nothing about the host's health
+                circuit.failures = 0
+                if circuit.state == 'half_open':
+                    circuit.state = 'closed'
+                    print(f"Circuit for {host} closed again.", file=sys.stderr)
+                circuit.successes += 1
+                if circuit.successes >= circuit.limit and circuit.limit < self.max_concurrency:
+                    circuit.limit += 1  # Additive increase after a clean run of requests
+                    circuit.successes = 0
+            elif failure in BLOCK_KINDS:
+                circuit.limit = max(self.min_concurrency, circuit.limit // 2)
+                METRICS.count('blocks', host=host, kind=failure)
+                cooldown = self.block_cooldown if retry_after is None else min(retry_after, self.block_cooldown)
+                self._open(host, circuit, cooldown, f"blocked ({failure}), limit now {circuit.limit}")
+            else:
+                circuit.failures += 1
+                if circuit.state == 'half_open' or circuit.failures >= self.failure_threshold:
+                    self._open(host, circuit, self.cooldown, f"{circuit.failures} failures in a row")
+
+    def _open(self, host, circuit, seconds, reason):
+        """Opens a circuit. Caller holds the lock."""
+        circuit.state = 'open'
+        circuit.open_until = time.monotonic() + seconds
+        circuit.failures = 0
+        circuit.successes = 0
+        METRICS.count('circuit_opened', host=host)
+        print(f"Circuit for {host} open for {seconds:.0f} s: {reason}.", file=sys.stderr)
+
+    def limit(self, url):
+        with self._lock:
+            return self._circuit(url)[1].limit
+
+    def stats(self):
+        with self._lock:
+            return {host: {'state': c.state, 'limit': c.limit, 'in_flight': c.in_flight}
+                    for host, c in self._hosts.items()}
+
+
+class RetryPolicy:
+    """Retries retryable ScrapeErrors with jittered exponential backoff, through an optional CircuitBreaker.
+
+    Error kinds in `unreported` are neutral for the breaker (the slot is
+    freed, nothing else changes): a plain GET answered with a challenge is
+    sent to the browser, which confirms or clears it.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 breaker=None, retry_on=RETRYABLE, unreported=()):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.retry_on = frozenset(retry_on)
+        self.unreported = frozenset(unreported)
+
+    @classmethod
+    def from_env(cls, breaker=None, **kwargs):
+        """Builds a policy from SEEK_MAX_RETRIES (retries after the first attempt) and SEEK_RETRY_BASE_DELAY."""
+        retries = int(os.environ.get('SEEK_MAX_RETRIES', DEFAULT_MAX_ATTEMPTS - 1))
+        base_delay = float(os.environ.get('SEEK_RETRY_BASE_DELAY', DEFAULT_BASE_DELAY))
+        return cls(retries + 1, base_delay, breaker=breaker, **kwargs)
+
+    def _classify(self, url, exc):
+        """The ScrapeError for `exc`, or None if it is not a fetch failure (then it propagates unchanged)."""
+        if isinstance(exc, ScrapeError):
+            return exc
+        kind = classify_exception(exc)
+        return ScrapeError(kind, url, f"{kind} for {url}: {exc}") if kind else None
+
+    def _next_delay(self, url, error, attempt):
+        """Seconds to wait before the next attempt, or None if `error` should be raised now."""
+        if error.kind not in self.retry_on or attempt + 1 >= self.max_attempts:
+            return None
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay, error.retry_after)
+        METRICS.count('retries', kind='job' if '/job/' in url else 'search', via='backoff', reason=error.kind)
+        print(f"{error}; retrying in {delay:.1f} s (attempt {attempt + 2}/{self.max_attempts}).", file=sys.stderr)
+        return delay
+
+    def call(self, url, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) for `url`, retrying classified failures; raises the last ScrapeError."""
+        for attempt in range(self.max_attempts):
+            if self.breaker:
+                self.breaker.acquire(url)
+            failure = retry_after = None
+            reported = True
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                error = self._classify(url, e)
+                if error is None:
+                    raise
+                failure, retry_after = error.kind, error.retry_after
+                reported = error.kind not in self.unreported
+                delay = self._next_delay(url, error, attempt)
+                if delay is None:
+                    raise error from (None if error is e else e)
+            finally:
+                if self.breaker:
+                    self.breaker.release(url, failure, retry_after, reported)
+            time.sleep(delay)
+
+    async def call_async(self, url, fn, *args, **kwargs):
+        """asyncio version of call() for coroutine functions."""
+        for attempt in range(self.max_attempts):
+            if self.breaker:
+                await self.breaker.acquire_async(url)
+            failure = retry_after = None
+            reported = True
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                error = self._classify(url, e)
+                if error is None:
+                    raise
+                failure, retry_after = error.kind, error.retry_after
+                reported = error.kind not in self.unreported
+                delay = self._next_delay(url, error, attempt)
+                if delay is None:
+                    raise error from (None if error is e else e)
+            finally:
+                if self.breaker:
+                    self.breaker.release(url, failure, retry_after, reported)
+            await asyncio.sleep(delay)
+
+
+class RetryQueue:
+    """Job URLs that failed during a run, tried once more when the run has finished everything else."""
+
+    def __init__(self, delay=None):
+        self.delay = delay if delay is not None else float(os.environ.get('SEEK_RETRY_PASS_DELAY', RETRY_PASS_DELAY))
+        self.errors = {}  # URL -> last error message, in failure order
+        self._lock = threading.Lock()
+
+    def add(self, url, error=None):
+        with self._lock:
+            self.errors[url] = str(error) if error else None
+        METRICS.count('retry_queued', kind='job')
+
+    def __len__(self):
+        with self._lock:
+            return len(self.errors)
+
+    def take(self):
+        """Returns the queued URLs and empties the queue."""
+        with self._lock:
+            urls = list(self.errors)
+            self.errors.clear()
+        return urls
+
+
+_default_breaker = None
+_default_breaker_lock = threading.Lock()
+
+
+def get_breaker():
+    """Process-wide CircuitBreaker (SEEK_HOST_CONCURRENCY caps requests in flight per host)."""
+    global _default_breaker
+    with _default_breaker_lock:
+        if _default_breaker is None:
+            _default_breaker = CircuitBreaker(int(os.environ.get('SEEK_HOST_CONCURRENCY', DEFAULT_HOST_CONCURRENCY)))
+    return _default_breaker
+
+
+def default_policy(**kwargs):
+    """RetryPolicy from the environment, sharing the process-wide breaker."""
+    return RetryPolicy.from_env(breaker=get_breaker(), **kwargs)
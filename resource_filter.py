@@ -0,0 +1,148 @@
+# resource_filter.py
+import fnmatch
+import json
+from urllib.parse import urlparse
+from metrics import METRICS
+
+# Resource types we never need: pages are only parsed as HTML with BeautifulSoup
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+
+# Analytics / advertising hosts (subdomains are matched too)
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com',
+    'doubleclick.net', 'googlesyndication.com', 'facebook.net', 'facebook.com',
+    'hotjar.com', 'newrelic.com', 'nr-data.net', 'segment.com', 'segment.io',
+    'optimizely.com', 'bat.bing.com', 'clarity.ms', 'tiqcdn.com',
+    'scorecardresearch.com', 'branch.io', 'braze.com', 'appsflyer.com',
+)
+
+# File extensions used for the URL-pattern based blocking in Chrome (no resource type there)
+BLOCKED_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'),
+    'media': ('mp4', 'webm', 'mp3', 'ogg', 'wav'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'stylesheet': ('css',),
+}
+
+# Blocked requests never transfer anything, so the bytes saved are estimated
+# from typical transfer sizes of each resource type.
+ESTIMATED_BYTES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 35_000,
+    'stylesheet': 30_000,
+    'tracker': 25_000,
+}
+
+
+class ResourceBlocker:
+    """Drops images, media, fonts, stylesheets and analytics requests during navigation.
+
+    Works with Playwright (route interception) and Selenium/Chrome (prefs plus
+    CDP Network.setBlockedURLs). URLs containing any `allowlist` entry (a
+    substring or a glob pattern) are always let through.
+    """
+
+    def __init__(self, blocked_types=BLOCKED_RESOURCE_TYPES, tracker_hosts=TRACKER_HOSTS, allowlist=None):
+        self.blocked_types = set(blocked_types)
+        self.tracker_hosts = tuple(tracker_hosts)
+        self.allowlist = tuple(allowlist or ())
+        self.blocked_counts = {}  # category -> number of requests blocked
+
+    # --- Decision logic ---
+    def is_allowlisted(self, url):
+        return any(entry in url or fnmatch.fnmatch(url, entry) for entry in self.allowlist)
+
+    def is_tracker(self, url):
+        host = urlparse(url).hostname or ''
+        return any(host == h or host.endswith('.' + h) for h in self.tracker_hosts)
+
+    def classify(self, url, resource_type):
+        """Returns the category to block `url` under, or None if it should load."""
+        if self.is_allowlisted(url):
+            return None
+        if resource_type in self.blocked_types:
+            return resource_type
+        if self.is_tracker(url):
+            return 'tracker'
+        return None
+
+    def record(self, category):
+        self.blocked_counts[category] = self.blocked_counts.get(category, 0) + 1
+        METRICS.count('resources_blocked', category=category)
+
+    # --- Playwright ---
+    async def handle_route(self, route):
+        """Route handler for `context.route("**/*", blocker.handle_route)`."""
+        request = route.request
+        category = self.classify(request.url, request.resource_type)
+        if category:
+            self.record(category)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def install(self, context):
+        """Installs the filter on a Playwright browser context (or page)."""
+        await context.route("**/*", self.handle_route)
+
+    # --- Selenium / Chrome ---
+    def chrome_blocked_url_patterns(self):
+        """URL patterns for CDP Network.setBlockedURLs (wildcards only, no resource types)."""
+        patterns = []
+        for resource_type in sorted(self.blocked_types):
+            for ext in BLOCKED_EXTENSIONS.get(resource_type, ()):
+                patterns.append(f'*.{ext}')
+                patterns.append(f'*.{ext}?*')
+        for host in self.tracker_hosts:
+            # Chrome patterns cannot express exceptions, so an allowlisted tracker is simply not blocked
+            if not self.is_allowlisted(host):
+                patterns.append(f'*{host}*')
+        return patterns
+
+    def apply_to_chrome_options(self, chrome_options):
+        """Sets Chrome prefs that stop images from loading and enables the performance log used for stats."""
+        if 'image' in self.blocked_types:
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def apply_to_driver(self, driver):
+        """Installs the URL blocklist on a running Chrome WebDriver via CDP."""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.chrome_blocked_url_patterns()})
+
+    def collect_driver_stats(self, driver):
+        """Counts requests Chrome blocked since the last call, using the performance log."""
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return  # Logging capability not enabled on this driver
+        request_types = {}
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            params = message.get('params', {})
+            if message.get('method') == 'Network.requestWillBeSent':
+                request_types[params.get('requestId')] = (params.get('type', '').lower(), params.get('request', {}).get('url', ''))
+            elif message.get('method') == 'Network.loadingFailed' and params.get('blockedReason'):
+                resource_type, url = request_types.get(params.get('requestId'), (params.get('type', '').lower(), ''))
+                self.record('tracker' if self.is_tracker(url) else resource_type or 'other')
+
+    # --- Reporting ---
+    @property
+    def blocked_total(self):
+        return sum(self.blocked_counts.values())
+
+    @property
+    def estimated_bytes_saved(self):
+        return sum(ESTIMATED_BYTES.get(category, 0) * count for category, count in self.blocked_counts.items())
+
+    def report(self):
+        """One-line summary of what was blocked during the run."""
+        if not self.blocked_counts:
+            return "Resource filter: no requests blocked."
+        breakdown = ', '.join(f"{category}: {count}" for category, count in sorted(self.blocked_counts.items()))
+        return (f"Resource filter: blocked {self.blocked_total} requests ({breakdown}), "
+                f"~{self.estimated_bytes_saved / 1_000_000:.1f} MB saved (estimated).")
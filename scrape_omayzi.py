@@ -1,3 +1,4 @@
+import argparse
 import sys
 import json
 import csv
@@ -10,17 +11,35 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import time
-import re # Keep regex for contact info
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from rate_limit import HostRateLimiter
+from readiness import wait_for_job_detail
+from resource_filter import ResourceBlocker
+from http_fetch import fetch_job_html, fetch_search_html
+from page_cache import cache_report, cached_page, store_page
+from seen_jobs import DEFAULT_MAX_AGE, SeenJobsIndex
+from checkpoint import RunCheckpoint
+from job_store import get_job_store
+from metrics import METRICS
+from pipeline import ParsePipeline
+from resilience import CHALLENGE, RetryQueue, ScrapeError, default_policy, is_challenge_page
+from seek_parser import (empty_job, job_id_from_url, parse_job_details, parse_search_results, search_page_url,
+                         search_url_for)
+from seek_parser import extract_contact_info  # noqa: F401 -- re-exported; it used to be defined here
 
 # --- Helper Functions ---
 def format_for_url(text):
     """Formats text for Seek URL: lowercase, spaces to hyphens."""
     return text.lower().replace(' ', '-')
 
-def get_driver():
-    """Initializes and returns a Selenium WebDriver."""
+def get_driver(blocker=None):
+    """Initializes and returns a Selenium WebDriver.
+
+    If a ResourceBlocker is given, images, fonts, stylesheets, media and
+    analytics requests are blocked in the browser.
+    """
     print("Python: Initializing WebDriver...", file=sys.stderr)
     chrome_options = Options()
     chrome_options.add_argument("--headless")
@@ -29,9 +48,12 @@ def get_driver():
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    if blocker:
+        blocker.apply_to_chrome_options(chrome_options)
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    with METRICS.span('launch', browser='chrome'):
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
         'source': '''
             Object.defineProperty(navigator, 'webdriver', {
@@ -39,168 +61,234 @@ def get_driver():
             })
         '''
     })
+    if blocker:
+        blocker.apply_to_driver(driver)
     print("Python: WebDriver Initialized.", file=sys.stderr)
     return driver
 
-def extract_contact_info(text):
-    """Extracts phone numbers and email addresses from text."""
-    # Simple regex for phone numbers (adjust as needed for different formats)
-    phone_regex = r'(\(?\+?\d{1,3}\)?[\s.-]?\d{1,4}[\s.-]?\d{3,4}[\s.-]?\d{3,4})'
-    # Simple regex for emails
-    email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-
-    phones = re.findall(phone_regex, text)
-    emails = re.findall(email_regex, text)
-
-    # Filter out unlikely short numbers that might be IDs etc.
-    phones = [p for p in phones if len(re.sub(r'\D', '', p)) >= 8]
-
-    phone_str = ', '.join(phones) if phones else '-'
-    email_str = ', '.join(emails) if emails else '-'
-    return phone_str, email_str
-
-def get_job_links_from_search(driver, jobTitle, location, numJobs_limit):
-    """Gets job links from the Seek search results page."""
-    print(f"Python: Getting job links for title='{jobTitle}', location='{location}', limit='{numJobs_limit}'", file=sys.stderr)
-    formatted_title = format_for_url(jobTitle)
-    formatted_location = format_for_url(location)
-    base_url = "https://www.seek.com.au"
-    search_url = f'{base_url}/{formatted_title}-jobs/in-{formatted_location}'
-    print(f"Python: Navigating to search URL: {search_url}", file=sys.stderr)
-
+def _raise_if_challenge(driver, url, page):
+    """Raises ScrapeError if the browser was served a CAPTCHA / block page instead of `url`."""
+    if is_challenge_page(driver.current_url, driver.page_source):
+        METRICS.count('challenge_pages', kind=page)
+        raise ScrapeError(CHALLENGE, url, f"Challenge page served for {url}")
+
+def _render_search_page(driver, page_url, rate_limiter=None):
+    """Loads a search results page in the browser and returns its HTML once the job cards are there."""
+    if rate_limiter:
+        rate_limiter.wait(page_url)
+    with METRICS.span('navigate', page='search'):
+        driver.get(page_url)
+    # Wait for job cards using Selenium's WebDriverWait
+    with METRICS.span('wait', page='search'):
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.XPATH, "//article[@data-card-type='JobCard']"))
+            )
+        except Exception:
+            _raise_if_challenge(driver, page_url, 'search')
+            raise
+    print("Python: Search results page loaded.", file=sys.stderr)
+    with METRICS.span('page_source', page='search'):
+        return driver.page_source
+
+def _load_search_page(driver, page_url, prefetched_html=None, rate_limiter=None):
+    """Returns the HTML of a search results page, rendering it in the browser unless it was prefetched or cached.
+
+    Browser loads are retried with backoff (see resilience.RetryPolicy); None once they run out.
+    """
+    if prefetched_html is not None:
+        print(f"Python: Using prefetched search page: {page_url}", file=sys.stderr)
+        return prefetched_html
+    cached_html = cached_page(page_url)
+    if cached_html is not None:
+        print(f"Python: Using cached search page: {page_url}", file=sys.stderr)
+        return cached_html
+    print(f"Python: Navigating to search URL: {page_url}", file=sys.stderr)
     try:
-        driver.get(search_url)
-        # Wait for job cards using Selenium's WebDriverWait
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.XPATH, "//article[@data-card-type='JobCard']"))
-        )
-        print("Python: Search results page loaded.", file=sys.stderr)
-        time.sleep(2) # Extra pause
-        html_content = driver.page_source
+        html_content = default_policy().call(page_url, _render_search_page, driver, page_url, rate_limiter)
+        store_page(page_url, html_content)
+        return html_content
     except Exception as e:
-        print(f"Python: Error loading search results page {search_url}: {e}", file=sys.stderr)
-        return [] # Return empty list on error
+        print(f"Python: Error loading search results page {page_url}: {e}", file=sys.stderr)
+        return None
 
-    soup = BeautifulSoup(html_content, "html.parser")
-    links = []
-    # Use find_all with limit if possible, otherwise loop and break
-    job_cards = soup.find_all('article', attrs={'data-card-type': 'JobCard'})
-    print(f"Python: Found {len(job_cards)} potential job cards on search page.", file=sys.stderr)
-
-    for job_card in job_cards:
-        if len(links) >= numJobs_limit:
-            print(f"Python: Reached job link limit of {numJobs_limit}.", file=sys.stderr)
-            break
-
-        # Try finding the link within the h3 tag first (more specific)
-        link_element = job_card.find('h3', {'data-automation': 'job-title'})
-        if link_element:
-             link_element = link_element.find('a') # Get the 'a' tag inside h3
-
-        # Fallback selectors from scrape_seek.py
-        if not link_element:
-             link_element = job_card.find('a', {'data-automation': 'jobTitle'})
-        if not link_element:
-             link_element = job_card.find('a', href=re.compile(r'/job/')) # General fallback
-
-        if link_element and link_element.has_attr('href'):
-            href = link_element['href']
-            if href.startswith('/job/'):
-                full_url = base_url + href.split('?')[0] # Clean URL parameters
-                if full_url not in links: # Avoid duplicates
-                    links.append(full_url)
-        else:
-            print("Python: Found job card without a valid title link.", file=sys.stderr)
+def iter_job_link_pages(driver, jobTitle, location, numJobs_limit, max_pages=None, rate_limiter=None,
+                        start_page=1, seen_ids=None, position=None):
+    """Yields the new job links of each search results page (?page=N) until the limit or the results run out.
+
+    While the caller scrapes one page's jobs, the next result page is
+    already being fetched over HTTP on a background thread; the browser is
+    only used for it if that fetch fails. Job IDs are de-duplicated across
+    pages and against `seen_ids`. A resumed run starts at `start_page`.
+    If a `position` dict is given, position['next_page'] is the page to
+    load next when each page's links are yielded (None once the results
+    ran out or the limit was reached).
+    """
+    print(f"Python: Getting job links for title='{jobTitle}', location='{location}', limit='{numJobs_limit}'", file=sys.stderr)
+    search_url = search_url_for(jobTitle, location)
+    seen_job_ids = set(seen_ids or ()) # Integer IDs rather than URL strings keep this small for long crawls
+    total = 0
+    page_number = start_page
+    prefetch = None
+    position = position if position is not None else {}
+
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        while True:
+            position['next_page'] = page_number # Stays on this page if it cannot be loaded
+            page_url = search_page_url(search_url, page_number)
+            html_content = _load_search_page(driver, page_url, prefetch.result() if prefetch else None, rate_limiter)
+            prefetch = None
+            if html_content is None:
+                return
+
+            page_links, has_next = parse_search_results(html_content)
+            print(f"Python: Found {len(page_links)} job links on search page {page_number}.", file=sys.stderr)
+            links = []
+            for link in page_links:
+                if total + len(links) >= numJobs_limit:
+                    print(f"Python: Reached job link limit of {numJobs_limit}.", file=sys.stderr)
+                    break
+                job_id = job_id_from_url(link)
+                if job_id not in seen_job_ids:
+                    seen_job_ids.add(job_id)
+                    links.append(link)
+            total += len(links)
+
+            more = has_next and page_links and total < numJobs_limit and (max_pages is None or page_number < max_pages)
+            if more:
+                page_number += 1
+                prefetch = prefetcher.submit(fetch_search_html, search_page_url(search_url, page_number), 15, rate_limiter)
+            position['next_page'] = page_number if more else None
+            if links:
+                yield links
+            if not more:
+                return
 
+def get_job_links_from_search(driver, jobTitle, location, numJobs_limit):
+    """Gets job links from the Seek search results pages."""
+    links = []
+    for page_links in iter_job_link_pages(driver, jobTitle, location, numJobs_limit):
+        links.extend(page_links)
     print(f"Python: Extracted {len(links)} unique job links.", file=sys.stderr)
     return links
 
-def scrape_job_details(driver, job_url):
-    """Scrapes detailed information from a single job page using logic from scrape_seek.py."""
-    print(f"Python: Scraping details from: {job_url}", file=sys.stderr)
-    details = {
-        "Job Title": "-", "Company Name": "-", "Location": "-", "Salary/Pay Range": "-",
-        "Key Responsibilities": "-", "Required Skills/Qualifications": "-", "Date Posted": "-",
-        "Job Type": "-", "Phone Number": "-", "Email": "-", "Full Job Description": "-",
-        "Job URL": job_url
-    }
-
-    try:
+def _render_job_page(driver, job_url, rate_limiter=None):
+    """Loads a job page in the browser and returns its HTML (what loaded, if the detail elements never appear)."""
+    if rate_limiter:
+        rate_limiter.wait(job_url)
+    with METRICS.span('navigate', page='job'):
         driver.get(job_url)
-        # Wait for a common element, maybe the job title or description area
-        WebDriverWait(driver, 15).until(
-             EC.presence_of_element_located((By.XPATH, "//h1[@data-automation='job-detail-title'] | //div[@data-automation='jobAdDetails'] | //div[contains(@class,'job-description')]"))
-        )
+    # Wait for the title and description elements the extractor needs
+    with METRICS.span('wait', page='job'):
+        ready = wait_for_job_detail(driver)
+    if ready:
         print(f"Python: Job details page loaded: {job_url}", file=sys.stderr)
-        time.sleep(2) # Increased pause slightly
+    else:
+        _raise_if_challenge(driver, job_url, 'job')
+        print(f"Python: Job detail elements did not appear for {job_url}; parsing what loaded.", file=sys.stderr)
+        METRICS.count('wait_timeouts', page='job')
+    with METRICS.span('page_source', page='job'):
         html_content = driver.page_source
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        # --- Extract data using BeautifulSoup - Selectors adapted from scrape_seek.py ---
-
-        # Title
-        title = soup.find('h1', {'data-automation': 'job-detail-title'})
-        details["Job Title"] = title.text.strip() if title else '-'
-        if details["Job Title"] == '-': # Fallback selector
-             title = soup.find('h1', class_=lambda x: x and 'JobTitle' in x) # Approximate class match
-             details["Job Title"] = title.text.strip() if title else '-'
-
-        # Company
-        company = soup.find('span', {'data-automation': 'advertiser-name'})
-        details["Company Name"] = company.text.strip() if company else '-'
-        if details["Company Name"] == '-' : # Fallback using link
-             company_link = soup.find('a', {'data-automation': 'job-header-company-name'}) # Check if this exists
-             details["Company Name"] = company_link.text.strip() if company_link else '-'
-        if details["Company Name"] == '-': # Generic fallback
-             company = soup.find('span', class_=lambda x: x and 'AdvertiserName' in x) # Approximate class match
-             details["Company Name"] = company.text.strip() if company else '-'
-
-        # Location
-        location_element = soup.find('span', {'data-automation': 'job-detail-location'})
-        details["Location"] = location_element.text.strip() if location_element else '-'
-        # Note: Fallbacks for location from scrape_seek.py were complex and might need more context, skipping for now.
-
-        # Salary
-        salary = soup.find('span', {'data-automation': 'job-detail-salary'})
-        details["Salary/Pay Range"] = salary.text.strip() if salary else '-'
-        # Skipping generic fallback for salary as it's often unreliable
-
-        # Job Type / Classification (Simplified approach)
-        job_type_element = soup.find('span', {'data-automation': 'job-detail-work-type'})
-        details["Job Type"] = job_type_element.text.strip() if job_type_element else '-'
-        # Could add classification logic here if needed
-
-        # Date Posted
-        date_posted_element = soup.find('span', {'data-automation': 'job-detail-date'})
-        details["Date Posted"] = date_posted_element.text.strip() if date_posted_element else '-'
-        # Skipping generic fallback
-
-        # Full description
-        description_div = soup.find('div', {'data-automation': 'jobAdDetails'})
-        details["Full Job Description"] = description_div.get_text(separator='\n', strip=True) if description_div else '-'
-        if details["Full Job Description"] == '-': # Fallback
-             description_div = soup.find('div', class_=lambda x: x and 'job-description' in x) # Approximate class match
-             details["Full Job Description"] = description_div.get_text(separator='\n', strip=True) if description_div else '-'
-
-        # Extract Responsibilities & Skills (Placeholder - requires specific logic based on description structure)
-        details["Key Responsibilities"] = "See Full Description"
-        details["Required Skills/Qualifications"] = "See Full Description"
-
-        # Extract contacts using the helper function
-        if details["Full Job Description"] != '-':
-            details["Phone Number"], details["Email"] = extract_contact_info(details["Full Job Description"])
-        else:
-            details["Phone Number"], details["Email"] = "-", "-"
+    if ready:
+        store_page(job_url, html_content)
+    return html_content
+
+def fetch_job_page_html(driver, job_url, http_fast_path=True, rate_limiter=None, revalidate=False):
+    """Returns the HTML of a job page: page cache, then a plain GET (with `http_fast_path`), then the browser.
+
+    With `revalidate` (a job due for a refetch) a cached copy is only used
+    if the server answers a conditional GET with 304.
+    Failed loads are retried with backoff; raises ScrapeError once retries run out.
+    """
+    if http_fast_path:
+        html_content = fetch_job_html(job_url, rate_limiter=rate_limiter, revalidate=revalidate)
+    else:
+        html_content = cached_page(job_url) if not revalidate else None
+    if html_content is not None:
+        print(f"Python: Job details fetched over HTTP or from cache: {job_url}", file=sys.stderr)
+        return html_content
+    return default_policy().call(job_url, _render_job_page, driver, job_url, rate_limiter)
+
+def error_details(job_url):
+    """Placeholder details for a job page that could not be scraped."""
+    details = empty_job(job_url)
+    details["Job Title"] = "Error scraping details" # Keep other fields as '-'
+    return details
 
+def scrape_job_details(driver, job_url, http_fast_path=True, rate_limiter=None, revalidate=False):
+    """Scrapes detailed information from a single job page using logic from scrape_seek.py.
 
+    Fresh pages come from the page cache. With `http_fast_path` the page is
+    otherwise fetched with a plain GET first and the browser is only used
+    when that response cannot be parsed. `revalidate` is passed to fetch_job_page_html.
+    """
+    print(f"Python: Scraping details from: {job_url}", file=sys.stderr)
+    try:
+        html_content = fetch_job_page_html(driver, job_url, http_fast_path, rate_limiter, revalidate)
+        # Structured JSON state first, DOM selector chain as fallback
+        details = parse_job_details(html_content, job_url)
         print(f"Python: Successfully extracted: {details['Job Title']} | {details['Company Name']} | {details['Location']}", file=sys.stderr)
-
     except Exception as e:
         print(f"Python: Error scraping details for {job_url}: {e}", file=sys.stderr)
-        details["Job Title"] = f"Error scraping details" # Keep other fields as '-'
+        details = error_details(job_url)
 
     return details
 
+def iter_job_details(driver, job_links, http_fast_path=True, rate_limiter=None, parser=None, revalidate=False):
+    """Yields (link, details) for each of `job_links`, in order.
+
+    With a `parser` (pipeline.ParsePipeline) the driver keeps fetching the
+    next pages while earlier ones are parsed in worker processes; parsed
+    jobs are yielded as soon as everything before them is done. The
+    pipeline's bounded queue blocks fetching when the parsers fall behind.
+    """
+    if parser is None:
+        for link in job_links:
+            yield link, scrape_job_details(driver, link, http_fast_path, rate_limiter, revalidate)
+        return
+
+    in_flight = deque() # (link, Future) in fetch order
+    def finished(drain=False):
+        while in_flight and (drain or in_flight[0][1].done()):
+            link, future = in_flight.popleft()
+            try:
+                details, _ = future.result()
+                print(f"Python: Successfully extracted: {details['Job Title']} | {details['Company Name']} | {details['Location']}", file=sys.stderr)
+            except Exception as e:
+                print(f"Python: Error scraping details for {link}: {e}", file=sys.stderr)
+                details = error_details(link)
+            yield link, details
+
+    for link in job_links:
+        print(f"Python: Scraping details from: {link}", file=sys.stderr)
+        try:
+            started = time.monotonic()
+            html_content = fetch_job_page_html(driver, link, http_fast_path, rate_limiter, revalidate)
+            parser.record_fetch(html_content, time.monotonic() - started)
+            future = parser.submit(link, html_content)
+        except Exception as e:
+            future = Future() # Fetch failed: surfaces as this job's error row, in order
+            future.set_exception(e)
+        in_flight.append((link, future))
+        yield from finished()
+    yield from finished(drain=True)
+
+def csv_filename_for(job_title, location):
+    """CSV filename based on search parameters and timestamp."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"seek_{format_for_url(job_title)}_{format_for_url(location)}_{timestamp}.csv"
+
+def _sanitize_row(job):
+    # Handle potential encoding issues
+    sanitized_job = {}
+    for key, value in job.items():
+        if isinstance(value, str):
+            # Replace problematic characters or encoding issues
+            sanitized_job[key] = value.replace('\x00', '').encode('utf-8', 'ignore').decode('utf-8')
+        else:
+            sanitized_job[key] = value
+    return sanitized_job
+
 def save_to_csv(job_details, job_title, location):
     """Saves the job details to a CSV file."""
     if not job_details:
@@ -208,8 +296,7 @@ def save_to_csv(job_details, job_title, location):
         return None
     
     # Create a filename based on search parameters and timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"seek_{format_for_url(job_title)}_{format_for_url(location)}_{timestamp}.csv"
+    filename = csv_filename_for(job_title, location)
     
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
@@ -219,17 +306,9 @@ def save_to_csv(job_details, job_title, location):
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
             
-            for job in job_details:
-                # Handle potential encoding issues
-                sanitized_job = {}
-                for key, value in job.items():
-                    if isinstance(value, str):
-                        # Replace problematic characters or encoding issues
-                        sanitized_job[key] = value.replace('\x00', '').encode('utf-8', 'ignore').decode('utf-8')
-                    else:
-                        sanitized_job[key] = value
-                
-                writer.writerow(sanitized_job)
+            with METRICS.span('csv_write'):
+                for job in job_details:
+                    writer.writerow(_sanitize_row(job))
         
         print(f"Python: Successfully saved {len(job_details)} jobs to {filename}", file=sys.stderr)
         return filename
@@ -237,55 +316,256 @@ def save_to_csv(job_details, job_title, location):
         print(f"Python: Error saving to CSV: {e}", file=sys.stderr)
         return None
 
-def scrape_seek_jobs(jobTitle, location, numJobs):
-    """Main function to orchestrate scraping using Selenium."""
-    print("Python: Starting scrape_seek_jobs...", file=sys.stderr)
+class CsvStreamWriter:
+    """Appends job rows to a CSV file as they are scraped, so nothing has to be held until the end.
+
+    The file is created on the first row; close() returns its name (None if
+    no rows were written or the file could not be written).
+    """
+
+    def __init__(self, job_title, location):
+        self.job_title = job_title
+        self.location = location
+        self.filename = None
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._failed = False
+
+    def write(self, job):
+        if self._failed:
+            return
+        try:
+            with METRICS.span('csv_write'):
+                if self._writer is None:
+                    self.filename = csv_filename_for(self.job_title, self.location)
+                    self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+                    self._writer = csv.DictWriter(self._file, fieldnames=list(job.keys()))
+                    self._writer.writeheader()
+                self._writer.writerow(_sanitize_row(job))
+                self._file.flush() # Rows on disk survive a crash later in the run
+            self.rows += 1
+        except Exception as e:
+            print(f"Python: Error saving to CSV: {e}", file=sys.stderr)
+            self._failed = True
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            if not self._failed:
+                print(f"Python: Successfully saved {self.rows} jobs to {self.filename}", file=sys.stderr)
+        return None if self._failed else self.filename
+
+def iter_seek_jobs(jobTitle, location, numJobs, block_resources=True, http_fast_path=True,
+                   incremental=False, max_age=DEFAULT_MAX_AGE, driver_pool=None, stats=None, parse_workers=0,
+                   rate_limiter=None, claim_links=None, retry_failed=True, checkpoint=None):
+    """Yields each job's details dict as soon as it is scraped.
+
+    The browser is started on the first next() and released when the
+    generator finishes or is closed. Errors propagate to the consumer.
+    If a `stats` dict is given it is updated with 'examined', 'skipped' and 'shared' counts.
+    Every scraped job is also upserted into the job store, one batch per result page.
+
+    With `incremental`, job IDs scraped less than `max_age` seconds ago (per
+    the seen-jobs index) are not fetched again, and only new or changed
+    postings are yielded.
+    With a `driver_pool` (browser_pool.DriverPool), a warm browser is checked
+    out for the run and returned afterwards instead of launching and quitting one.
+    With `parse_workers` > 0, job pages are parsed in that many worker
+    processes while the browser fetches the next ones.
+    Concurrent runs can share one `rate_limiter`. `claim_links(links)`, if
+    given, returns the links this run should fetch; the others are counted
+    as 'shared' (batch_crawl.py uses it to fetch each job once per batch).
+    With `retry_failed`, jobs that still fail after their retries are set
+    aside and tried once more after every other job (their error rows, if
+    they fail again, come last).
+    With a `checkpoint` (checkpoint.RunCheckpoint) every finished job is
+    journaled before it is yielded and the pending links are saved after
+    each search page. A resumed checkpoint first replays its finished jobs,
+    then fetches its pending links, then continues the search where it
+    stopped. The checkpoint is removed when the run completes.
+    """
     driver = None
-    all_job_details = []
-    csv_filename = None
-    
+    lease = None
+    pages_loaded = 0
+    seen_index = SeenJobsIndex() if incremental else None
+    # Jobs the incremental index sends for a refetch are revalidated instead of served from the page cache, whose job pages live for a week
+    revalidate = seen_index is not None
+    stats = stats if stats is not None else {}
+    stats.update(examined=0, skipped=0, shared=0)
+    blocker = ResourceBlocker() if block_resources else None
+    # Politeness throttle between page loads (SEEK_RATE_LIMIT / SEEK_RATE_BURST)
+    rate_limiter = rate_limiter or HostRateLimiter.from_env()
+    jobs_yielded = 0
+    store = get_job_store()
+    pending_rows = [] # Scraped but not yet written to the job store
+    parser = ParsePipeline(parse_workers) if parse_workers and parse_workers > 0 else None
+    retry_queue = RetryQueue() if retry_failed else None
+
+    def emit(link, details, last_try=False):
+        """Records one scraped job and yields it (nothing for a failure queued for the retry pass)."""
+        nonlocal jobs_yielded, pages_loaded
+        pages_loaded += 1
+        failed = details["Job Title"] == "Error scraping details"
+        if failed and retry_queue is not None and not last_try:
+            retry_queue.add(link)
+            return
+        print(f"--- Scraped Job {jobs_yielded+1}/{limit} ---", file=sys.stderr)
+        pending_rows.append(details)
+        METRICS.count('jobs_scraped', result='error' if failed else 'ok')
+        if blocker:
+            blocker.collect_driver_stats(driver)
+        job_id = job_id_from_url(link)
+        if seen_index and job_id is not None and not failed:
+            status = seen_index.record(job_id, details)
+            if status == 'unchanged':
+                stats['skipped'] += 1
+                if checkpoint:
+                    checkpoint.record_job(link)
+                return # Emit only new or changed postings
+        if checkpoint:
+            checkpoint.record_job(link, details) # Journaled before it is output
+        jobs_yielded += 1
+        yield details
+
+    def write_rows():
+        nonlocal pending_rows
+        if store and pending_rows:
+            with METRICS.span('store_write'):
+                store.upsert_jobs(pending_rows, search_term=jobTitle)
+            pending_rows = []
+
     try:
         limit = int(numJobs)
     except ValueError:
         print(f"Python: Invalid numJobs '{numJobs}', defaulting to 5.", file=sys.stderr)
         limit = 5
 
-    try:
-        driver = get_driver()
-        job_links = get_job_links_from_search(driver, jobTitle, location, limit)
+    position = {'next_page': checkpoint.next_page if checkpoint else 1}
 
-        if not job_links:
-            print("Python: No job links found on search results page.", file=sys.stderr)
-            return json.dumps({"jobs": [], "csv_file": None})
+    try:
+        if checkpoint and checkpoint.jobs:
+            print(f"Python: Replaying {len(checkpoint.jobs)} jobs finished before the interruption.", file=sys.stderr)
+            for details in checkpoint.jobs:
+                jobs_yielded += 1
+                yield details
+        if driver_pool:
+            lease = driver_pool.checkout()
+            driver, blocker = lease.driver, lease.blocker
+        else:
+            driver = get_driver(blocker)
+        if checkpoint and checkpoint.pending_urls():
+            pending_links = checkpoint.pending_urls()
+            print(f"Python: Scraping {len(pending_links)} links pending from the interrupted run...", file=sys.stderr)
+            for link, details in iter_job_details(driver, pending_links, http_fast_path, rate_limiter, parser,
+                                                  revalidate):
+                yield from emit(link, details)
+            write_rows()
+        # Result pages are crawled lazily: the next page is prefetched while this page's jobs are scraped
+        link_pages = ()
+        # Like scrape_seek.async_crawl_search, a resumed run counts the jobs already delivered (or queued for
+        # the retry pass) against the limit
+        remaining = limit - jobs_yielded - (len(retry_queue) if retry_queue else 0)
+        if remaining <= 0:
+            position['next_page'] = None
+        if position['next_page'] is not None:
+            known_ids = checkpoint.known_ids() if checkpoint else None
+            link_pages = iter_job_link_pages(driver, jobTitle, location, remaining, rate_limiter=rate_limiter,
+                                             start_page=position['next_page'], seen_ids=known_ids, position=position)
+        for page_links in link_pages:
+            stats['examined'] += len(page_links)
+            pages_loaded += 1
+            if seen_index:
+                # Skip detail fetches for jobs scraped recently
+                fresh = seen_index.fresh_ids([job_id_from_url(link) for link in page_links], max_age)
+                stats['skipped'] += sum(1 for link in page_links if job_id_from_url(link) in fresh)
+                page_links = [link for link in page_links if job_id_from_url(link) not in fresh]
+            if claim_links:
+                claimed = claim_links(page_links)
+                stats['shared'] += len(page_links) - len(claimed)
+                page_links = claimed
+            if checkpoint:
+                checkpoint.add_pending(page_links, position['next_page'])
+            print(f"Python: Scraping details for {len(page_links)} links...", file=sys.stderr)
+            for link, details in iter_job_details(driver, page_links, http_fast_path, rate_limiter, parser,
+                                                  revalidate):
+                yield from emit(link, details)
+            write_rows()
+        if checkpoint and checkpoint.next_page != position['next_page']:
+            # Pages without new links are not yielded: record where the search ended (None once exhausted)
+            checkpoint.add_pending([], position['next_page'])
+
+        if retry_queue:
+            # Transient blocks and timeouts have usually cleared by the end of the run
+            failed_links = retry_queue.take()
+            print(f"Python: Retrying {len(failed_links)} failed job pages in {retry_queue.delay:.0f} s...", file=sys.stderr)
+            time.sleep(retry_queue.delay)
+            for link, details in iter_job_details(driver, failed_links, http_fast_path, rate_limiter, parser,
+                                                  revalidate):
+                yield from emit(link, details, last_try=True)
+            write_rows()
+
+        if checkpoint and checkpoint.search_done:
+            checkpoint.finish()
+        if seen_index:
+            print(f"Python: Incremental run: {stats['examined']} jobs found, {stats['skipped']} already known, {jobs_yielded} new or changed.", file=sys.stderr)
+        if not jobs_yielded:
+            if stats['examined']:
+                print("Python: No new or changed jobs since the last run.", file=sys.stderr)
+            else:
+                print("Python: No job links found on search results page.", file=sys.stderr)
+    finally:
+        if store and pending_rows:
+            store.upsert_jobs(pending_rows, search_term=jobTitle)
+        if driver:
+            if blocker:
+                blocker.collect_driver_stats(driver)
+                print(f"Python: {blocker.report()}", file=sys.stderr)
+            if lease:
+                driver_pool.release(lease, pages_loaded)
+                print("Python: WebDriver returned to pool.", file=sys.stderr)
+            else:
+                driver.quit()
+                print("Python: WebDriver closed.", file=sys.stderr)
+        if seen_index:
+            seen_index.close()
+        if parser:
+            parser.close() # Prints the fetch/parse throughput report
+        if checkpoint and not checkpoint.finished:
+            checkpoint.close()
+            print(f"Python: {checkpoint.report()}", file=sys.stderr)
+        print(f"Python: {cache_report()}", file=sys.stderr)
+
+def scrape_seek_jobs(jobTitle, location, numJobs, block_resources=True, http_fast_path=True,
+                     incremental=False, max_age=DEFAULT_MAX_AGE, driver_pool=None, parse_workers=0, checkpoint=None):
+    """Main function to orchestrate scraping using Selenium.
+
+    Returns one JSON document with every job; see iter_seek_jobs() for the
+    options and stream_seek_jobs() for the streaming variant.
+    """
+    print("Python: Starting scrape_seek_jobs...", file=sys.stderr)
+    all_job_details = []
+    csv_writer = CsvStreamWriter(jobTitle, location) # Rows reach the CSV as they are scraped
 
-        print(f"Python: Found {len(job_links)} links. Scraping details for each...", file=sys.stderr)
-        for i, link in enumerate(job_links):
-            print(f"--- Scraping Job {i+1}/{len(job_links)} ---", file=sys.stderr)
-            details = scrape_job_details(driver, link)
+    try:
+        for details in iter_seek_jobs(jobTitle, location, numJobs, block_resources, http_fast_path,
+                                      incremental, max_age, driver_pool, parse_workers=parse_workers,
+                                      checkpoint=checkpoint):
             all_job_details.append(details)
-            # Add a delay between requests
-            sleep_time = 2 + (i % 2) # Variable sleep 2-3 seconds
-            print(f"Python: Sleeping for {sleep_time} seconds...", file=sys.stderr)
-            time.sleep(sleep_time)
-        
-        # Save to CSV if we have job details
-        if all_job_details:
-            csv_filename = save_to_csv(all_job_details, jobTitle, location)
-
+            csv_writer.write(details)
     except Exception as e:
         print(f"Python: General error in scrape_seek_jobs: {e}", file=sys.stderr)
-        # Still try to save partial results to CSV
-        if all_job_details:
-            csv_filename = save_to_csv(all_job_details, jobTitle, location)
+        # Partial results are already in the CSV
         return json.dumps({
             "error": f"An error occurred during scraping process: {e}",
             "partial_results": all_job_details,
-            "csv_file": csv_filename
+            "csv_file": csv_writer.close()
         })
-    finally:
-        if driver:
-            driver.quit()
-            print("Python: WebDriver closed.", file=sys.stderr)
+    csv_filename = csv_writer.close()
+
+    if not all_job_details:
+        return json.dumps({"jobs": [], "csv_file": None})
 
     print(f"Python: Finished scraping. Returning {len(all_job_details)} detailed job results.", file=sys.stderr)
     if csv_filename:
@@ -295,21 +575,93 @@ def scrape_seek_jobs(jobTitle, location, numJobs):
         "jobs": all_job_details,
         "csv_file": csv_filename
     })
-    return json.dumps(all_job_details)
+
+def stream_seek_jobs(jobTitle, location, numJobs, out=sys.stdout, **options):
+    """Streaming variant of scrape_seek_jobs(): writes NDJSON to `out` as jobs are scraped.
+
+    One {"type": "job", "job": {...}} line per job, then a final
+    {"type": "done", "count": N, "csv_file": ...} line, or
+    {"type": "error", "error": ..., "csv_file": ...} if the run failed.
+    Memory use does not grow with the number of jobs.
+    """
+    print("Python: Starting stream_seek_jobs...", file=sys.stderr)
+    csv_writer = CsvStreamWriter(jobTitle, location)
+    count = 0
+    try:
+        for details in iter_seek_jobs(jobTitle, location, numJobs, **options):
+            csv_writer.write(details)
+            out.write(json.dumps({"type": "job", "job": details}) + "\n")
+            out.flush() # The reader renders each row as soon as this line arrives
+            count += 1
+    except Exception as e:
+        print(f"Python: General error in stream_seek_jobs: {e}", file=sys.stderr)
+        out.write(json.dumps({"type": "error", "error": f"An error occurred during scraping process: {e}",
+                              "count": count, "csv_file": csv_writer.close()}) + "\n")
+        out.flush()
+        return count
+    out.write(json.dumps({"type": "done", "count": count, "csv_file": csv_writer.close()}) + "\n")
+    out.flush()
+    print(f"Python: Finished streaming {count} detailed job results.", file=sys.stderr)
+    return count
 
 
 if __name__ == "__main__":
     # Restored main block to be called by server.js
-    if len(sys.argv) != 4:
-        print(json.dumps({"error": "Usage: python scrape_omayzi.py <jobTitle> <location> <numJobs>"}))
+    parser = argparse.ArgumentParser(description="Scrape Seek job listings and print them as JSON.")
+    parser.add_argument("jobTitle", nargs="?")
+    parser.add_argument("location", nargs="?")
+    parser.add_argument("numJobs", nargs="?")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip jobs scraped recently and output only new or changed postings")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE / 3600,
+                        help="hours after which a seen job is scraped again in incremental mode (default: %(default)s)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="print one JSON line per job as it is scraped instead of one document at the end")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="parse job pages in this many worker processes while fetching continues (default: in-line)")
+    parser.add_argument("--metrics-file", default=os.environ.get("SCRAPE_METRICS_FILE"),
+                        help="write a JSON summary of stage timings and counters here when the run ends")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="continue an interrupted run from its checkpoint without refetching finished jobs")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="journal progress to a checkpoint (SEEK_CHECKPOINT_DIR, default ./checkpoints) so the run can be resumed")
+    try:
+        args = parser.parse_args()
+        if not args.resume and args.numJobs is None:
+            parser.error("jobTitle, location and numJobs are required unless --resume is given")
+    except SystemExit as exit_error:
+        if exit_error.code == 0: # --help
+            raise
+        print(json.dumps({"error": "Usage: python scrape_omayzi.py <jobTitle> <location> <numJobs> [--incremental] [--max-age HOURS] [--ndjson] [--parse-workers N] [--metrics-file PATH] [--checkpoint] | --resume RUN_ID"}))
         sys.exit(1)
 
-    job_title_arg = sys.argv[1]
-    location_arg = sys.argv[2]
-    num_jobs_arg = sys.argv[3]
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = RunCheckpoint.resume(args.resume)
+        except (OSError, ValueError, KeyError) as e:
+            print(json.dumps({"error": f"Cannot resume run {args.resume}: {e}"}))
+            sys.exit(1)
+        vars(args).update(checkpoint.params) # Same search and options as the interrupted run
+    elif args.checkpoint:
+        checkpoint = RunCheckpoint.create({"jobTitle": args.jobTitle, "location": args.location, "numJobs": args.numJobs,
+                                           "incremental": args.incremental, "max_age": args.max_age,
+                                           "parse_workers": args.parse_workers})
+        print(f"Python: If this run is interrupted, continue it with --resume {checkpoint.run_id}", file=sys.stderr)
 
-    # Call the main orchestrating function
-    result_json = scrape_seek_jobs(job_title_arg, location_arg, num_jobs_arg)
-    print(result_json) # Print the final JSON result to stdout
-    
-    # Note: The CSV file is already saved by the scrape_seek_jobs function
+    try:
+        if args.ndjson:
+            stream_seek_jobs(args.jobTitle, args.location, args.numJobs,
+                             incremental=args.incremental, max_age=args.max_age * 3600,
+                             parse_workers=args.parse_workers, checkpoint=checkpoint)
+        else:
+            # Call the main orchestrating function
+            result_json = scrape_seek_jobs(args.jobTitle, args.location, args.numJobs,
+                                           incremental=args.incremental, max_age=args.max_age * 3600,
+                                           parse_workers=args.parse_workers, checkpoint=checkpoint)
+            print(result_json) # Print the final JSON result to stdout
+            # Note: The CSV file is already saved by the scrape_seek_jobs function
+    finally:
+        print(f"Python: {METRICS.report()}", file=sys.stderr)
+        if args.metrics_file:
+            METRICS.write_summary(args.metrics_file)
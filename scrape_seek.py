@@ -1,234 +1,397 @@
 # scrape_seek.py
 import os
 print(f"Current working directory: {os.getcwd()}")
-import csv
-import re
+import asyncio
 import time
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
-
-def extract_contact_info(text):
-    """Extracts phone numbers and email addresses from text."""
-    # Simple regex for phone numbers (adjust as needed for different formats)
-    phone_regex = r'(\(?\+?\d{1,3}\)?[\s.-]?\d{1,4}[\s.-]?\d{3,4}[\s.-]?\d{3,4})'
-    # Simple regex for emails
-    email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-
-    phones = re.findall(phone_regex, text)
-    emails = re.findall(email_regex, text)
-
-    phone_str = ', '.join(phones) if phones else '-'
-    email_str = ', '.join(emails) if emails else '-'
-    return phone_str, email_str
-
-def scrape_seek(keyword, location, max_jobs=None):
-    """Scrapes Seek job listings and returns data as a list of lists."""
-    base_url = "https://www.seek.com.au"
+from playwright.async_api import async_playwright
+from rate_limit import HostRateLimiter
+from readiness import SEARCH_READY_SELECTOR, wait_for_job_detail_async
+from resource_filter import ResourceBlocker
+from browser_pool import DEFAULT_MAX_PAGES, DEFAULT_POOL_SIZE, PlaywrightPool
+from http_fetch import fetch_job_html
+from page_cache import cache_report, cached_page, store_page
+from job_store import get_job_store
+from metrics import METRICS
+from pipeline import ParsePipeline
+from resilience import CHALLENGE, RetryQueue, ScrapeError, default_policy, is_challenge_page
+from seek_parser import (JOB_COLUMNS, job_id_from_url, parse_job_details, parse_search_results, search_page_url,
+                         search_url_for)
+from seek_parser import extract_contact_info  # noqa: F401 -- re-exported; it used to be defined here
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Define headers for the CSV file
+CSV_HEADERS = JOB_COLUMNS
+
+DEFAULT_CONCURRENCY = 4 # Maximum number of pages navigating at the same time
+
+def extract_job_details(html_content, job_url):
+    """Parses a job detail page and returns one CSV row (same order as CSV_HEADERS)."""
+    details = parse_job_details(html_content, job_url)
+    return [details[column] for column in CSV_HEADERS]
+
+def error_row(job_url, error):
+    """Placeholder row recorded for a job page that could not be scraped."""
+    return ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', f'Error scraping: {error}', job_url]
+
+def is_error_row(row):
+    """True for a row made by error_row()."""
+    return row[10].startswith('Error scraping: ')
+
+async def _raise_if_challenge(page, url, kind, html_content=None):
+    """Raises ScrapeError if the tab was served a CAPTCHA / block page instead of `url`."""
+    if html_content is None:
+        html_content = await page.content()
+    if is_challenge_page(page.url, html_content):
+        METRICS.count('challenge_pages', kind=kind)
+        raise ScrapeError(CHALLENGE, url, f"Challenge page served for {url}")
+
+async def _launch_browser(p):
+    """Launches headless Chromium, falling back to the Chrome channel. Returns None on failure."""
+    # Try launching with channel='chrome' if default chromium fails
+    try:
+        with METRICS.span('launch', browser='chromium'):
+            return await p.chromium.launch(headless=True) # Set headless=False to watch
+    except Exception as launch_error:
+        print(f"Chromium launch failed: {launch_error}. Trying with Chrome channel.")
+        try:
+             with METRICS.span('launch', browser='chrome'):
+                 return await p.chromium.launch(channel="chrome", headless=True)
+        except Exception as channel_launch_error:
+             print(f"Chrome channel launch also failed: {channel_launch_error}")
+             print("Please ensure Playwright browsers are installed (`playwright install`)")
+             return None
+
+async def _async_render_search_html(context, search_url, rate_limiter):
+    """Renders a search results page in its own browser tab and returns its HTML once job cards are there."""
+    page = await context.new_page()
+    try:
+        print(f"Navigating to {search_url}...")
+        await rate_limiter.wait_async(search_url)
+        with METRICS.span('navigate', page='search'):
+            await page.goto(search_url, wait_until='domcontentloaded', timeout=90000) # Increased timeout
+        print("Page loaded. Waiting for job listings...")
+        # Wait for job cards to be present using a more robust selector
+        with METRICS.span('wait', page='search'):
+            try:
+                await page.wait_for_selector(SEARCH_READY_SELECTOR, timeout=60000) # Increased timeout
+            except Exception:
+                html_content = await page.content()
+                await _raise_if_challenge(page, search_url, 'search', html_content)
+                print("Page HTML snippet at time of error:")
+                print(html_content[:2000]) # Print start of HTML for debugging selectors
+                raise
+        print("Job listings found.")
+        with METRICS.span('page_source', page='search'):
+            return await page.content()
+    finally:
+        await page.close()
+
+async def async_collect_job_links(context, search_url, semaphore, rate_limiter):
+    """Loads a search results page. Returns (unique job URLs in page order, whether a next page exists).
+
+    Whether a next page exists is None if the page could not be loaded.
+
+    Browser loads are retried with backoff (see resilience.RetryPolicy).
+    """
+    cached_html = cached_page(search_url)
+    if cached_html is not None:
+        print(f"Using cached search page: {search_url}")
+        return parse_search_results(cached_html)
+
+    async with semaphore:
+        try:
+            html_content = await default_policy().call_async(
+                search_url, _async_render_search_html, context, search_url, rate_limiter)
+        except Exception as e:
+            print(f"An error occurred during scraping setup or navigation: {e}")
+            return [], None
+
+    # --- Get job links ---
+    job_links, has_next = parse_search_results(html_content)
+    print(f"Extracted {len(job_links)} unique job URLs.")
+    if job_links:
+        store_page(search_url, html_content)
+
+    if not job_links:
+         print("No job links found. The selectors might need updating or the search yielded no results.")
+         print("Page HTML snippet:")
+         print(html_content[:2000]) # Print start of HTML for debugging selectors
+    return job_links, has_next
+
+async def async_crawl_search(context, search_url, max_jobs, semaphore, rate_limiter,
+                             http_fast_path=True, max_pages=None, parser=None, retry_failed=True, checkpoint=None):
+    """Follows ?page=N through a search and scrapes every job found, up to `max_jobs`.
+
+    Result page N+1 is loaded while the job pages of page N are being
+    scraped. Job IDs are de-duplicated across pages (Seek repeats premium
+    listings on every page). With `retry_failed`, job pages that still
+    failed are scraped once more at the end and their rows replaced.
+    With a `checkpoint` (checkpoint.RunCheckpoint) finished jobs are
+    journaled and the pending links saved after each search page; a
+    resumed checkpoint's pending links are scraped first and the search
+    continues at its saved page. Replayed jobs are not part of the rows returned.
+    """
+    rows = []
+    finished_before = len(checkpoint.jobs) if checkpoint else 0 # Counted against max_jobs on a resume
+    # Integer IDs rather than URL strings keep this small for long crawls
+    seen_job_ids = checkpoint.known_ids() if checkpoint else set()
+    page_number = checkpoint.next_page if checkpoint else 1
+    next_page = None
+    if page_number is not None:
+        next_page = asyncio.create_task(
+            async_collect_job_links(context, search_page_url(search_url, page_number), semaphore, rate_limiter))
+    if checkpoint and checkpoint.pending_urls():
+        pending = checkpoint.pending_urls()
+        print(f"Scraping {len(pending)} job pages pending from the interrupted run...")
+        rows.extend(await async_scrape_job_pages(context, pending, semaphore, rate_limiter, http_fast_path, parser,
+                                                 checkpoint))
+
+    while next_page is not None:
+        job_links, has_next = await next_page
+        next_page = None
+
+        new_links = []
+        for job_url in job_links:
+            job_id = job_id_from_url(job_url)
+            if job_id not in seen_job_ids:
+                seen_job_ids.add(job_id)
+                new_links.append(job_url)
+        if max_jobs is not None and max_jobs > 0:
+            new_links = new_links[:max(0, max_jobs - finished_before - len(rows))]
+        print(f"Search page {page_number}: {len(job_links)} jobs, {len(new_links)} new.")
+
+        reached_limit = max_jobs is not None and max_jobs > 0 and finished_before + len(rows) + len(new_links) >= max_jobs
+        reached_last_page = not has_next or not job_links or (max_pages is not None and page_number >= max_pages)
+        if not reached_limit and not reached_last_page:
+            # Prefetch the next result page while this page's jobs are scraped
+            page_number += 1
+            next_page = asyncio.create_task(
+                async_collect_job_links(context, search_page_url(search_url, page_number), semaphore, rate_limiter))
+        if checkpoint:
+            # A page that failed to load is where a resumed run starts again
+            checkpoint.add_pending(new_links, page_number if next_page or has_next is None else None)
+
+        rows.extend(await async_scrape_job_pages(context, new_links, semaphore, rate_limiter, http_fast_path, parser,
+                                                 checkpoint))
+
+    failed = [i for i, row in enumerate(rows) if is_error_row(row)]
+    if retry_failed and failed:
+        retry_queue = RetryQueue()
+        for i in failed:
+            retry_queue.add(rows[i][-1], rows[i][10])
+        # Transient blocks and timeouts have usually cleared by the end of the run
+        print(f"Retrying {len(failed)} failed job pages in {retry_queue.delay:.0f} s...")
+        await asyncio.sleep(retry_queue.delay)
+        retried = await async_scrape_job_pages(context, retry_queue.take(), semaphore, rate_limiter,
+                                               http_fast_path, parser, checkpoint)
+        for i, row in zip(failed, retried):
+            rows[i] = row
+    if checkpoint:
+        for row in rows:
+            if is_error_row(row): # Final now; journaled so a resume doesn't try them again
+                checkpoint.record_job(row[-1], dict(zip(CSV_HEADERS, row)))
+    return rows
+
+async def _async_render_job_html(context, job_url, rate_limiter):
+    """Renders a job page in its own browser tab and returns the resulting HTML."""
+    await rate_limiter.wait_async(job_url)
+    page = await context.new_page()
+    try:
+        with METRICS.span('navigate', page='job'):
+            await page.goto(job_url, wait_until='domcontentloaded', timeout=60000)
+        # Wait for the elements the extractor needs rather than a fixed delay
+        with METRICS.span('wait', page='job'):
+            ready = await wait_for_job_detail_async(page)
+        with METRICS.span('page_source', page='job'):
+            html_content = await page.content()
+        if not ready:
+            await _raise_if_challenge(page, job_url, 'job', html_content)
+            print(f"Job detail elements did not appear for {job_url}; parsing what loaded.")
+            METRICS.count('wait_timeouts', page='job')
+            return html_content
+        store_page(job_url, html_content)
+        return html_content
+    finally:
+        await page.close()
+
+async def _async_scrape_job(context, job_url, index, total, semaphore, rate_limiter, http_fast_path=True,
+                            parser=None):
+    """Scrapes one job page. Errors are isolated to this job's row.
+
+    Fresh pages come from the page cache without any request. With
+    `http_fast_path` the page is otherwise fetched with a plain GET; the
+    browser only renders it when that response cannot be parsed.
+    With a `parser` (ParsePipeline) the HTML is parsed in a worker process
+    after the fetch slot is released, so the next fetch starts right away.
+    Browser renders take a slot per attempt: retry backoff doesn't hold one.
+    """
+    async def render():
+        async with semaphore:
+            return await _async_render_job_html(context, job_url, rate_limiter)
+
+    try:
+        async with semaphore:
+            print(f"\nScraping job {index+1}/{total}: {job_url}")
+            started = time.monotonic()
+            if http_fast_path:
+                # requests is blocking, so the GET (and its cache lookup) runs on a worker thread
+                html_content = await asyncio.to_thread(fetch_job_html, job_url, 15, rate_limiter)
+            else:
+                html_content = cached_page(job_url)
+        if html_content is None:
+            html_content = await default_policy().call_async(job_url, render)
+        if parser is None:
+            row = extract_job_details(html_content, job_url)
+        else:
+            parser.record_fetch(html_content, time.monotonic() - started)
+            details = await parser.parse_async(job_url, html_content)
+            row = [details[column] for column in CSV_HEADERS]
+        print(f"Successfully extracted: {row[0]} | {row[1]} | {row[2]}")
+        METRICS.count('jobs_scraped', result='ok')
+        return row
+    except Exception as e:
+        print(f"Error scraping {job_url}: {e}")
+        METRICS.count('jobs_scraped', result='error')
+        return error_row(job_url, e)
+
+async def async_scrape_job_pages(context, job_urls, semaphore, rate_limiter, http_fast_path=True, parser=None,
+                                 checkpoint=None):
+    """Scrapes job pages concurrently (bounded by `semaphore`). Rows come back in the order of `job_urls`.
+
+    With a `checkpoint`, each successful row is journaled as soon as its page is done.
+    """
+    async def scrape(i, job_url):
+        row = await _async_scrape_job(context, job_url, i, len(job_urls), semaphore, rate_limiter, http_fast_path,
+                                      parser)
+        if checkpoint is not None and not is_error_row(row):
+            checkpoint.record_job(job_url, dict(zip(CSV_HEADERS, row)))
+        return row
+
+    tasks = [scrape(i, job_url) for i, job_url in enumerate(job_urls)]
+    # gather() keeps the order of its arguments, whatever order the pages finish in
+    return list(await asyncio.gather(*tasks))
+
+async def async_scrape_seek(keyword, location, max_jobs=None, concurrency=DEFAULT_CONCURRENCY,
+                            block_resources=True, resource_allowlist=None, http_fast_path=True, max_pages=None,
+                            browser=None, parse_workers=0, checkpoint=None):
+    """Scrapes Seek job listings with up to `concurrency` pages in flight and returns data as a list of lists.
+
+    Result pages are followed until `max_jobs` jobs are collected, the
+    results run out, or `max_pages` pages have been read.
+
+    With `block_resources`, images, media, fonts, stylesheets and analytics
+    requests are aborted; URLs matching `resource_allowlist` still load.
+    With `http_fast_path`, job pages are fetched over pooled HTTP and only
+    rendered in the browser when needed.
+    A long-lived `browser` can be passed in to skip the launch; the run then
+    only opens (and closes) its own context in it.
+    With `parse_workers` > 0, job pages are parsed in that many worker
+    processes while fetching continues (see pipeline.ParsePipeline).
+    With a `checkpoint` (checkpoint.RunCheckpoint), finished jobs are
+    journaled as they complete; pass RunCheckpoint.resume(run_id) to
+    continue an interrupted run without fetching its finished jobs again.
+    """
     # Format location for URL (e.g., "Melbourne VIC" -> "melbourne-vic")
-    location_slug = location.lower().replace(' ', '-')
-    search_url = f"{base_url}/{keyword.lower().replace(' ', '-')}-jobs/in-{location_slug}"
-    print(f"Starting scrape for '{keyword}' in '{location}' (max_jobs={max_jobs})...")
+    search_url = search_url_for(keyword, location)
+    print(f"Starting scrape for '{keyword}' in '{location}' (max_jobs={max_jobs}, concurrency={concurrency})...")
     print(f"Search URL: {search_url}")
 
     job_data = []
-    # Define headers for the CSV file
-    headers = [
-        "Job Title", "Company Name", "Location", "Salary/Pay Range",
-        "Key Responsibilities", "Required Skills/Qualifications", "Date Posted",
-        "Job Type", "Phone Number", "Email", "Full Job Description", "Job URL"
-    ]
-    job_data.append(headers)
-
-    with sync_playwright() as p:
-        # Try launching with channel='chrome' if default chromium fails
+    job_data.append(CSV_HEADERS)
+    if checkpoint is not None:
+        # Jobs finished before the interruption come back from the journal
+        job_data.extend([job.get(column, '-') for column in CSV_HEADERS] for job in checkpoint.jobs)
+    # One semaphore schedules every navigation (search and detail pages) of this run
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    # Politeness throttle, tuned independently of page readiness (SEEK_RATE_LIMIT / SEEK_RATE_BURST)
+    rate_limiter = HostRateLimiter.from_env()
+    parser = ParsePipeline(parse_workers) if parse_workers and parse_workers > 0 else None
+
+    async def run(browser, owns_browser):
+        blocker = None
+        context = None
         try:
-            browser = p.chromium.launch(headless=True) # Set headless=False to watch
-        except Exception as launch_error:
-            print(f"Chromium launch failed: {launch_error}. Trying with Chrome channel.")
-            try:
-                 browser = p.chromium.launch(channel="chrome", headless=True)
-            except Exception as channel_launch_error:
-                 print(f"Chrome channel launch also failed: {channel_launch_error}")
-                 print("Please ensure Playwright browsers are installed (`playwright install`)")
-                 return # Exit if browser cannot be launched
-
-        page = browser.new_page()
-        # Add a user-agent to look more like a real browser
-        page.set_extra_http_headers({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"})
-
-
-        try:
-            print(f"Navigating to {search_url}...")
-            page.goto(search_url, wait_until='domcontentloaded', timeout=90000) # Increased timeout
-            print("Page loaded. Waiting for job listings...")
-            # Wait for job cards to be present using a more robust selector
-            page.wait_for_selector('article[data-card-type="JobCard"]', timeout=60000) # Increased timeout
-            print("Job listings found.")
-
-            # --- Get job links ---
-            job_links = set() # Use a set to avoid duplicates
-            # Find all article elements representing job cards
-            job_card_articles = page.query_selector_all('article[data-card-type="JobCard"]')
-            print(f"Found {len(job_card_articles)} job card articles.")
-
-            for article in job_card_articles:
-                 # Try finding the link within the h3 tag first
-                 link_element = article.query_selector('h3 a[data-automation="job-title"]')
-                 # Fallback to a more general link if the specific one isn't found
-                 if not link_element:
-                      link_element = article.query_selector('a[data-automation="jobTitle"]') # Check this selector too
-                 if not link_element:
-                      link_element = article.query_selector('a[href*="/job/"]') # General fallback
-
-                 if link_element:
-                     href = link_element.get_attribute('href')
-                     if href and href.startswith('/job/'):
-                         full_url = base_url + href.split('?')[0] # Clean URL parameters
-                         job_links.add(full_url)
-
-
-            job_links = list(job_links) # Convert back to list for iteration
-            print(f"Extracted {len(job_links)} unique job URLs.")
-
-            if not job_links:
-                 print("No job links found. The selectors might need updating or the search yielded no results.")
-                 print("Page HTML snippet:")
-                 print(page.content()[:2000]) # Print start of HTML for debugging selectors
-
-
-            # --- Scrape each job page ---
-            jobs_to_scrape = job_links
-            if max_jobs is not None and max_jobs > 0:
-                jobs_to_scrape = job_links[:max_jobs]
-                print(f"Limiting scrape to {len(jobs_to_scrape)} jobs based on max_jobs={max_jobs}.")
-
-            for i, job_url in enumerate(jobs_to_scrape):
-                print(f"\nScraping job {i+1}/{len(jobs_to_scrape)}: {job_url}")
-                try:
-                    page.goto(job_url, wait_until='domcontentloaded', timeout=60000)
-                    # Allow some time for dynamic content if needed
-                    time.sleep(3) # Increased sleep slightly
-                    html_content = page.content()
-                    soup = BeautifulSoup(html_content, 'html.parser')
-
-                    # --- Extract data using BeautifulSoup ---
-                    # Selectors need careful inspection and adjustment based on Seek's current HTML structure
-                    # These are examples and likely need refinement
-
-                    # Title
-                    title = soup.find('h1', {'data-automation': 'job-detail-title'})
-                    title_text = title.text.strip() if title else '-'
-                    if title_text == '-': # Fallback selector
-                         title = soup.find('h1', class_=lambda x: x and 'JobTitle' in x)
-                         title_text = title.text.strip() if title else '-'
-
-
-                    # Company
-                    company = soup.find('span', {'data-automation': 'advertiser-name'})
-                    company_text = company.text.strip() if company else '-'
-                    if company_text == '-' : # Fallback using link
-                         company_link = soup.find('a', {'data-automation': 'job-header-company-name'})
-                         company_text = company_link.text.strip() if company_link else '-'
-                    if company_text == '-': # Generic fallback
-                         company = soup.find('span', class_=lambda x: x and 'AdvertiserName' in x)
-                         company_text = company.text.strip() if company else '-'
-
-
-                    # Location
-                    location_element = soup.find('span', {'data-automation': 'job-detail-location'})
-                    location_text = location_element.text.strip() if location_element else '-'
-                    if location_text == '-': # Fallback using strong tag heuristic
-                        strong_tags = soup.find_all('strong')
-                        for tag in strong_tags:
-                             parent_div = tag.find_parent('div')
-                             if parent_div and 'Location' in parent_div.text:
-                                 location_text = tag.text.strip()
-                                 break
-                    if location_text == '-': # Generic fallback
-                         loc_span = soup.find('span', class_=lambda x: x and 'Location' in x)
-                         if loc_span:
-                              # Often location is inside a link within this span
-                              loc_link = loc_span.find('a')
-                              location_text = loc_link.text.strip() if loc_link else loc_span.text.strip()
-
-
-                    # Salary
-                    salary = soup.find('span', {'data-automation': 'job-detail-salary'})
-                    salary_text = salary.text.strip() if salary else '-'
-                    if salary_text == '-': # Generic fallback
-                         salary = soup.find('span', class_=lambda x: x and 'Salary' in x)
-                         salary_text = salary.text.strip() if salary else '-'
-
-
-                    # Job Type / Classification
-                    job_type_text = '-'
-                    # Find the container div first
-                    classification_div = soup.find('div', string=lambda t: t and 'Classification' in t)
-                    if classification_div:
-                         # Find the actual classification text, often in a following sibling or child span/strong tag
-                         details_span = classification_div.find_next_sibling('span')
-                         if details_span:
-                              job_type_text = details_span.text.strip()
-                         else: # Try finding within strong tags if no direct span sibling
-                              strong_tag = classification_div.find_next('strong')
-                              if strong_tag:
-                                   job_type_text = strong_tag.text.strip()
-
-
-                    # Date Posted
-                    date_posted_element = soup.find('span', {'data-automation': 'job-detail-date'})
-                    date_posted_text = date_posted_element.text.strip() if date_posted_element else '-'
-                    if date_posted_text == '-': # Generic fallback
-                         date_span = soup.find('span', class_=lambda x: x and 'ListedDate' in x)
-                         date_posted_text = date_span.text.strip() if date_span else '-'
-
-
-                    # Full description
-                    description_div = soup.find('div', {'data-automation': 'jobAdDetails'})
-                    full_description_text = description_div.get_text(separator='\n', strip=True) if description_div else '-'
-                    if full_description_text == '-': # Fallback
-                         description_div = soup.find('div', class_=lambda x: x and 'job-description' in x)
-                         full_description_text = description_div.get_text(separator='\n', strip=True) if description_div else '-'
-
-
-                    # Extract Responsibilities & Skills (Placeholder - requires better logic)
-                    responsibilities_text = "See Full Description"
-                    skills_text = "See Full Description"
-
-                    # Extract contacts
-                    phone_text, email_text = extract_contact_info(full_description_text)
-
-                    job_details = [
-                        title_text, company_text, location_text, salary_text,
-                        responsibilities_text, skills_text, date_posted_text,
-                        job_type_text, phone_text, email_text, full_description_text, job_url
-                    ]
-                    job_data.append(job_details)
-                    print(f"Successfully extracted: {title_text} | {company_text} | {location_text}")
-                    time.sleep(1.5) # Slightly longer delay
-
-                except Exception as e:
-                    print(f"Error scraping {job_url}: {e}")
-                    job_data.append(['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', f'Error scraping: {e}', job_url])
-
+            # Add a user-agent to look more like a real browser
+            context = await browser.new_context(user_agent=USER_AGENT)
+            if block_resources:
+                blocker = ResourceBlocker(allowlist=resource_allowlist)
+                await blocker.install(context)
+            # --- Crawl result pages and scrape each job page ---
+            job_data.extend(await async_crawl_search(context, search_url, max_jobs, semaphore, rate_limiter,
+                                                     http_fast_path, max_pages, parser, checkpoint=checkpoint))
+            store = get_job_store()
+            if store is not None:
+                # One batch for the whole run; the list-of-lists return value is unchanged
+                with METRICS.span('store_write'):
+                    stored = await asyncio.to_thread(store.upsert_jobs,
+                                                     [dict(zip(CSV_HEADERS, row)) for row in job_data[1:]
+                                                      if not is_error_row(row)], keyword)
+                print(f"Stored {stored} jobs in {store.path}")
+            if checkpoint is not None and checkpoint.search_done:
+                checkpoint.finish()
 
         except Exception as e:
-            print(f"An error occurred during scraping setup or navigation: {e}")
-            print("Page HTML snippet at time of error:")
-            try:
-                print(page.content()[:2000]) # Print start of HTML for debugging selectors
-            except Exception as content_error:
-                print(f"Could not get page content: {content_error}")
-
+            print(f"An error occurred during scraping: {e}")
 
         finally:
-            browser.close()
-            print("\nBrowser closed.")
+            if owns_browser:
+                await browser.close()
+                print("\nBrowser closed.")
+            elif context is not None:
+                await context.close() # Keep the shared browser warm for the next run
+            if blocker is not None:
+                print(blocker.report())
+            if parser is not None:
+                parser.close() # Prints the fetch/parse throughput report
+            if checkpoint is not None and not checkpoint.finished:
+                checkpoint.close()
+                print(checkpoint.report())
+            print(cache_report())
+            print(METRICS.report())
+
+    if browser is not None:
+        await run(browser, owns_browser=False)
+    else:
+        async with async_playwright() as p:
+            browser = await _launch_browser(p)
+            if browser is None:
+                if parser is not None:
+                    parser.close()
+                return # Exit if browser cannot be launched
+            await run(browser, owns_browser=True)
 
     # --- Return data ---
     print(f"Scraping finished. Returning {len(job_data) - 1} jobs.")
     return job_data
 
+def playwright_pool(size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES, checkout_timeout=None):
+    """A browser_pool.PlaywrightPool of headless Chromium browsers, to pass to scrape_seek(pool=...)."""
+    return PlaywrightPool(_launch_browser, size, max_pages, checkout_timeout)
+
+def scrape_seek(keyword, location, max_jobs=None, concurrency=DEFAULT_CONCURRENCY,
+                block_resources=True, resource_allowlist=None, http_fast_path=True, max_pages=None, parse_workers=0,
+                checkpoint=None, pool=None):
+    """Scrapes Seek job listings and returns data as a list of lists.
+
+    With a `pool` (see playwright_pool()) the run borrows a warm browser
+    instead of launching one; calls from several threads share the pool.
+    """
+    # Synchronous entry point kept for existing callers; the work is done by the asyncio engine
+    def scrape(browser=None):
+        return async_scrape_seek(keyword, location, max_jobs, concurrency,
+                                 block_resources, resource_allowlist, http_fast_path, max_pages,
+                                 browser=browser, parse_workers=parse_workers, checkpoint=checkpoint)
+
+    if pool is None:
+        return asyncio.run(scrape())
+
+    async def scrape_with(lease):
+        job_data = await scrape(lease.browser)
+        lease.pages += len(job_data or ()) # About one page load per job row
+        return job_data
+    return pool.run(scrape_with)
+
 # Optional: Keep for testing if needed, but commented out for module use
 # if __name__ == "__main__":
     # Ensure location matches Seek's format if possible (e.g., "Melbourne VIC")
@@ -243,4 +406,4 @@ def scrape_seek(keyword, location, max_jobs=None):
     #         print(results[1])
     #
     # Example for different search:
-    # scrape_seek("Data Scientist", "Sydney NSW", filename="seek_ds_jobs_sydney.csv")
\ No newline at end of file
+    # scrape_seek("Data Scientist", "Sydney NSW", filename="seek_ds_jobs_sydney.csv")
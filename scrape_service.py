@@ -0,0 +1,105 @@
+# scrape_service.py
+"""Resident scraping service: keeps a pool of warm Chrome browsers between requests.
+
+server.js forwards /scrape here when SCRAPE_SERVICE_URL is set, so a request
+no longer pays for a Python start, ChromeDriverManager and a Chrome launch.
+
+    python scrape_service.py --port 5001 --pool-size 2
+
+GET /scrape?jobTitle=...&location=...&numJobs=...[&incremental=1]  -> same JSON as scrape_omayzi.py
+GET /health                                                        -> pool statistics
+GET /metrics[?format=json]                                         -> stage timings and counters (Prometheus text)
+"""
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from metrics import METRICS
+from browser_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB, DEFAULT_POOL_SIZE, DriverPool
+from resource_filter import ResourceBlocker
+from scrape_omayzi import get_driver, scrape_seek_jobs
+
+DEFAULT_PORT = 5001
+CHECKOUT_TIMEOUT = 300  # Seconds a request waits for a free browser before giving up
+
+
+class ScrapeRequestHandler(BaseHTTPRequestHandler):
+    pool = None  # Set by main()
+
+    def _send_json(self, status, body):
+        payload = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            healthy = not self.pool.closed
+            self._send_json(200 if healthy else 503, {'status': 'ok' if healthy else 'closed', 'pool': self.pool.stats()})
+            return
+        if url.path == '/metrics':
+            if parse_qs(url.query).get('format') == ['json']:
+                self._send_json(200, METRICS.summary())
+            else:
+                payload = METRICS.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            return
+        if url.path != '/scrape':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        job_title, location, num_jobs = params.get('jobTitle'), params.get('location'), params.get('numJobs')
+        if not job_title or not location or not num_jobs:
+            self._send_json(400, {'error': 'Missing job title, location, or number of jobs parameter'})
+            return
+        incremental = params.get('incremental', '').lower() in ('1', 'true', 'yes')
+        result_json = scrape_seek_jobs(job_title, location, num_jobs, incremental=incremental, driver_pool=self.pool)
+        self._send_json(200, result_json)
+
+    def log_message(self, format, *args):
+        print(f"Python: scrape_service: {format % args}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident Seek scraping service with a warm browser pool.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SCRAPE_SERVICE_PORT', DEFAULT_PORT)))
+    parser.add_argument('--pool-size', type=int, default=int(os.environ.get('SCRAPE_POOL_SIZE', DEFAULT_POOL_SIZE)))
+    parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES,
+                        help="recycle a browser after this many page loads (default: %(default)s)")
+    parser.add_argument('--max-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB,
+                        help="recycle a browser above this much memory; needs psutil (default: %(default)s)")
+    parser.add_argument('--no-block-resources', action='store_true', help="let browsers load images, fonts and trackers")
+    args = parser.parse_args()
+
+    blocker_factory = None if args.no_block_resources else ResourceBlocker
+    pool = DriverPool(get_driver, args.pool_size, args.max_pages, args.max_rss_mb, blocker_factory, CHECKOUT_TIMEOUT)
+    print(f"Python: Starting {pool.size} browsers...", file=sys.stderr)
+    pool.warm()
+
+    ScrapeRequestHandler.pool = pool
+    server = ThreadingHTTPServer((args.host, args.port), ScrapeRequestHandler)
+    server.daemon_threads = True
+    print(f"Python: Scrape service listening at http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        print("Python: Scrape service stopped.", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
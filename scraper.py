@@ -1,9 +1,14 @@
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import SoupStrainer
+from seek_parser import BASE_URL, NEXT_PAGE_MARKER, job_id_from_url, make_soup, search_page_url
+from page_cache import fetch_with_cache, get_cache
+from metrics import METRICS
+from resilience import CHALLENGE, RETRYABLE, ScrapeError, check_response, default_policy
 import re # For potentially extracting email/phone later
 
 # Seek URL structure (adjust if needed based on current Seek structure)
-SEEK_URL = "https://www.seek.com.au/{}-jobs/in-All-Australia"
+SEEK_URL = BASE_URL + "/{}-jobs/in-All-Australia"
 
 # Headers to mimic a browser request
 HEADERS = {
@@ -13,19 +18,107 @@ HEADERS = {
     'Connection': 'keep-alive',
 }
 
-def scrape_seek(job_title):
+MAX_PAGES = 50 # Safety cap on result pages read per search
+JOB_CARD_MARKER = 'data-automation="normalJob"'
+
+def is_results_page(html):
+    """Only real result pages are cached (not CAPTCHA or block pages)."""
+    return "captcha" not in html.lower() and JOB_CARD_MARKER in html
+
+def fetch_results_page(session, url, cache):
+    """
+    GETs one search results page through the page cache.
+
+    Timeouts, network errors, 429s and 5xx answers are retried with jittered
+    backoff; raises ScrapeError once retries run out or on a CAPTCHA / block page.
+    """
+    def fetch():
+        response = fetch_with_cache(session, url, cache, 15, is_results_page)
+        if not response.from_cache:
+            check_response(url, response.status_code, response.text, response.url, response.retry_after)
+            # A real result page can mention "captcha" in a job snippet; a block page has no job cards
+            if "captcha" in response.text.lower() and JOB_CARD_MARKER not in response.text:
+                raise ScrapeError(CHALLENGE, url, f"CAPTCHA page for {url}", response.status_code)
+        return response
+    return default_policy(retry_on=RETRYABLE - {CHALLENGE}, unreported={CHALLENGE}).call(url, fetch)
+
+def parse_job_cards(html):
+    """
+    Parses the job cards of one search results page.
+
+    Returns:
+        list: One dictionary per job card with keys 'title', 'company',
+              'salary', 'description' and 'url'.
+    """
+    # Only <article> subtrees are parsed (job cards); the rest of the page is skipped
+    soup = make_soup(html, SoupStrainer('article'))
+
+    # --- CSS Selectors for Seek (These might change!) ---
+    # Find all job listing containers. This selector needs verification.
+    # Inspect Seek's HTML structure to find the right container element.
+    # Example selector (likely needs updating): 'article[data-card-type="JobCard"]'
+    job_cards = soup.find_all('article', {'data-automation': 'normalJob'}) # Example selector - VERIFY THIS
+
+    jobs = []
+    for card in job_cards:
+        # Extract Job Title - Example selector (VERIFY THIS)
+        title_element = card.find('a', {'data-automation': 'jobTitle'})
+        title = title_element.text.strip() if title_element else 'N/A'
+        href = title_element.get('href', '') if title_element else ''
+        url = BASE_URL + href.split('?')[0] if href.startswith('/job/') else 'N/A'
+
+        # Extract Company Name - Example selector (VERIFY THIS)
+        company_element = card.find('a', {'data-automation': 'jobCompany'})
+        company = company_element.text.strip() if company_element else 'N/A'
+
+        # Extract Salary - Example selector (VERIFY THIS)
+        # Salary might be in different places or formats
+        salary_element = card.find('span', {'data-automation': 'jobSalary'})
+        salary = salary_element.text.strip() if salary_element else 'Not specified'
+
+        # Extract Job Description Snippet - Example selector (VERIFY THIS)
+        # Seek often shows snippets; full description requires visiting the job link
+        description_element = card.find('span', {'data-automation': 'jobShortDescription'})
+        description = description_element.text.strip() if description_element else 'N/A'
+
+        # --- Email/Phone Extraction (More Complex) ---
+        # These are rarely on the search results page.
+        # Would typically require visiting the individual job link (see 'url')
+        # and parsing that page. We'll skip this for now.
+
+        if title != 'N/A': # Only add if we found a title
+            jobs.append({
+                'title': title,
+                'company': company,
+                'salary': salary,
+                'description': description,
+                'url': url,
+            })
+    return jobs
+
+def scrape_seek(job_title, max_jobs=None, max_pages=MAX_PAGES, on_page=None):
     """
     Scrapes Seek.com for jobs matching the given job title.
 
+    Result pages (?page=N) are followed until `max_jobs` jobs are found,
+    the results run out, or `max_pages` pages have been read. The next
+    page is requested in the background while the current one is parsed,
+    unless the current page may already reach `max_jobs`.
+
     Args:
         job_title (str): The job title to search for.
+        max_jobs (int, optional): Stop after this many jobs (0 fetches nothing).
+        max_pages (int, optional): Stop after this many result pages.
+        on_page (callable, optional): Called with each page's new jobs as soon
+              as the page is parsed (used for progress reporting).
 
     Returns:
         list: A list of dictionaries, where each dictionary represents a job
-              with keys: 'title', 'company', 'salary', 'description'.
-              Returns an empty list if no jobs are found or an error occurs.
+              with keys: 'title', 'company', 'salary', 'description', 'url'.
+              Returns an empty list if no jobs are found or an error occurs
+              on the first page; later page errors return what was found so far.
     """
-    if not job_title:
+    if not job_title or (max_jobs is not None and max_jobs <= 0):
         return []
 
     # Format the job title for the URL (e.g., "data scientist" -> "data-scientist")
@@ -33,74 +126,70 @@ def scrape_seek(job_title):
     search_url = SEEK_URL.format(formatted_title)
     print(f"Scraping URL: {search_url}") # Debugging print
 
-    try:
-        response = requests.get(search_url, headers=HEADERS, timeout=15)
-        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-
-        # Check for CAPTCHA or blocking - this is a basic check, might need refinement
-        if "challenge" in response.url.lower() or "captcha" in response.text.lower():
-            print("Warning: CAPTCHA or block detected. Cannot proceed with scraping.")
-            # In a real app, you might raise a specific exception here
-            return [] # Indicate failure due to block
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # --- CSS Selectors for Seek (These might change!) ---
-        # Find all job listing containers. This selector needs verification.
-        # Inspect Seek's HTML structure to find the right container element.
-        # Example selector (likely needs updating): 'article[data-card-type="JobCard"]'
-        job_cards = soup.find_all('article', {'data-automation': 'normalJob'}) # Example selector - VERIFY THIS
-
-        if not job_cards:
-            print("No job cards found using the current selector.")
-            return []
-
-        results = []
-        for card in job_cards:
-            # Extract Job Title - Example selector (VERIFY THIS)
-            title_element = card.find('a', {'data-automation': 'jobTitle'})
-            title = title_element.text.strip() if title_element else 'N/A'
-
-            # Extract Company Name - Example selector (VERIFY THIS)
-            company_element = card.find('a', {'data-automation': 'jobCompany'})
-            company = company_element.text.strip() if company_element else 'N/A'
-
-            # Extract Salary - Example selector (VERIFY THIS)
-            # Salary might be in different places or formats
-            salary_element = card.find('span', {'data-automation': 'jobSalary'})
-            salary = salary_element.text.strip() if salary_element else 'Not specified'
-
-            # Extract Job Description Snippet - Example selector (VERIFY THIS)
-            # Seek often shows snippets; full description requires visiting the job link
-            description_element = card.find('span', {'data-automation': 'jobShortDescription'})
-            description = description_element.text.strip() if description_element else 'N/A'
-
-            # --- Email/Phone Extraction (More Complex) ---
-            # These are rarely on the search results page.
-            # Would typically require visiting the individual job link (found in title_element['href'])
-            # and parsing that page. We'll skip this for now.
-            email = 'N/A'
-            phone = 'N/A'
-
-            if title != 'N/A': # Only add if we found a title
-                results.append({
-                    'title': title,
-                    'company': company,
-                    'salary': salary,
-                    'description': description,
-                    # 'email': email, # Add later if implemented
-                    # 'phone': phone, # Add later if implemented
-                })
-
-        print(f"Found {len(results)} jobs.") # Debugging print
-        return results
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error during request to Seek: {e}")
-        return [] # Indicate failure due to network error
-    except Exception as e:
-        print(f"An unexpected error occurred during scraping: {e}")
-        return [] # Indicate failure due to other errors
+    session = requests.Session() # Keep-alive across result pages
+    session.headers.update(HEADERS)
+    cache = get_cache() # Repeated searches within the search-page TTL skip the network
+    results = []
+    seen_job_ids = set() # Integer IDs: compact de-duplication across pages
+    page_number = 1
+
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        def fetch_page(number):
+            return prefetcher.submit(fetch_results_page, session, search_page_url(search_url, number), cache)
+
+        next_response = fetch_page(page_number)
+        while next_response is not None:
+            try:
+                response = next_response.result() # Already retried by fetch_results_page
+                next_response = None
+                html = response.text
+                has_next = NEXT_PAGE_MARKER in html and page_number < max_pages
+
+                # This page's card count bounds the jobs it adds: when it may reach max_jobs, the next
+                # page is only requested once the limit is known not to be reached
+                may_reach_limit = max_jobs is not None and len(results) + html.count(JOB_CARD_MARKER) >= max_jobs
+                if has_next and not may_reach_limit:
+                    page_number += 1
+                    next_response = fetch_page(page_number) # Fetched while this one is parsed
+
+                with METRICS.span('parse', page='search_cards'):
+                    page_jobs = parse_job_cards(html)
+                if not page_jobs:
+                    print("No job cards found using the current selector.")
+                    break
+
+                new_jobs = []
+                for job in page_jobs:
+                    job_id = job_id_from_url(job['url'])
+                    if job_id is not None and job_id in seen_job_ids:
+                        continue # Premium listings repeat on every page
+                    seen_job_ids.add(job_id)
+                    new_jobs.append(job)
+                    if max_jobs is not None and len(results) + len(new_jobs) >= max_jobs:
+                        break
+                results.extend(new_jobs)
+                if on_page:
+                    on_page(new_jobs)
+                if max_jobs is not None and len(results) >= max_jobs:
+                    break
+                if has_next and next_response is None:
+                    page_number += 1
+                    next_response = fetch_page(page_number)
+
+            except ScrapeError as e:
+                if e.kind == CHALLENGE:
+                    print("Warning: CAPTCHA or block detected. Cannot proceed with scraping.")
+                else:
+                    print(f"Error during request to Seek: {e}")
+                break # Keeps jobs from earlier pages
+            except Exception as e:
+                print(f"An unexpected error occurred during scraping: {e}")
+                break # Indicate failure due to other errors
+
+    print(f"Found {len(results)} jobs.") # Debugging print
+    if cache is not None:
+        print(cache.report())
+    return results
 
 # Example usage (for testing the scraper directly)
 if __name__ == '__main__':
@@ -0,0 +1,364 @@
+# seek_parser.py
+import json
+import os
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+from contact_extract import extract_contact_info  # Re-exported: scrape_seek / scrape_omayzi import it from here
+from metrics import METRICS
+
+# Parser backend: lxml when installed (much faster), otherwise the stdlib parser.
+# SEEK_HTML_PARSER overrides the choice (e.g. "html.parser" or "html5lib").
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+PARSER = os.environ.get('SEEK_HTML_PARSER', DEFAULT_PARSER)
+
+# SEEK_BASE_URL points every scraper at another host (e.g. the benchmark fixture server)
+BASE_URL = os.environ.get('SEEK_BASE_URL', "https://www.seek.com.au").rstrip('/')
+
+# The 12 columns every scraper emits, in CSV order
+JOB_COLUMNS = [
+    "Job Title", "Company Name", "Location", "Salary/Pay Range",
+    "Key Responsibilities", "Required Skills/Qualifications", "Date Posted",
+    "Job Type", "Phone Number", "Email", "Full Job Description", "Job URL"
+]
+
+# Server-rendered app state and JSON-LD blocks embedded in Seek job pages
+REDUX_STATE_RE = re.compile(r'window\.SEEK_REDUX_DATA\s*=\s*')
+JSON_LD_RE = re.compile(r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+
+JOB_ID_RE = re.compile(r'/job/(\d+)')
+# Pagination link Seek renders while more result pages exist
+NEXT_PAGE_MARKER = 'data-automation="page-next"'
+
+# Scoped parses: only the job cards of a search page, only the header/description of a job page
+SEARCH_CARD_STRAINER = SoupStrainer('article', attrs={'data-card-type': 'JobCard'})
+DETAIL_REGION_STRAINER = SoupStrainer(attrs={'data-automation': re.compile(
+    r'^(job-detail-title|advertiser-name|job-header-company-name|job-detail-location|'
+    r'job-detail-salary|job-detail-work-type|job-detail-classifications|job-detail-date|jobAdDetails)$'
+)})
+
+
+def make_soup(markup, parse_only=None, parser=None):
+    """BeautifulSoup with the configured parser backend, optionally limited by a SoupStrainer."""
+    return BeautifulSoup(markup, parser or PARSER, parse_only=parse_only)
+
+
+def search_url_for(keyword, location):
+    """Seek search URL for a keyword and location (e.g. "Melbourne VIC" -> "in-melbourne-vic")."""
+    keyword_slug = keyword.strip().lower().replace(' ', '-')
+    location_slug = location.strip().lower().replace(' ', '-')
+    return f"{BASE_URL}/{keyword_slug}-jobs/in-{location_slug}"
+
+
+def search_page_url(search_url, page_number):
+    """URL of result page `page_number` (1-based) of a search."""
+    if page_number <= 1:
+        return search_url
+    separator = '&' if '?' in search_url else '?'
+    return f"{search_url}{separator}page={page_number}"
+
+
+def job_id_from_url(job_url):
+    """Numeric Seek job ID of a /job/<id> URL, or None."""
+    match = JOB_ID_RE.search(job_url)
+    return int(match.group(1)) if match else None
+
+
+def parse_search_results(html_content):
+    """Returns (job URLs in page order, whether a next page exists) for a search results page."""
+    with METRICS.span('parse', page='search'):
+        return _parse_search_results(html_content)
+
+
+def _parse_search_results(html_content):
+    # Only the job card subtrees are parsed
+    soup = make_soup(html_content, SEARCH_CARD_STRAINER)
+    links = []
+    for job_card in soup.find_all('article', attrs={'data-card-type': 'JobCard'}):
+        # Try finding the link within the h3 tag first (more specific)
+        link_element = job_card.find('h3', {'data-automation': 'job-title'})
+        if link_element:
+             link_element = link_element.find('a') # Get the 'a' tag inside h3
+        # Fallback selectors
+        if not link_element:
+             link_element = job_card.find('a', {'data-automation': 'jobTitle'})
+        if not link_element:
+             link_element = job_card.find('a', href=JOB_ID_RE) # General fallback
+
+        if link_element and link_element.has_attr('href'):
+            href = link_element['href']
+            if href.startswith('/job/'):
+                full_url = BASE_URL + href.split('?')[0] # Clean URL parameters
+                if full_url not in links: # Avoid duplicates
+                    links.append(full_url)
+    return links, NEXT_PAGE_MARKER in html_content
+
+
+def empty_job(job_url):
+    """A job record with every column set to '-'."""
+    details = {column: '-' for column in JOB_COLUMNS}
+    details["Job URL"] = job_url
+    return details
+
+
+def _html_to_text(fragment):
+    """Plain text of an HTML fragment, one block per line (same format as the DOM extractor)."""
+    if not fragment:
+        return '-'
+    text = make_soup(fragment).get_text(separator='\n', strip=True)
+    return text or '-'
+
+
+def _finish(details):
+    """Fills the placeholder and contact columns shared by both extractors."""
+    # Extract Responsibilities & Skills (Placeholder - requires better logic)
+    details["Key Responsibilities"] = "See Full Description"
+    details["Required Skills/Qualifications"] = "See Full Description"
+    if details["Full Job Description"] != '-':
+        with METRICS.span('contacts'):
+            details["Phone Number"], details["Email"] = extract_contact_info(details["Full Job Description"])
+    return details
+
+
+# --- Structured extractor (embedded JSON) ---
+
+def _load_json_at(html, match):
+    """Decodes the JSON value starting right after a regex match; None if it is not valid JSON."""
+    try:
+        value, _ = json.JSONDecoder().raw_decode(html, match.end())
+        return value
+    except ValueError:
+        return None
+
+
+def _label(value):
+    """Seek state stores most fields as {"label": ...}; accept plain strings too."""
+    if isinstance(value, dict):
+        value = value.get('label')
+    return value.strip() if isinstance(value, str) and value.strip() else '-'
+
+
+def _job_from_redux_state(html):
+    match = REDUX_STATE_RE.search(html)
+    if not match:
+        return None
+    state = _load_json_at(html, match)
+    try:
+        job = state['jobdetails']['result']['job']
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(job, dict) or not job.get('title'):
+        return None
+
+    listed_at = job.get('listedAt') or {}
+    return {
+        "Job Title": job['title'].strip(),
+        "Company Name": _label((job.get('advertiser') or {}).get('name')),
+        "Location": _label(job.get('location')),
+        "Salary/Pay Range": _label(job.get('salary')),
+        "Date Posted": (listed_at.get('dateTimeUtc') or '')[:10] or '-',
+        "Job Type": _label(job.get('workTypes')),
+        "Full Job Description": _html_to_text(job.get('content')),
+    }
+
+
+def _format_base_salary(base_salary):
+    """Formats a JSON-LD MonetaryAmount, e.g. 'AUD 90000-110000 per YEAR'."""
+    if not isinstance(base_salary, dict):
+        return '-'
+    value = base_salary.get('value')
+    if isinstance(value, dict):
+        low, high, unit = value.get('minValue'), value.get('maxValue'), value.get('unitText')
+        if low is not None and high is not None and low != high:
+            amount = f"{low}-{high}"
+        else:
+            amount = next((v for v in (low, high, value.get('value')) if v is not None), None)
+    else:
+        amount, unit = value, None
+    if amount is None:
+        return '-'
+    currency = base_salary.get('currency')
+    text = f"{currency} {amount}" if currency else str(amount)
+    return f"{text} per {unit}" if unit else text
+
+
+def _format_location(job_location):
+    if isinstance(job_location, list):
+        job_location = job_location[0] if job_location else None
+    address = (job_location or {}).get('address') if isinstance(job_location, dict) else None
+    if not isinstance(address, dict):
+        return '-'
+    parts = [address.get('addressLocality'), address.get('addressRegion')]
+    return ', '.join(p for p in parts if p) or '-'
+
+
+def _job_from_json_ld(html):
+    for match in JSON_LD_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        candidates = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for item in candidates:
+            if not isinstance(item, dict) or item.get('@type') != 'JobPosting' or not item.get('title'):
+                continue
+            employment_type = item.get('employmentType')
+            if isinstance(employment_type, list):
+                employment_type = ', '.join(employment_type)
+            return {
+                "Job Title": item['title'].strip(),
+                "Company Name": _label((item.get('hiringOrganization') or {}).get('name')),
+                "Location": _format_location(item.get('jobLocation')),
+                "Salary/Pay Range": _format_base_salary(item.get('baseSalary')),
+                "Date Posted": (item.get('datePosted') or '')[:10] or '-',
+                "Job Type": employment_type.replace('_', ' ').capitalize() if employment_type else '-',
+                "Full Job Description": _html_to_text(item.get('description')),
+            }
+    return None
+
+
+def extract_job_from_json(html, job_url):
+    """Builds the job record from the page's embedded JSON, or returns None if there is none."""
+    fields = _job_from_redux_state(html)
+    extractor = 'redux_state'
+    if fields is None:
+        fields = _job_from_json_ld(html)
+        extractor = 'json_ld'
+    if fields is None:
+        return None
+    METRICS.count('extractor_used', extractor=extractor)
+    details = empty_job(job_url)
+    details.update(fields)
+    return _finish(details)
+
+
+# --- DOM extractor (selector chain fallback) ---
+
+def extract_job_from_dom(html_content, job_url):
+    """Builds the job record by walking the DOM with Seek's data-automation selectors and fallbacks.
+
+    The page is first parsed only for the job header and jobAdDetails
+    regions; the whole document is parsed only if the title or description
+    is not found there and the class-name fallbacks are needed.
+    """
+    matched = {}
+    details = _extract_from_soup(make_soup(html_content, DETAIL_REGION_STRAINER), job_url, matched)
+    scope = 'regions'
+    if details["Job Title"] == '-' or details["Full Job Description"] == '-':
+        matched = {}
+        details = _extract_from_soup(make_soup(html_content), job_url, matched)
+        scope = 'document'
+    METRICS.count('extractor_used', extractor='dom', scope=scope)
+    for field, selector in matched.items():
+        METRICS.count('selector_matches', field=field, selector=selector)
+    return _finish(details)
+
+
+def _extract_from_soup(soup, job_url, matched):
+    """DOM extraction; `matched` records per field which selector found it ('primary', 'fallback...' or 'missing')."""
+    details = empty_job(job_url)
+
+    # --- Extract data using BeautifulSoup ---
+    # Selectors need careful inspection and adjustment based on Seek's current HTML structure
+
+    # Title
+    title = soup.find('h1', {'data-automation': 'job-detail-title'})
+    matched['title'] = 'primary'
+    if not title: # Fallback selector
+         title = soup.find('h1', class_=lambda x: x and 'JobTitle' in x)
+         matched['title'] = 'fallback' if title else 'missing'
+    details["Job Title"] = title.text.strip() if title else '-'
+
+    # Company
+    company = soup.find('span', {'data-automation': 'advertiser-name'})
+    matched['company'] = 'primary'
+    if not company: # Fallback using link
+         company = soup.find('a', {'data-automation': 'job-header-company-name'})
+         matched['company'] = 'fallback_link'
+    if not company: # Generic fallback
+         company = soup.find('span', class_=lambda x: x and 'AdvertiserName' in x)
+         matched['company'] = 'fallback_class' if company else 'missing'
+    details["Company Name"] = company.text.strip() if company else '-'
+
+    # Location
+    location_element = soup.find('span', {'data-automation': 'job-detail-location'})
+    location_text = location_element.text.strip() if location_element else '-'
+    matched['location'] = 'primary'
+    if location_text == '-': # Fallback using strong tag heuristic
+        matched['location'] = 'fallback_strong'
+        for tag in soup.find_all('strong'):
+             parent_div = tag.find_parent('div')
+             if parent_div and 'Location' in parent_div.text:
+                 location_text = tag.text.strip()
+                 break
+    if location_text == '-': # Generic fallback
+         matched['location'] = 'missing'
+         loc_span = soup.find('span', class_=lambda x: x and 'Location' in x)
+         if loc_span:
+              # Often location is inside a link within this span
+              loc_link = loc_span.find('a')
+              location_text = loc_link.text.strip() if loc_link else loc_span.text.strip()
+              matched['location'] = 'fallback_class'
+    details["Location"] = location_text
+
+    # Salary
+    salary = soup.find('span', {'data-automation': 'job-detail-salary'})
+    matched['salary'] = 'primary'
+    if not salary: # Generic fallback
+         salary = soup.find('span', class_=lambda x: x and 'Salary' in x)
+         matched['salary'] = 'fallback' if salary else 'missing'
+    details["Salary/Pay Range"] = salary.text.strip() if salary else '-'
+
+    # Job Type: work type if present, otherwise the classification
+    job_type_element = soup.find('span', {'data-automation': 'job-detail-work-type'})
+    matched['job_type'] = 'primary'
+    if not job_type_element:
+        job_type_element = soup.find('span', {'data-automation': 'job-detail-classifications'})
+        matched['job_type'] = 'fallback_classification'
+    job_type_text = job_type_element.text.strip() if job_type_element else '-'
+    if job_type_text == '-': # Text heuristic (needs the full document)
+        matched['job_type'] = 'missing'
+        classification_div = soup.find('div', string=lambda t: t and 'Classification' in t)
+        if classification_div:
+             # Find the actual classification text, often in a following sibling or child span/strong tag
+             details_span = classification_div.find_next_sibling('span')
+             if details_span:
+                  job_type_text = details_span.text.strip()
+                  matched['job_type'] = 'fallback_text'
+             else: # Try finding within strong tags if no direct span sibling
+                  strong_tag = classification_div.find_next('strong')
+                  if strong_tag:
+                       job_type_text = strong_tag.text.strip()
+                       matched['job_type'] = 'fallback_text'
+    details["Job Type"] = job_type_text
+
+    # Date Posted
+    date_posted_element = soup.find('span', {'data-automation': 'job-detail-date'})
+    matched['date_posted'] = 'primary'
+    if not date_posted_element: # Generic fallback
+         date_posted_element = soup.find('span', class_=lambda x: x and 'ListedDate' in x)
+         matched['date_posted'] = 'fallback' if date_posted_element else 'missing'
+    details["Date Posted"] = date_posted_element.text.strip() if date_posted_element else '-'
+
+    # Full description
+    description_div = soup.find('div', {'data-automation': 'jobAdDetails'})
+    matched['description'] = 'primary'
+    if not description_div: # Fallback
+         description_div = soup.find('div', class_=lambda x: x and 'job-description' in x)
+         matched['description'] = 'fallback' if description_div else 'missing'
+    details["Full Job Description"] = description_div.get_text(separator='\n', strip=True) if description_div else '-'
+
+    return details
+
+
+def parse_job_details(html_content, job_url):
+    """Returns the job record (dict keyed by JOB_COLUMNS) for a Seek job detail page.
+
+    The embedded JSON state is tried first since it is a single parse; the
+    DOM selector chain is used when the page carries no usable JSON.
+    """
+    with METRICS.span('parse', page='job'):
+        return extract_job_from_json(html_content, job_url) or extract_job_from_dom(html_content, job_url)
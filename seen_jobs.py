@@ -0,0 +1,66 @@
+# seen_jobs.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from seek_parser import JOB_COLUMNS
+
+DEFAULT_INDEX_PATH = 'seen_jobs.sqlite3'
+DEFAULT_MAX_AGE = 24 * 60 * 60  # A job scraped within this many seconds is not fetched again
+
+# Columns that identify a posting's content (URL and placeholders excluded)
+HASHED_COLUMNS = [c for c in JOB_COLUMNS if c not in ("Job URL", "Key Responsibilities", "Required Skills/Qualifications")]
+
+
+def content_hash(details):
+    """Stable hash of a job record's content, used to tell changed postings from unchanged ones."""
+    payload = json.dumps([details.get(column, '-') for column in HASHED_COLUMNS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class SeenJobsIndex:
+    """Persistent index of scraped Seek job IDs: job ID -> (last scraped time, content hash)."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_id INTEGER PRIMARY KEY,
+                last_scraped REAL NOT NULL,
+                content_hash TEXT NOT NULL
+            )''')
+        self._conn.commit()
+
+    def fresh_ids(self, job_ids, max_age=DEFAULT_MAX_AGE):
+        """The subset of `job_ids` scraped less than `max_age` seconds ago."""
+        job_ids = [job_id for job_id in job_ids if job_id is not None]
+        if not job_ids:
+            return set()
+        cutoff = time.time() - max_age
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT job_id FROM seen_jobs WHERE last_scraped >= ? AND job_id IN ({placeholders})',
+                [cutoff, *job_ids]).fetchall()
+        return {row[0] for row in rows}
+
+    def record(self, job_id, details):
+        """Marks `job_id` as scraped now. Returns 'new', 'changed' or 'unchanged'."""
+        digest = content_hash(details)
+        with self._lock:
+            row = self._conn.execute('SELECT content_hash FROM seen_jobs WHERE job_id = ?', (job_id,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO seen_jobs (job_id, last_scraped, content_hash) VALUES (?, ?, ?)',
+                (job_id, time.time(), digest))
+            self._conn.commit()
+        if row is None:
+            return 'new'
+        return 'unchanged' if row[0] == digest else 'changed'
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
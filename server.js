@@ -1,8 +1,31 @@
 const express = require('express');
-const { exec } = require('child_process');
+const { exec, spawn } = require('child_process');
 const app = express();
 const port = 3000;
 const path = require('path'); // Import path module
+const http = require('http');
+
+// Optional resident scraping service (python scrape_service.py) that keeps browsers warm between requests
+const scrapeServiceUrl = process.env.SCRAPE_SERVICE_URL; // e.g. http://127.0.0.1:5001
+const scrapeServiceTimeoutMs = 10 * 60 * 1000;
+
+// Forwards a scrape to the resident service; resolves with { status, body } or rejects if it is unreachable
+function scrapeViaService(jobTitle, location, numJobs) {
+    const url = new URL('/scrape', scrapeServiceUrl);
+    url.searchParams.set('jobTitle', jobTitle);
+    url.searchParams.set('location', location);
+    url.searchParams.set('numJobs', numJobs);
+    return new Promise((resolve, reject) => {
+        const request = http.get(url, { timeout: scrapeServiceTimeoutMs }, (response) => {
+            let body = '';
+            response.setEncoding('utf8');
+            response.on('data', (chunk) => { body += chunk; });
+            response.on('end', () => resolve({ status: response.statusCode, body }));
+        });
+        request.on('timeout', () => request.destroy(new Error('Scrape service timed out')));
+        request.on('error', reject);
+    });
+}
 
 // Serve static files from the current directory
 app.use(express.static(__dirname));
@@ -25,6 +48,19 @@ app.get('/scrape', async (req, res) => {
     }
     console.log(`Server: Received request - title: ${jobTitle}, location: ${location}, number: ${numJobs}`);
 
+    if (scrapeServiceUrl) {
+        try {
+            const { status, body } = await scrapeViaService(jobTitle, location, numJobs);
+            console.log(`Server: Scrape service responded with status ${status}, length ${body.length}`);
+            const jsonData = JSON.parse(body);
+            const failed = status !== 200 || (jsonData && jsonData.error);
+            return res.status(failed ? (status !== 200 ? status : 500) : 200).json(jsonData);
+        } catch (serviceError) {
+            // Service down or returned garbage: fall back to a one-off Python process
+            console.error(`Server: Scrape service unavailable (${serviceError.message}); spawning Python instead.`);
+        }
+    }
+
     try {
         // IMPORTANT: Use the correct python interpreter if needed (e.g., from Anaconda)
         // const pythonExecutable = '/Users/umairsaeed/anaconda3/bin/python3'; // Example
@@ -90,6 +126,73 @@ app.get('/scrape', async (req, res) => {
     }
 });
 
+// Streaming variant of /scrape: Server-Sent Events, one 'job' event per job as soon as it is scraped
+app.get('/scrape/stream', (req, res) => {
+    const jobTitle = req.query.jobTitle;
+    const location = req.query.location;
+    const numJobs = req.query.numJobs;
+
+    if (!jobTitle || !location || !numJobs) {
+        console.error('Server: Missing parameters:', { jobTitle, location, numJobs });
+        return res.status(400).json({ error: 'Missing job title, location, or number of jobs parameter' });
+    }
+    console.log(`Server: Received streaming request - title: ${jobTitle}, location: ${location}, number: ${numJobs}`);
+
+    res.writeHead(200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no',
+    });
+    const sendEvent = (event, data) => res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+
+    // Arguments are passed without a shell, so titles with quotes cannot break the command
+    const pythonExecutable = 'python';
+    const scriptPath = path.join(__dirname, 'scrape_omayzi.py');
+    const child = spawn(pythonExecutable, ['-u', scriptPath, jobTitle, location, numJobs, '--ndjson']);
+    let finished = false;
+    let pending = '';
+
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', (chunk) => {
+        // Forward each complete NDJSON line; keep a partial trailing line for the next chunk
+        pending += chunk;
+        const lines = pending.split('\n');
+        pending = lines.pop();
+        for (const line of lines) {
+            if (!line.trim()) continue;
+            let message;
+            try {
+                message = JSON.parse(line);
+            } catch (parseError) {
+                console.error(`Server: Ignoring non-JSON line from Python: ${line}`);
+                continue;
+            }
+            if (message.type === 'job') {
+                sendEvent('job', message.job);
+            } else {
+                finished = true;
+                sendEvent(message.type === 'error' ? 'scrape-error' : 'done', message);
+            }
+        }
+    });
+    child.stderr.setEncoding('utf8');
+    child.stderr.on('data', (chunk) => process.stderr.write(chunk));
+    child.on('close', (code) => {
+        if (!finished) {
+            sendEvent('scrape-error', { error: `Python script exited with code ${code}` });
+        }
+        res.end();
+    });
+    child.on('error', (error) => {
+        console.error(`Server: Error starting Python: ${error.message}`);
+    });
+    // Stop scraping if the browser goes away
+    req.on('close', () => {
+        if (child.exitCode === null) child.kill();
+    });
+});
+
 app.listen(port, () => {
     console.log(`Server listening at http://localhost:${port}`);
     console.log(`Serving static files from: ${__dirname}`);
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+import pytest
+
+from browser_pool import PlaywrightPool
+
+
+class FakeBrowser:
+    def __init__(self, number):
+        self.number = number
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+def make_pool(size=2, max_pages=10, checkout_timeout=None):
+    launched = []
+
+    async def launch(playwright):
+        launched.append(FakeBrowser(len(launched)))
+        return launched[-1]
+
+    pool = PlaywrightPool(launch, size, max_pages, checkout_timeout)
+    pool._playwright = FakePlaywright()  # Tests never start the real driver
+    return pool, launched
+
+
+async def browser_number(lease):
+    return lease.browser.number
+
+
+def test_runs_reuse_a_warm_browser():
+    pool, launched = make_pool()
+    try:
+        pool.warm()
+        assert len(launched) == 2
+        assert [pool.run(browser_number) for _ in range(3)] == [1, 1, 1]
+        assert pool.stats()['created'] == 2 and pool.stats()['checkouts'] == 3
+    finally:
+        pool.close()
+    assert all(browser.closed for browser in launched)
+
+
+def test_worn_out_and_disconnected_browsers_are_recycled():
+    pool, launched = make_pool(size=1, max_pages=5)
+    try:
+        async def heavy(lease):
+            lease.pages += 5
+            return lease.browser.number
+
+        assert pool.run(heavy) == 0
+        assert launched[0].closed
+        assert pool.run(browser_number) == 1
+        launched[1].connected = False
+        assert pool.run(browser_number) == 2
+        assert pool.stats()['recycled'] == 2
+    finally:
+        pool.close()
+
+
+def test_checkout_waits_for_a_free_browser_and_times_out():
+    pool, launched = make_pool(size=1, checkout_timeout=0.1)
+    started = threading.Event()
+    finish = threading.Event()
+
+    async def hold(lease):
+        started.set()
+        while not finish.is_set():
+            await asyncio.sleep(0.01)
+        return lease.browser.number
+
+    holder = threading.Thread(target=pool.run, args=(hold,))
+    holder.start()
+    try:
+        started.wait(5)
+        with pytest.raises(TimeoutError):
+            pool.run(browser_number)
+        finish.set()
+        holder.join(5)
+        assert pool.run(browser_number) == 0
+        assert len(launched) == 1
+    finally:
+        finish.set()
+        pool.close()
+
+
+def test_failed_launch_frees_the_slot():
+    async def launch(playwright):
+        return None
+
+    pool = PlaywrightPool(launch, size=1, checkout_timeout=0.1)
+    pool._playwright = FakePlaywright()
+    try:
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                pool.run(browser_number)
+    finally:
+        pool.close()
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from checkpoint import RunCheckpoint
+
+JOB_HTML = ("<html><h1 data-automation='job-detail-title'>Dev {n}</h1>"
+            "<div data-automation='jobAdDetails'>x</div></html>")
+JOBS_PER_PAGE = 4
+LAST_PAGE = 5
+
+
+def job_url(n):
+    return f'https://www.seek.com.au/job/{n}'
+
+
+def page_of(url):
+    return int(url.split('page=')[1]) if 'page=' in url else 1
+
+
+def page_jobs(page):
+    return range((page - 1) * JOBS_PER_PAGE, page * JOBS_PER_PAGE)
+
+
+def job_html(url):
+    return JOB_HTML.format(n=int(url.rsplit('/', 1)[1]))
+
+
+def interrupted_run(base_dir):
+    """A run killed on search page 2: jobs 0-2 delivered, job 3 finished without output, 4 and 5 pending."""
+    checkpoint = RunCheckpoint.create({'jobTitle': 'dev'}, base_dir=str(base_dir))
+    checkpoint.add_pending([job_url(n) for n in range(4)], 2)
+    for n in range(3):
+        checkpoint.record_job(job_url(n), {'Job Title': f'Dev {n}'})
+    checkpoint.record_job(job_url(3))
+    checkpoint.add_pending([job_url(4), job_url(5)], 2)
+    checkpoint.close()
+    return RunCheckpoint.resume(checkpoint.run_id, base_dir=str(base_dir))
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    monkeypatch.setenv('SEEK_CACHE_DISABLED', '1')
+    monkeypatch.setenv('SEEK_RETRY_PASS_DELAY', '0')
+
+
+def test_resume_and_journal_round_trip(tmp_path):
+    checkpoint = interrupted_run(tmp_path)
+    assert [job['Job Title'] for job in checkpoint.jobs] == ['Dev 0', 'Dev 1', 'Dev 2']
+    assert checkpoint.pending_urls() == [job_url(4), job_url(5)]
+    assert checkpoint.known_ids() == set(range(6))
+    assert checkpoint.next_page == 2 and not checkpoint.search_done
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    checkpoint = RunCheckpoint.create({}, base_dir=str(tmp_path))
+    checkpoint.record_job(job_url(1), {'Job Title': 'Dev 1'})
+    checkpoint.close()
+    with open(tmp_path / checkpoint.run_id / 'journal.ndjson', 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://www.seek.com.au/job/2", "jo')
+    resumed = RunCheckpoint.resume(checkpoint.run_id, base_dir=str(tmp_path))
+    assert resumed.known_ids() == {1}
+
+
+def test_scrape_seek_resume_delivers_the_limit(tmp_path, monkeypatch):
+    pytest.importorskip('playwright.async_api')
+    import scrape_seek
+
+    async def collect(context, url, semaphore, rate_limiter):
+        page = page_of(url)
+        return [job_url(n) for n in page_jobs(page)], page < LAST_PAGE
+
+    monkeypatch.setattr(scrape_seek, 'async_collect_job_links', collect)
+    monkeypatch.setattr(scrape_seek, 'fetch_job_html', lambda url, timeout=15, rate_limiter=None: job_html(url))
+    checkpoint = interrupted_run(tmp_path)
+    rows = asyncio.run(scrape_seek.async_crawl_search(None, 'https://www.seek.com.au/dev-jobs', 10,
+                                                      asyncio.Semaphore(2), None, checkpoint=checkpoint))
+    assert len(checkpoint.jobs) + len(rows) == 10
+    assert [row[-1] for row in rows] == [job_url(n) for n in range(4, 11)]
+
+
+def test_scrape_omayzi_resume_delivers_the_limit(tmp_path, monkeypatch):
+    pytest.importorskip('selenium')
+    pytest.importorskip('webdriver_manager')
+    import scrape_omayzi
+
+    def load_search_page(driver, url, prefetched_html=None, rate_limiter=None):
+        page = page_of(url)
+        cards = ''.join(f'<article data-card-type="JobCard"><a data-automation="jobTitle" href="/job/{n}">x</a>'
+                        f'</article>' for n in page_jobs(page))
+        next_link = '<a data-automation="page-next" aria-label="Next" href="?page=2">Next</a>' if page < LAST_PAGE else ''
+        return f'<html>{cards}{next_link}</html>'
+
+    monkeypatch.setattr(scrape_omayzi, 'get_driver', lambda blocker=None: type('Driver', (), {'quit': lambda self: None})())
+    monkeypatch.setattr(scrape_omayzi, 'get_job_store', lambda: None)
+    monkeypatch.setattr(scrape_omayzi, '_load_search_page', load_search_page)
+    monkeypatch.setattr(scrape_omayzi, 'fetch_search_html', lambda *args, **kwargs: None)
+    monkeypatch.setattr(scrape_omayzi, 'fetch_job_page_html', lambda driver, url, *args: job_html(url))
+    checkpoint = interrupted_run(tmp_path)
+    jobs = list(scrape_omayzi.iter_seek_jobs('dev', 'x', 10, block_resources=False, http_fast_path=False,
+                                             checkpoint=checkpoint))
+    assert len(jobs) == 10
+    assert [job['Job Title'] for job in jobs] == [f'Dev {n}' for n in (0, 1, 2, 4, 5, 6, 7, 8, 9, 10)]
+    assert checkpoint.finished
@@ -0,0 +1,52 @@
+import time
+
+from contact_extract import extract_contact_info, extract_contacts, normalize_au_phone
+
+
+def test_australian_numbers_are_normalised_to_e164():
+    assert normalize_au_phone('(03) 9123 4567') == '+61391234567'
+    assert normalize_au_phone('0412 345 678') == '+61412345678'
+    assert normalize_au_phone('+61 2 9876 5432') == '+61298765432'
+    assert normalize_au_phone('61 2 9876 5432') == '+61298765432'
+
+
+def test_national_and_international_forms():
+    assert normalize_au_phone('1300 123 456') == '1300123456'
+    assert normalize_au_phone('1800-123-456') == '1800123456'
+    assert normalize_au_phone('+44 20 7946 0958') == '+442079460958'
+    assert normalize_au_phone('13 12 34') is None  # Too short to tell from a salary or an ID
+    assert normalize_au_phone('1234567') is None
+
+
+def test_phones_and_emails_are_extracted_and_deduplicated():
+    text = ("Call Jo on (03) 9123 4567 or +61 3 9123 4567, fax 1300 123 456. "
+            "Email Jo.Smith@Example.com.au or jo.smith@example.com.au.")
+    assert extract_contacts(text) == (['+61391234567', '1300123456'], ['jo.smith@example.com.au'])
+    assert extract_contact_info(text) == ('+61391234567, 1300123456', 'jo.smith@example.com.au')
+    assert extract_contact_info('') == ('-', '-')
+
+
+def test_dates_salaries_and_references_are_not_phones():
+    text = "Starts 2024-01-15 (apply by 15/01/2024), $95,000 - $110,000, ref 4521, since 1999."
+    assert extract_contacts(text) == ([], [])
+
+
+def test_numbers_inside_emails_and_words_are_not_phones():
+    phones, emails = extract_contacts("Write to jobs0412345678@seek.com.au or ABC0412345678 now")
+    assert phones == []
+    assert emails == ['jobs0412345678@seek.com.au']
+
+
+def test_adversarial_input_scans_in_linear_time():
+    texts = [
+        '1 ' * 50000,
+        '1.' * 50000,
+        '(' * 50000 + '1' * 50000,
+        'a' * 100000 + '@',
+        'a.' * 50000 + '@example',
+        'x@' + 'a.' * 50000,
+    ]
+    for text in texts:
+        started = time.perf_counter()
+        extract_contacts(text)
+        assert time.perf_counter() - started < 2.0, text[:20]
@@ -0,0 +1,82 @@
+import pytest
+
+from job_store import JobStore, fts_query, is_error_record, job_record
+from seek_parser import JOB_COLUMNS
+
+
+def job(job_id, title, description='-', **fields):
+    details = {column: '-' for column in JOB_COLUMNS}
+    details.update({"Job Title": title, "Full Job Description": description,
+                    "Job URL": f'https://www.seek.com.au/job/{job_id}'})
+    details.update(fields)
+    return details
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_fts_query_quotes_punctuation():
+    assert fts_query('c++ developer') == '"c++" "developer"'
+    assert fts_query('AT&T .net') == '"AT&T" ".net"'
+
+
+def test_fts_query_phrases_prefixes_and_operators():
+    assert fts_query('"machine learning" engineer') == '"machine learning" "engineer"'
+    assert fts_query('data*') == '"data"*'
+    assert fts_query('python OR java') == '"python" OR "java"'
+    assert fts_query('java NOT') == '"java"'  # Dangling operators are dropped
+    assert fts_query('OR NOT') == ''
+    assert fts_query('***') == ''
+    assert fts_query('say "hi') == '"say" """hi"'
+
+
+def test_error_rows_are_recognised_in_both_formats():
+    assert is_error_record(job_record(job(1, "Error scraping details")))
+    assert is_error_record(job_record(job(1, '-', 'Error scraping: timeout')))
+    assert not is_error_record(job_record(job(1, 'Data Engineer')))
+
+
+def test_upserts_are_keyed_on_the_job_id(store):
+    assert store.upsert_jobs([job(1, 'Data Engineer', Location='Sydney'), job(2, 'Analyst')], 'Data') == 2
+    assert store.upsert_jobs([job(1, 'Senior Data Engineer')], 'data engineer') == 1
+    assert store.count() == 2
+    stored = {j["Job Title"]: j for j in store.query()}
+    assert stored['Senior Data Engineer']['Location'] == 'Sydney'  # '-' never overwrites a value
+    assert store.count(search_term='DATA') == 2
+    assert store.count(search_term='data engineer') == 1
+
+
+def test_cards_only_fill_gaps(store):
+    store.upsert_jobs([job(1, 'Data Engineer', 'Full description')])
+    card = {'title': 'Data Eng', 'company': 'Acme', 'description': 'Snippet', 'url': 'https://www.seek.com.au/job/1'}
+    store.upsert_jobs([card], overwrite=False)
+    [stored] = store.query()
+    assert (stored["Job Title"], stored["Company Name"], stored["Full Job Description"]) == (
+        'Data Engineer', 'Acme', 'Full description')
+
+
+def test_failed_and_unidentified_jobs_are_not_stored(store):
+    rows = [job(1, "Error scraping details"), job(2, 'Analyst')]
+    rows[1]["Job URL"] = 'https://example.com/not-a-job'
+    assert store.upsert_jobs(rows) == 0
+    assert store.count() == 0
+
+
+def test_search_ranks_title_matches_and_handles_punctuation(store):
+    store.upsert_jobs([
+        job(1, 'Office Manager', 'Uses C++ reports now and then'),
+        job(2, 'C++ Developer', 'Modern C++ and Python'),
+        job(3, 'Java Developer', 'Spring, machine learning pipelines'),
+    ])
+    total, results = store.search('c++')
+    assert total == 2
+    if store.fts_enabled:  # The substring fallback does not rank
+        assert [r["Job Title"] for r in results] == ['C++ Developer', 'Office Manager']
+    assert store.search('"machine learning"')[0] == 1
+    assert store.search('"learning machine"')[0] == 0
+    assert store.search('dev*')[0] == 2
+    assert store.search('OR')[0] == 0
@@ -0,0 +1,124 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from page_cache import (JOB_PAGE_TTL, SEARCH_PAGE_TTL, CacheEntry, PageCache, fetch_with_cache, is_fresh,
+                        normalize_url, ttl_for)
+
+JOB_URL = 'https://www.seek.com.au/job/12345'
+SEARCH_URL = 'https://www.seek.com.au/data-jobs?page=2'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / 'cache.sqlite3'))
+    yield cache
+    cache.close()
+
+
+class FakeSession:
+    """Answers every GET with `status` and `body`, recording the headers it was sent."""
+
+    def __init__(self, status=200, body='<html>new</html>', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.sent = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.sent.append(headers)
+        return SimpleNamespace(url=url, status_code=self.status, text=self.body, headers=self.headers)
+
+
+def test_normalize_url_drops_tracking_params_fragments_and_case():
+    assert (normalize_url('HTTPS://WWW.Seek.com.au/data-jobs/?page=2&utm_source=x&classification=6281#top')
+            == 'https://www.seek.com.au/data-jobs?classification=6281&page=2')
+    assert normalize_url('https://www.seek.com.au/data-jobs?b=2&a=1') == normalize_url(
+        'https://www.seek.com.au/data-jobs?a=1&b=2')
+
+
+def test_job_pages_are_keyed_on_their_path():
+    assert normalize_url(JOB_URL + '?type=standout&ref=search-standalone') == JOB_URL
+    assert ttl_for(JOB_URL) == JOB_PAGE_TTL
+    assert ttl_for(SEARCH_URL) == SEARCH_PAGE_TTL
+
+
+def test_freshness_follows_the_ttl():
+    entry = CacheEntry(JOB_URL, 'x', None, None, fetched_at=1000.0, ttl=60)
+    assert is_fresh(entry, now=1059.0)
+    assert not is_fresh(entry, now=1060.0)
+
+
+def test_put_and_get_round_trip_with_validators(cache):
+    cache.put(JOB_URL + '?ref=x', '<html>ü</html>', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    entry = cache.get(JOB_URL)
+    assert entry.body == '<html>ü</html>'
+    assert (entry.etag, entry.last_modified) == ('"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT')
+    assert cache.get_fresh(JOB_URL) == '<html>ü</html>'
+    assert cache.get_fresh(SEARCH_URL) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fresh_hit_skips_the_network(cache):
+    cache.put(JOB_URL, 'cached')
+    session = FakeSession()
+    response = fetch_with_cache(session, JOB_URL, cache)
+    assert (response.text, response.from_cache) == ('cached', True)
+    assert session.sent == []
+
+
+def test_stale_entry_is_revalidated_and_304_restarts_its_ttl(cache):
+    cache.put(JOB_URL, 'cached', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT', ttl=0.001)
+    time.sleep(0.01)
+    session = FakeSession(status=304, body='')
+    response = fetch_with_cache(session, JOB_URL, cache)
+    assert (response.text, response.from_cache) == ('cached', True)
+    assert session.sent == [{'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}]
+    assert cache.revalidated == 1
+    assert cache.get(JOB_URL).fetched_at > time.time() - 1
+
+
+def test_revalidate_sends_a_conditional_request_for_fresh_entries(cache):
+    cache.put(JOB_URL, 'cached', etag='"v1"')
+    session = FakeSession(status=200, body='changed', headers={'ETag': '"v2"'})
+    response = fetch_with_cache(session, JOB_URL, cache, revalidate=True)
+    assert (response.text, response.from_cache) == ('changed', False)
+    assert session.sent == [{'If-None-Match': '"v1"'}]
+    assert cache.get(JOB_URL).etag == '"v2"'
+
+
+def test_unparseable_responses_are_not_stored(cache):
+    session = FakeSession(body='<html>captcha</html>')
+    fetch_with_cache(session, SEARCH_URL, cache, should_store=lambda html: 'captcha' not in html)
+    assert cache.get(SEARCH_URL) is None
+    fetch_with_cache(FakeSession(status=503), JOB_URL, cache)
+    assert cache.get(JOB_URL) is None
+
+
+def test_least_recently_used_pages_are_evicted_first(tmp_path):
+    cache = PageCache(str(tmp_path / 'small.sqlite3'))
+    urls = [f'https://www.seek.com.au/job/{n}' for n in range(5)]
+    for url in urls:
+        cache.put(url, url * 50)
+        time.sleep(0.002)
+    cache.get(urls[0])  # Now the most recently used
+    cache.max_bytes = cache.stats()['bytes'] - 1
+    cache.put(urls[4], urls[4] * 50)  # Over budget: evicts down to 90%
+    assert cache.get(urls[0]) is not None
+    assert cache.get(urls[1]) is None
+    assert cache.stats()['evictions'] >= 1
+    assert cache.stats()['bytes'] <= cache.max_bytes * 0.9
+    cache.close()
+
+
+def test_size_accounting_survives_a_reopen(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = PageCache(path)
+    cache.put(JOB_URL, 'a' * 1000)
+    cache.put(JOB_URL, 'b' * 2000)  # Replacing a page does not count it twice
+    size = cache.stats()['bytes']
+    cache.close()
+    reopened = PageCache(path)
+    assert reopened.stats()['bytes'] == size
+    reopened.close()
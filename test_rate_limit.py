@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from rate_limit import HostRateLimiter, TokenBucket
+
+
+def test_bucket_allows_a_burst_then_hands_out_consecutive_slots():
+    bucket = TokenBucket(rate=10, capacity=2)
+    delays = [bucket.acquire() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.acquire()
+    time.sleep(0.02)
+    assert bucket.acquire() == 0.0
+
+
+def test_bucket_rejects_a_zero_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_hosts_are_throttled_independently():
+    limiter = HostRateLimiter(rate=1, burst=1)
+    assert limiter._reserve('https://www.seek.com.au/job/1') == 0.0
+    assert limiter._reserve('https://example.com/') == 0.0
+    assert limiter._reserve('https://www.seek.com.au/job/2') > 0.5
+
+
+def test_wait_async_spaces_out_requests():
+    limiter = HostRateLimiter(rate=50, burst=1)
+
+    async def three_requests():
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.wait_async('https://www.seek.com.au/')
+        return time.monotonic() - started
+
+    assert asyncio.run(three_requests()) >= 0.035
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv('SEEK_RATE_LIMIT', '2.5')
+    monkeypatch.setenv('SEEK_RATE_BURST', '4')
+    limiter = HostRateLimiter.from_env()
+    assert (limiter.rate, limiter.burst) == (2.5, 4)
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from readiness import JOB_DETAIL_READY_SELECTORS, wait_for_job_detail_async
+
+
+class FakePage:
+    """Records the timeouts it is given; each selector wait takes `delay` seconds or fails."""
+
+    def __init__(self, delay=0.0, missing=()):
+        self.delay = delay
+        self.missing = set(missing)
+        self.selector_timeouts = []
+        self.load_states = []
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        self.selector_timeouts.append(timeout)
+        if selector in self.missing:
+            raise TimeoutError(selector)
+        time.sleep(self.delay)
+
+    async def wait_for_load_state(self, state, timeout=None):
+        self.load_states.append((state, timeout))
+
+
+def test_ready_page_waits_for_every_selector_then_idle():
+    page = FakePage()
+    assert asyncio.run(wait_for_job_detail_async(page, timeout_ms=1000, idle_cap_ms=200)) is True
+    assert len(page.selector_timeouts) == len(JOB_DETAIL_READY_SELECTORS)
+    assert all(0 < timeout <= 1000 for timeout in page.selector_timeouts)
+    assert page.load_states == [('networkidle', 200)]
+
+
+def test_missing_selector_returns_false():
+    page = FakePage(missing=[JOB_DETAIL_READY_SELECTORS[0]])
+    assert asyncio.run(wait_for_job_detail_async(page, timeout_ms=1000)) is False
+    assert page.load_states == []
+
+
+def test_exhausted_budget_never_passes_zero_timeout():
+    # The first wait uses up the whole budget; Playwright would read timeout=0 as "no timeout"
+    page = FakePage(delay=0.05)
+    assert asyncio.run(wait_for_job_detail_async(page, timeout_ms=10)) is False
+    assert page.selector_timeouts and all(timeout > 0 for timeout in page.selector_timeouts)
+    assert len(page.selector_timeouts) == 1
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from resilience import (CHALLENGE, CLIENT_ERROR, RATE_LIMITED, SERVER_ERROR, CircuitBreaker, RetryPolicy,
+                        ScrapeError, backoff_delay, check_response, classify_status, is_challenge_page,
+                        parse_retry_after)
+
+URL = 'https://www.seek.com.au/job/1'
+
+
+def open_and_cool_down(breaker):
+    """Opens URL's circuit with failures in a row and lets its cooldown pass."""
+    for _ in range(breaker.failure_threshold):
+        assert breaker.try_acquire(URL) == 0
+        breaker.release(URL, SERVER_ERROR)
+    assert state(breaker) == 'open'
+    breaker._hosts['www.seek.com.au'].open_until = 0
+
+
+def open_then_half_open(breaker):
+    """Opens URL's circuit and takes the probe slot once the cooldown has passed."""
+    open_and_cool_down(breaker)
+    assert breaker.try_acquire(URL) == 0
+    assert state(breaker) == 'half_open'
+
+
+def state(breaker):
+    return breaker.stats()['www.seek.com.au']['state']
+
+
+def test_classify_status():
+    assert classify_status(200) is None
+    assert classify_status(429) == RATE_LIMITED
+    assert classify_status(403) == CHALLENGE
+    assert classify_status(503) == SERVER_ERROR
+    assert classify_status(404) == CLIENT_ERROR
+
+
+def test_challenge_detection_ignores_search_terms():
+    assert not is_challenge_page('https://www.seek.com.au/challenge-coach-jobs', '<html>Access Denied</html>')
+    assert is_challenge_page('https://geo.captcha-delivery.com/captcha/', '')
+    assert is_challenge_page('https://www.seek.com.au/cdn-cgi/challenge-platform/h/b', '')
+    assert is_challenge_page(URL, '<div id="px-captcha"></div>')
+    with pytest.raises(ScrapeError) as info:
+        check_response(URL, 429, '', retry_after='7')
+    assert info.value.kind == RATE_LIMITED and info.value.retry_after == 7
+
+
+def test_retry_after_and_backoff():
+    assert parse_retry_after('12') == 12
+    assert parse_retry_after('soon') is None
+    assert all(0 <= backoff_delay(attempt, base=1, cap=4) <= 4 for attempt in range(10))
+    assert backoff_delay(0, base=1, cap=30, retry_after=20) >= 20
+
+
+def test_limit_caps_requests_in_flight():
+    breaker = CircuitBreaker(max_concurrency=2)
+    assert breaker.try_acquire(URL) == 0
+    assert breaker.try_acquire(URL) == 0
+    assert breaker.try_acquire(URL) > 0
+    breaker.release(URL)
+    assert breaker.try_acquire(URL) == 0
+
+
+def test_consecutive_failures_open_the_circuit_and_client_errors_do_not():
+    breaker = CircuitBreaker(failure_threshold=3)
+    for _ in range(10):
+        breaker.try_acquire(URL)
+        breaker.release(URL, CLIENT_ERROR)
+    assert state(breaker) == 'closed'
+    open_then_half_open(breaker)
+    breaker.release(URL)
+    assert state(breaker) == 'closed'
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=2)
+    open_then_half_open(breaker)
+    assert breaker.try_acquire(URL) > 0  # One probe at a time
+    breaker.release(URL, SERVER_ERROR)
+    assert state(breaker) == 'open'
+
+
+def test_block_halves_the_limit_and_successes_grow_it_back():
+    breaker = CircuitBreaker(max_concurrency=8)
+    breaker.try_acquire(URL)
+    breaker.release(URL, RATE_LIMITED, retry_after=0)
+    assert breaker.limit(URL) == 4 and state(breaker) == 'open'
+    breaker._hosts['www.seek.com.au'].open_until = 0
+    for _ in range(4):
+        assert breaker.try_acquire(URL) == 0
+        breaker.release(URL)
+    assert state(breaker) == 'closed' and breaker.limit(URL) == 5
+
+
+def test_unreported_failure_is_neutral_for_a_half_open_circuit():
+    breaker = CircuitBreaker(max_concurrency=4, failure_threshold=2)
+    open_then_half_open(breaker)
+    breaker.release(URL, CHALLENGE, reported=False)
+    assert state(breaker) == 'half_open'
+    assert breaker.stats()['www.seek.com.au']['in_flight'] == 0
+    assert breaker._hosts['www.seek.com.au'].successes == 0
+    assert breaker.try_acquire(URL) == 0  # The next probe may go
+
+
+def test_unreported_failure_does_not_reset_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.try_acquire(URL)
+    breaker.release(URL, SERVER_ERROR)
+    breaker.try_acquire(URL)
+    breaker.release(URL, CHALLENGE, reported=False)
+    breaker.try_acquire(URL)
+    breaker.release(URL, SERVER_ERROR)
+    assert state(breaker) == 'open'
+
+
+def test_retry_policy_retries_retryable_kinds_then_raises():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ScrapeError(SERVER_ERROR, URL)
+        return 'ok'
+
+    assert RetryPolicy(max_attempts=3, base_delay=0).call(URL, flaky) == 'ok'
+    calls.clear()
+    with pytest.raises(ScrapeError):
+        RetryPolicy(max_attempts=2, base_delay=0).call(URL, flaky)
+    assert len(calls) == 2
+
+
+def test_retry_policy_raises_client_errors_and_other_exceptions_at_once():
+    policy = RetryPolicy(max_attempts=5, base_delay=0)
+    calls = []
+
+    def not_found():
+        calls.append(1)
+        raise ScrapeError(CLIENT_ERROR, URL)
+
+    with pytest.raises(ScrapeError):
+        policy.call(URL, not_found)
+    with pytest.raises(KeyError):
+        policy.call(URL, lambda: {}['x'])
+    assert len(calls) == 1
+
+
+def test_unreported_challenge_probe_does_not_close_the_circuit():
+    breaker = CircuitBreaker(max_concurrency=4, failure_threshold=2)
+    open_and_cool_down(breaker)
+    policy = RetryPolicy(max_attempts=1, breaker=breaker, retry_on=(), unreported={CHALLENGE})
+
+    def challenged():
+        raise ScrapeError(CHALLENGE, URL)
+
+    async def challenged_async():
+        challenged()
+
+    with pytest.raises(ScrapeError):
+        asyncio.run(policy.call_async(URL, challenged_async))
+    with pytest.raises(ScrapeError):
+        policy.call(URL, challenged)
+    assert state(breaker) == 'half_open' and breaker.limit(URL) == 4
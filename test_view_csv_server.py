@@ -0,0 +1,52 @@
+import csv
+import io
+
+from view_csv_server import CsvRowIndex
+
+ROWS = [
+    ['Job Title', 'Description', 'Job URL'],
+    ['Data Engineer', 'Line one\nline two', 'https://www.seek.com.au/job/1'],
+    ['Analyst', 'Says ""hi"" and, commas', 'https://www.seek.com.au/job/2'],
+    ['Développeur', 'Ünïcode "quoted"\r\nacross lines', 'https://www.seek.com.au/job/3'],
+    ['Tester', '', 'https://www.seek.com.au/job/4'],
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def test_offsets_point_at_every_record(tmp_path):
+    path = write_csv(tmp_path / 'jobs.csv', ROWS)
+    index = CsvRowIndex(path)
+    assert index.header == ROWS[0]
+    assert index.row_count == len(ROWS) - 1
+    with open(path, 'rb') as f:
+        data = f.read()
+    for offset, row in zip(index.offsets, ROWS):
+        assert next(csv.reader(io.StringIO(data[offset:].decode('utf-8'), newline=''))) == row
+
+
+def test_rows_reads_any_page(tmp_path):
+    index = CsvRowIndex(write_csv(tmp_path / 'jobs.csv', ROWS))
+    assert index.rows(0, 100) == ROWS[1:]
+    assert index.rows(1, 3) == ROWS[2:4]
+    assert index.rows(3, 4) == ROWS[4:5]
+    assert index.rows(4, 10) == []
+
+
+def test_blank_lines_and_unterminated_quotes(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(b'a,b\r\n\r\n1,2\r\n3,"open\r\nquote')
+    index = CsvRowIndex(str(path))
+    assert index.row_count == 2
+    assert index.rows(0, 2) == [['1', '2'], ['3', 'open\r\nquote']]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_bytes(b'')
+    index = CsvRowIndex(str(path))
+    assert index.header is None and index.row_count == 0 and index.rows(0, 10) == []
@@ -1,103 +1,504 @@
 # view_csv_server.py
 import http.server
-import socketserver
+import argparse
+import array
 import csv
+import gzip
 import io
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
 import html # Import the html module for escaping
+from urllib.parse import parse_qs, urlencode, urlsplit
 
 PORT = 8000
 CSV_FILE = 'seek_ai_jobs_melbourne.csv'
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+ROWS_PER_CHUNK = 25 # Rows rendered per chunk of the streamed response
+PAGE_CACHE_ENTRIES = 64 # Rendered pages kept in memory (all encodings of a page count as one)
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 1000
+
+try:
+    import brotli # Optional: smaller responses for browsers that accept br
+except ImportError:
+    brotli = None
+
+class CsvRowIndex:
+    """Byte offset of every record in a CSV file, so any page of rows can be read with one seek.
+
+    Quoted fields may span lines: a record ends at the first line end where
+    the number of '"' bytes seen so far is even ('""' escapes count twice).
+    The quote byte never occurs inside a multi-byte UTF-8 sequence, so the
+    scan works on raw bytes without decoding.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.offsets = [] # Start of each record; the header is record 0
+        with open(path, 'rb') as f:
+            position = 0
+            record_start = 0
+            quotes = 0
+            for line in f:
+                quotes += line.count(b'"')
+                position += len(line)
+                if quotes % 2 == 0:
+                    if line.strip():
+                        self.offsets.append(record_start)
+                    record_start = position
+                    quotes = 0
+            if record_start < position: # Unterminated quote at EOF: keep what is there
+                self.offsets.append(record_start)
+        self.end = position
+        self.header = self._read_records(0, 1)[0] if self.offsets else None
+
+    @property
+    def row_count(self):
+        """Data rows (header excluded)."""
+        return max(0, len(self.offsets) - 1)
+
+    def _read_records(self, first, last):
+        """Parses records [first, last) by seeking straight to their bytes."""
+        if first >= last:
+            return []
+        start = self.offsets[first]
+        stop = self.offsets[last] if last < len(self.offsets) else self.end
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(stop - start).decode('utf-8', errors='replace')
+        return list(csv.reader(io.StringIO(chunk, newline='')))
+
+    def rows(self, start, stop):
+        """Data rows [start, stop), 0-based, without the header."""
+        stop = min(stop, self.row_count)
+        return self._read_records(start + 1, stop + 1)
+
+class ColumnarTable:
+    """The whole CSV held column by column for /api/rows filtering and sorting.
+
+    Each column is dictionary-encoded: `values[col]` holds each distinct
+    string once (interned) and `codes[col]` is an array of indexes into it,
+    one per row. Filters compare codes, sorts use a per-column row order
+    computed once and cached, so queries never re-parse the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        started = time.perf_counter()
+        with open(path, 'r', newline='', encoding='utf-8', errors='replace') as csvfile:
+            reader = csv.reader(csvfile)
+            self.header = next(reader, None) or []
+            self.values = [[] for _ in self.header]
+            self.codes = [array.array('I') for _ in self.header]
+            lookups = [{} for _ in self.header]
+            self.row_count = 0
+            for row in reader:
+                if len(row) != len(self.header):
+                    continue # Skip malformed rows, as the HTML view does
+                for col, cell in enumerate(row):
+                    code = lookups[col].get(cell)
+                    if code is None:
+                        code = len(self.values[col])
+                        lookups[col][cell] = code
+                        self.values[col].append(sys.intern(cell))
+                    self.codes[col].append(code)
+                self.row_count += 1
+        self.column_index = {name: col for col, name in enumerate(self.header)}
+        self._sort_orders = {}
+        self._lock = threading.Lock()
+        print(f"Loaded {self.row_count} rows x {len(self.header)} columns from {path} in {time.perf_counter() - started:.2f}s")
+
+    def sort_order(self, col):
+        """Row numbers ordered by column `col` (ties in file order), cached per column."""
+        with self._lock:
+            order = self._sort_orders.get(col)
+        if order is None:
+            # Rank the distinct values once, then sort rows by their value's rank
+            values = self.values[col]
+            rank = array.array('I', bytes(4 * len(values)))
+            for position, code in enumerate(sorted(range(len(values)), key=lambda c: values[c].casefold())):
+                rank[code] = position
+            codes = self.codes[col]
+            order = array.array('I', sorted(range(self.row_count), key=lambda row: rank[codes[row]]))
+            with self._lock:
+                self._sort_orders[col] = order
+        return order
+
+    def matching_codes(self, col, needle, substring=False):
+        """Codes of column `col` whose value equals (or contains) `needle`, case-insensitively."""
+        needle = needle.casefold()
+        if substring:
+            return {code for code, value in enumerate(self.values[col]) if needle in value.casefold()}
+        return {code for code, value in enumerate(self.values[col]) if value.casefold() == needle}
+
+    def query(self, filters=(), sort=None, descending=False, columns=None, offset=0, limit=API_DEFAULT_LIMIT):
+        """Returns (matching row count, rows as lists of the selected `columns`).
+
+        `filters` are (column, value, substring) tuples, all of which must match.
+        """
+        mask = None
+        for name, needle, substring in filters:
+            col = self.column_index[name]
+            wanted = self.matching_codes(col, needle, substring)
+            codes = self.codes[col]
+            if mask is None:
+                mask = bytearray(self.row_count)
+                for row, code in enumerate(codes):
+                    if code in wanted:
+                        mask[row] = 1
+            else:
+                for row in range(self.row_count):
+                    if mask[row] and codes[row] not in wanted:
+                        mask[row] = 0
+
+        rows = self.sort_order(self.column_index[sort]) if sort is not None else range(self.row_count)
+        if descending:
+            rows = rows[::-1]
+        if mask is not None:
+            rows = [row for row in rows if mask[row]]
+        total = len(rows)
+
+        selected = [self.column_index[name] for name in (columns or self.header)]
+        page = rows[offset:offset + limit]
+        return total, [[self.values[col][self.codes[col][row]] for col in selected] for row in page]
+
+_row_indexes = {}
+_row_indexes_lock = threading.Lock()
+_columnar_tables = {}
+_columnar_tables_lock = threading.Lock()
+
+def get_row_index(path):
+    """Returns the CsvRowIndex for `path`, rebuilding it only when the file's mtime or size changed."""
+    stat = os.stat(path)
+    with _row_indexes_lock:
+        index = _row_indexes.get(path)
+        if index is None or index.signature != (stat.st_mtime_ns, stat.st_size):
+            index = CsvRowIndex(path)
+            _row_indexes[path] = index
+    return index
+
+class RenderedPageCache:
+    """LRU cache of rendered pages, stored once per content encoding.
+
+    Keys include the CSV's mtime and size, so an edited file is simply a
+    cache miss; stale entries age out of the LRU.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> {encoding: bytes}
+        self._lock = threading.Lock()
+
+    def get(self, key, encoding):
+        """The page body in `encoding`, compressing the cached original on first use; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            body = entry.get(encoding)
+            identity = entry['identity']
+        if body is None:
+            body = encode_body(identity, encoding)
+            with self._lock:
+                entry[encoding] = body
+        return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = {'identity': body}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+page_cache = RenderedPageCache()
+
+def encode_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def choose_encoding(accept_encoding, allow_br=True):
+    """Best content encoding the client accepts: br (if brotli is installed), then gzip, else identity."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                pass
+        accepted[name.strip().lower()] = quality
+    if allow_br and brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return 'identity'
+
+def get_columnar_table(path):
+    """Returns the ColumnarTable for `path`, reloading it only when the file's mtime or size changed."""
+    stat = os.stat(path)
+    with _columnar_tables_lock:
+        table = _columnar_tables.get(path)
+        if table is None or table.signature != (stat.st_mtime_ns, stat.st_size):
+            table = ColumnarTable(path)
+            _columnar_tables[path] = table
+    return table
+
+def parse_filter(spec):
+    """'Company Name:Acme' (exact match) or 'Full Job Description~python' (contains) -> (column, value, substring)."""
+    colon, tilde = spec.find(':'), spec.find('~')
+    cut = min(i for i in (colon, tilde) if i != -1) if max(colon, tilde) != -1 else -1
+    if cut <= 0:
+        raise ValueError(f"Bad filter {spec!r}: expected 'Column:value' or 'Column~text'")
+    return spec[:cut].strip(), spec[cut + 1:], spec[cut] == '~'
+
+def _page_link(page, size, label):
+    return f"<a href=\"/?{urlencode({'page': page, 'size': size})}\">{label}</a>"
 
 class CSVRequestHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Needed for chunked transfer encoding
+    csv_file = CSV_FILE
+
+    def _write_chunk(self, data):
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
     def do_GET(self):
-        if self.path == '/':
+        url = urlsplit(self.path)
+        if url.path == '/':
+            query = parse_qs(url.query)
             try:
-                with open(CSV_FILE, 'r', newline='', encoding='utf-8') as csvfile:
-                    reader = csv.reader(csvfile)
-                    # Use io.StringIO to build the HTML string efficiently
-                    html_output = io.StringIO()
-                    html_output.write("<!DOCTYPE html>\n")
-                    html_output.write("<html>\n<head>\n<meta charset=\"UTF-8\">\n<title>Seek Job Data</title>\n")
-                    # Add some basic styling
-                    html_output.write("<style>\n")
-                    html_output.write("body { font-family: sans-serif; margin: 20px; }\n")
-                    html_output.write("table { border-collapse: collapse; width: 100%; table-layout: fixed; }\n") # Fixed layout helps with column width
-                    html_output.write("th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n")
-                    html_output.write("th { background-color: #f2f2f2; position: sticky; top: 0; z-index: 1; }\n") # Sticky header
-                    html_output.write("tr:nth-child(even) { background-color: #f9f9f9; }\n")
-                    # Adjust column widths as needed - Example: make description wider
-                    html_output.write("th:nth-child(1), td:nth-child(1) { width: 15%; }") # Job Title
-                    html_output.write("th:nth-child(2), td:nth-child(2) { width: 15%; }") # Company Name
-                    html_output.write("th:nth-child(3), td:nth-child(3) { width: 10%; }") # Location
-                    html_output.write("th:nth-child(11), td:nth-child(11) { width: 30%; }") # Full Job Description (adjust index if headers change)
-                    html_output.write("td { vertical-align: top; word-wrap: break-word; }") # Wrap long text
-                    html_output.write("pre { white-space: pre-wrap; word-wrap: break-word; margin: 0; font-family: inherit; }") # Preserve formatting in description
-                    html_output.write("\n</style>\n</head>\n<body>\n")
-                    html_output.write(f"<h1>Job Data from {CSV_FILE}</h1>\n")
-                    html_output.write("<div style='overflow-x: auto;'>\n") # Add horizontal scroll if needed
-                    html_output.write("<table>\n")
-
-                    # Read header row
-                    try:
-                        header = next(reader)
-                        html_output.write("<thead><tr>")
-                        for col_name in header:
-                            # Escape header content to prevent HTML injection
-                            html_output.write(f"<th>{html.escape(col_name)}</th>")
-                        html_output.write("</tr></thead>\n")
-                        description_col_index = header.index("Full Job Description") if "Full Job Description" in header else -1
-
-                    except StopIteration:
-                        self.send_error(500, f"Error: CSV file '{CSV_FILE}' appears to be empty or has no header.")
-                        return
-
-
-                    # Read data rows
-                    html_output.write("<tbody>\n")
-                    for row_num, row in enumerate(reader):
-                         # Ensure row has the same number of columns as header
-                         if len(row) != len(header):
-                              print(f"Warning: Skipping row {row_num + 2} due to mismatched column count ({len(row)} columns, expected {len(header)}). Row data: {row}")
-                              continue # Skip malformed rows
-
-                         html_output.write("<tr>")
-                         for i, cell in enumerate(row):
-                             # Escape cell content to prevent HTML injection
-                             escaped_cell = html.escape(cell)
-                             # Check if it's the 'Full Job Description' column
-                             if i == description_col_index:
-                                 html_output.write(f"<td><pre>{escaped_cell}</pre></td>") # Use <pre> for description
-                             else:
-                                 html_output.write(f"<td>{escaped_cell}</td>")
-                         html_output.write("</tr>\n")
-                    html_output.write("</tbody>\n")
-
-                    html_output.write("</table>\n</div>\n</body>\n</html>")
-
-                    # Send response
-                    self.send_response(200)
-                    self.send_header("Content-type", "text/html; charset=utf-8")
-                    self.end_headers()
-                    self.wfile.write(html_output.getvalue().encode('utf-8'))
-
+                page = max(1, int(query.get('page', ['1'])[0]))
+                size = min(MAX_PAGE_SIZE, max(1, int(query.get('size', [str(DEFAULT_PAGE_SIZE)])[0])))
+            except ValueError:
+                self.send_error(400, "Error: page and size must be integers")
+                return
+            try:
+                index = get_row_index(self.csv_file)
             except FileNotFoundError:
-                self.send_error(404, f"Error: File not found - {CSV_FILE}")
+                self.send_error(404, f"Error: File not found - {self.csv_file}")
+                return
             except Exception as e:
-                 self.send_error(500, f"Error reading or parsing CSV: {e}")
+                self.send_error(500, f"Error reading or parsing CSV: {e}")
+                return
+            header = index.header
+            if header is None:
+                self.send_error(500, f"Error: CSV file '{self.csv_file}' appears to be empty or has no header.")
+                return
+            page_count = max(1, -(-index.row_count // size))
+            page = min(page, page_count)
+            self._send_page(index, header, page, size, page_count)
+
+        elif url.path == '/api/rows':
+            self._send_rows(parse_qs(url.query))
 
         else:
             # Fallback to default behavior for other paths (e.g., serving other files)
             super().do_GET()
 
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        encoding = choose_encoding(self.headers.get('Accept-Encoding')) if len(body) > 1024 else 'identity'
+        body = encode_body(body, encoding)
+        self.send_response(status)
+        self.send_header("Content-type", "application/json; charset=utf-8")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding != 'identity':
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_rows(self, query):
+        """GET /api/rows?filter=Company Name:Acme&filter=Full Job Description~python&sort=-Date Posted&cols=Job Title,Company Name&offset=0&limit=100"""
+        try:
+            table = get_columnar_table(self.csv_file)
+        except FileNotFoundError:
+            self._send_json(404, {"error": f"File not found - {self.csv_file}"})
+            return
+        try:
+            filters = [parse_filter(spec) for spec in query.get('filter', [])]
+            sort = query.get('sort', [None])[0] or None
+            descending = bool(sort) and sort.startswith('-')
+            if descending:
+                sort = sort[1:]
+            columns = [c.strip() for c in query['cols'][0].split(',') if c.strip()] if 'cols' in query else None
+            unknown = [name for name in [f[0] for f in filters] + [sort] + (columns or []) if name and name not in table.column_index]
+            if unknown:
+                raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+            offset = max(0, int(query.get('offset', ['0'])[0]))
+            limit = min(API_MAX_LIMIT, max(1, int(query.get('limit', [str(API_DEFAULT_LIMIT)])[0])))
+        except ValueError as e:
+            self._send_json(400, {"error": str(e), "columns": table.header})
+            return
+
+        started = time.perf_counter()
+        total, rows = table.query(filters, sort, descending, columns, offset, limit)
+        self._send_json(200, {
+            "columns": columns or table.header,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "rows": rows,
+            "query_ms": round((time.perf_counter() - started) * 1000, 2),
+        })
+
+    def _send_page(self, index, header, page, size, page_count):
+        """Answers with 304, a cached rendering, or a freshly rendered page streamed as it is built."""
+        # The page's content only depends on the file version and the page requested
+        etag = f'W/"{index.signature[0]:x}-{index.signature[1]:x}-{page}-{size}"'
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        encoding = choose_encoding(self.headers.get('Accept-Encoding'))
+        key = (self.csv_file, index.signature, page, size)
+        body = page_cache.get(key, encoding)
+        if body is not None:
+            self.send_response(200)
+            self._send_common_headers(etag, encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        # Cache miss: stream chunks as they are rendered (brotli has no cheap streaming mode, so gzip then)
+        encoding = choose_encoding(self.headers.get('Accept-Encoding'), allow_br=False)
+        self.send_response(200)
+        self._send_common_headers(etag, encoding)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if encoding == 'gzip' else None # wbits=31: gzip framing
+        rendered = []
+        for text in self._render_page(index, header, page, size, page_count):
+            data = text.encode('utf-8')
+            rendered.append(data)
+            if compressor:
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._write_chunk(data)
+        if compressor:
+            self._write_chunk(compressor.flush())
+        self.wfile.write(b"0\r\n\r\n") # End of chunked body
+        page_cache.put(key, b''.join(rendered))
+
+    def _send_common_headers(self, etag, encoding):
+        self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache") # Revalidate every time; unchanged pages cost a 304
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding != 'identity':
+            self.send_header("Content-Encoding", encoding)
+
+    def _render_page(self, index, header, page, size, page_count):
+        """Yields the HTML of one page in pieces: the head, ROWS_PER_CHUNK rows at a time, then the tail."""
+        html_output = io.StringIO()
+        html_output.write("<!DOCTYPE html>\n")
+        html_output.write("<html>\n<head>\n<meta charset=\"UTF-8\">\n<title>Seek Job Data</title>\n")
+        # Add some basic styling
+        html_output.write("<style>\n")
+        html_output.write("body { font-family: sans-serif; margin: 20px; }\n")
+        html_output.write("table { border-collapse: collapse; width: 100%; table-layout: fixed; }\n") # Fixed layout helps with column width
+        html_output.write("th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n")
+        html_output.write("th { background-color: #f2f2f2; position: sticky; top: 0; z-index: 1; }\n") # Sticky header
+        html_output.write("tr:nth-child(even) { background-color: #f9f9f9; }\n")
+        # Adjust column widths as needed - Example: make description wider
+        html_output.write("th:nth-child(1), td:nth-child(1) { width: 15%; }") # Job Title
+        html_output.write("th:nth-child(2), td:nth-child(2) { width: 15%; }") # Company Name
+        html_output.write("th:nth-child(3), td:nth-child(3) { width: 10%; }") # Location
+        html_output.write("th:nth-child(11), td:nth-child(11) { width: 30%; }") # Full Job Description (adjust index if headers change)
+        html_output.write("td { vertical-align: top; word-wrap: break-word; }") # Wrap long text
+        html_output.write("pre { white-space: pre-wrap; word-wrap: break-word; margin: 0; font-family: inherit; }") # Preserve formatting in description
+        html_output.write(".pager { margin: 10px 0; }\n")
+        html_output.write("\n</style>\n</head>\n<body>\n")
+        html_output.write(f"<h1>Job Data from {html.escape(self.csv_file)}</h1>\n")
+
+        # Page navigation
+        nav = [f"Page {page} of {page_count} ({index.row_count} rows)"]
+        if page > 1:
+            nav.insert(0, _page_link(1, size, "&laquo; First") + " " + _page_link(page - 1, size, "&lsaquo; Prev"))
+        if page < page_count:
+            nav.append(_page_link(page + 1, size, "Next &rsaquo;") + " " + _page_link(page_count, size, "Last &raquo;"))
+        pager = f"<div class='pager'>{' | '.join(nav)}</div>\n"
+        html_output.write(pager)
+
+        html_output.write("<div style='overflow-x: auto;'>\n") # Add horizontal scroll if needed
+        html_output.write("<table>\n")
+        html_output.write("<thead><tr>")
+        for col_name in header:
+            # Escape header content to prevent HTML injection
+            html_output.write(f"<th>{html.escape(col_name)}</th>")
+        html_output.write("</tr></thead>\n")
+        description_col_index = header.index("Full Job Description") if "Full Job Description" in header else -1
+        html_output.write("<tbody>\n")
+        yield html_output.getvalue()
+
+        # Read data rows: only this page's bytes are read, ROWS_PER_CHUNK rows per chunk
+        first_row = (page - 1) * size
+        for chunk_start in range(first_row, min(first_row + size, index.row_count), ROWS_PER_CHUNK):
+            chunk_stop = min(chunk_start + ROWS_PER_CHUNK, first_row + size)
+            html_output = io.StringIO()
+            for row_num, row in enumerate(index.rows(chunk_start, chunk_stop), start=chunk_start):
+                # Ensure row has the same number of columns as header
+                if len(row) != len(header):
+                    print(f"Warning: Skipping row {row_num + 2} due to mismatched column count ({len(row)} columns, expected {len(header)}).")
+                    continue # Skip malformed rows
+
+                html_output.write("<tr>")
+                for i, cell in enumerate(row):
+                    # Escape cell content to prevent HTML injection
+                    escaped_cell = html.escape(cell)
+                    # Check if it's the 'Full Job Description' column
+                    if i == description_col_index:
+                        html_output.write(f"<td><pre>{escaped_cell}</pre></td>") # Use <pre> for description
+                    else:
+                        html_output.write(f"<td>{escaped_cell}</td>")
+                html_output.write("</tr>\n")
+            yield html_output.getvalue()
+
+        yield "</tbody>\n</table>\n</div>\n" + pager + "</body>\n</html>"
+
 Handler = CSVRequestHandler
 
-# Ensure the server binds to localhost only for security unless wider access is needed
-server_address = ('localhost', PORT)
-with socketserver.TCPServer(server_address, Handler) as httpd:
-    print(f"Serving CSV data from '{CSV_FILE}' at http://{server_address[0]}:{server_address[1]}")
-    print("Press Ctrl+C to stop the server.")
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\nServer stopped.")
-        httpd.shutdown()
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Serve a scraped jobs CSV as a paginated HTML table.")
+    parser.add_argument('--csv', default=CSV_FILE, help="CSV file to serve (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=PORT)
+    # Ensure the server binds to localhost only for security unless wider access is needed
+    parser.add_argument('--host', default='localhost')
+    args = parser.parse_args()
+
+    Handler.csv_file = args.csv
+    server_address = (args.host, args.port)
+    # One thread per connection: a slow client no longer blocks everyone else
+    with http.server.ThreadingHTTPServer(server_address, Handler) as httpd:
+        print(f"Serving CSV data from '{args.csv}' at http://{server_address[0]}:{server_address[1]}")
+        print("Press Ctrl+C to stop the server.")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+            httpd.shutdown()
+
+if __name__ == '__main__':
+    main()